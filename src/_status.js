@@ -11,6 +11,7 @@ let pStatus = {
   imageTime: 10,
   playlist: {},
   tracks: [],
+  tracksVersion: 0,
   currentPlaylistId: null,
   startOnPlay: false,
   startOnPlaylist: '',
@@ -63,7 +64,77 @@ let pStatus = {
     }
   ],
   fullscreen: false,
-  background: '#000000'
+  background: '#000000',
+  telemetry: {
+    timeHz: 4,
+    keyframeInterval: 5
+  },
+  imageCache: {
+    maxMB: 512,
+    prefetch: 2,
+    workers: 2,
+    scaledMB: 128,
+    relayoutDelay: 150,
+    scaledDecode: true,
+    decodeMargin: 1.25
+  },
+  playerPool: {
+    size: 2,
+    lookahead: 1
+  },
+  vlc: {
+    sharedInstance: true,
+    lazyPlayers: true
+  },
+  commands: {
+    stepDebounceMs: 150
+  },
+  metrics: {
+    intervalMs: 5000,
+    lagProbeMs: 250
+  },
+  audioDevices: {
+    pollMs: 5000
+  },
+  syncStart: {
+    spinMs: 4
+  },
+  playlistScheduler: {
+    enabled: true,
+    prerollMs: 300
+  },
+  sharedState: {
+    enabled: true,
+    intervalMs: 33
+  },
+  checkpoint: {
+    enabled: true,
+    intervalMs: 2000,
+    minGapMs: 250,
+    resume: false,
+    restart: true,
+    maxRestarts: 3,
+    restartWindowMs: 60000
+  },
+  // video wall: 추가 출력 창 설정 (output 1부터, 빈 값은 첫 번째 출력 설정을 이어 받음)
+  // 예: [{ screen: 1, background: '#000000', logo: { file: '', show: false, size: 0 } }]
+  outputs: [],
+  // 추가 출력 창별 상태 (output 번호 → { player, activePlayerId, playlistTrackIndex, ... })
+  outputStatus: {},
+  transition: {
+    mode: 'cut',
+    durationMs: 500,
+    frameMs: 16,
+    budgetMs: 34,
+    budgetMisses: 3
+  },
+  quality: {
+    intervalMs: 1000,
+    dropRatePercent: 1.0,
+    lostAudioBuffers: 5,
+    minFrames: 10
+  },
+  startupTimings: {}
 }
 
 const updatePStatus = (newStatus) => {
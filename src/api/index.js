@@ -9,8 +9,13 @@ function startCommandInterval() {
   if (!commandInterval) {
     commandInterval = setInterval(() => {
       if (pStatus.windowOpen && commands.length > 0) {
-        const cmd = commands.shift()
-        require('../player').send(cmd)
+        const player = require('../player')
+        if (player.getFraming() === 'frame') {
+          // frame 모드에서는 쌓인 명령을 한 프레임으로 묶어 전송
+          player.sendBatch(commands.splice(0, commands.length))
+        } else {
+          player.send(commands.shift())
+        }
       }
       // 명령이 없으면 인터벌 중단
       if (commands.length === 0) {
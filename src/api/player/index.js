@@ -158,6 +158,23 @@ const setImageTime = async (time) => {
   return `Image time set to: ${time}`
 }
 
+const setTransition = async (mode, durationMs) => {
+  if (!['cut', 'crossfade', 'fade'].includes(mode)) {
+    throw new Error(`Unknown transition mode: ${mode}`)
+  }
+  if (durationMs === undefined || Number.isNaN(durationMs)) {
+    durationMs = pStatus.transition.durationMs
+  }
+  logger.info(`Setting transition to: ${mode} ${durationMs} ms`)
+  pStatus.transition = { ...pStatus.transition, mode, durationMs }
+  sendPlayerCommand('set_transition', { mode, duration_ms: durationMs })
+  await dbStatus.update({ type: 'transition' }, { mode, durationMs })
+  sendMessageToClient('pStatus', {
+    transition: pStatus.transition
+  })
+  return `Transition set to: ${mode} ${durationMs} ms`
+}
+
 const setRepeat = async (mode = null) => {
   let modes = ['none', 'all', 'repeat_one']
   if (pStatus.playlistMode === false) {
@@ -170,6 +187,8 @@ const setRepeat = async (mode = null) => {
     pStatus.repeat = modes[(currentIdx + 1) % modes.length]
   }
   await dbStatus.update({ type: 'repeat' }, { mode: pStatus.repeat })
+  // 플레이리스트 자동 진행은 플레이어가 반복 모드를 직접 적용
+  sendPlayerCommand('set_repeat', { mode: pStatus.repeat })
   logger.info(`Repeat mode set to: ${pStatus.repeat}`)
   sendMessageToClient('pStatus', {
     repeat: pStatus.repeat
@@ -191,6 +210,44 @@ const setPrevious = async () => {
   return 'Previous track set'
 }
 
+// 예약 시작: at은 보낸 쪽(컨트롤러) 시계 기준 epoch ms,
+// offset은 컨트롤러 시계 - 이 PC 시계 (TCP clock 핸드셰이크로 컨트롤러가 계산)
+const playAt = async (id, at, offset = 0) => {
+  const file = await dbFiles.findOne({ number: Number(id) })
+  if (!file) {
+    throw new Error('File not found')
+  }
+  logger.info(`Scheduling file ${file.filename} to start at ${at} (offset ${offset} ms)`)
+  sendPlayerCommand('play_at', { file, at, offset, id: `file-${id}-${at}` })
+  setPlaylistMode(false)
+  return `Scheduled ${file.path} at ${at}`
+}
+
+const nextAt = async (at, offset = 0) => {
+  logger.info(`Scheduling next track to start at ${at} (offset ${offset} ms)`)
+  sendPlayerCommand('next_at', { at, offset, id: `next-${at}` })
+  return `Next track scheduled at ${at}`
+}
+
+// video wall: 추가 출력 창으로 명령 전달 (output 0은 첫 번째 출력 창)
+const sendOutputCommand = (output, command, data = {}) => {
+  const number = Number(output)
+  if (!Number.isInteger(number) || number < 0 || number > pStatus.outputs.length) {
+    throw new Error(`Unknown output: ${output}`)
+  }
+  if (!command || typeof command !== 'string') {
+    throw new Error('Command is required')
+  }
+  logger.info(`Sending ${command} to output ${number}`)
+  sendPlayerCommand(command, { ...data, output: number })
+  return `Command ${command} sent to output ${number}`
+}
+
+// Node ↔ player stdin 경로의 지연과 시계 차이 측정 (응답은 parsing의 clock_sync)
+const syncPlayerClock = () => {
+  sendPlayerCommand('clock_sync', { t0: Date.now(), id: `clock-${Date.now()}` })
+}
+
 module.exports = {
   sendPlayerCommand,
   setMedia,
@@ -208,7 +265,12 @@ module.exports = {
   getAudioDevices,
   setAudioDevice,
   setImageTime,
+  setTransition,
   setRepeat,
   setNext,
-  setPrevious
+  setPrevious,
+  playAt,
+  nextAt,
+  sendOutputCommand,
+  syncPlayerClock
 }
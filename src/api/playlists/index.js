@@ -27,6 +27,90 @@ const getTracksWithFileInfo = async (tracks) => {
   )
 }
 
+// 플레이어에 전체 트랙 목록 전송 (버전 증가)
+const sendTracks = (tracks) => {
+  pStatus.tracksVersion = (pStatus.tracksVersion || 0) + 1
+  sendPlayerCommand('set_tracks', { tracks, version: pStatus.tracksVersion })
+}
+
+// 플레이어에 트랙 패치 전송 (플레이어 버전이 base_version과 다르면 playlist_resync 응답)
+const sendTracksPatch = (ops) => {
+  const baseVersion = pStatus.tracksVersion || 0
+  pStatus.tracksVersion = baseVersion + 1
+  sendPlayerCommand('patch_tracks', {
+    ops,
+    base_version: baseVersion,
+    version: pStatus.tracksVersion
+  })
+}
+
+// 이전/새 트랙 목록(uuid 기준)으로 remove/insert/move/update op 생성
+// uuid가 중복된 목록은 패치로 표현할 수 없으므로 null
+const diffTracks = (oldTracks, newTracks) => {
+  const oldIds = oldTracks.map((track) => track.uuid)
+  const newIds = newTracks.map((track) => track.uuid)
+  if (
+    new Set(oldIds).size !== oldIds.length ||
+    new Set(newIds).size !== newIds.length
+  ) {
+    return null
+  }
+  const ops = []
+  const keep = new Set(newIds)
+  const work = oldIds.filter((uuid) => {
+    if (keep.has(uuid)) return true
+    ops.push({ op: 'remove', uuid })
+    return false
+  })
+  newTracks.forEach((track, index) => {
+    if (work[index] === track.uuid) return
+    const from = work.indexOf(track.uuid)
+    if (from === -1) {
+      ops.push({ op: 'insert', index, track })
+    } else {
+      ops.push({ op: 'move', uuid: track.uuid, index })
+      work.splice(from, 1)
+    }
+    work.splice(index, 0, track.uuid)
+  })
+  const oldByUuid = new Map(oldTracks.map((track) => [track.uuid, track]))
+  newTracks.forEach((track) => {
+    const old = oldByUuid.get(track.uuid)
+    if (old && (old.time || 0) !== (track.time || 0)) {
+      ops.push({ op: 'update', uuid: track.uuid, fields: { time: track.time || 0 } })
+    }
+  })
+  return ops
+}
+
+// 현재 플레이리스트가 수정된 경우 변경분만 플레이어에 반영
+const updateCurrentTracks = async (playlist) => {
+  if (!playlist || !pStatus.playlist || pStatus.playlist._id !== playlist._id) {
+    return
+  }
+  const tracks = playlist.tracks || []
+  const ops = diffTracks(pStatus.tracks || [], tracks)
+  pStatus.playlist = playlist
+  pStatus.tracks = tracks
+  sendMessageToClient('pStatus', { playlist: pStatus.playlist, tracks })
+  if (ops && ops.length === 0) return
+  if (ops) {
+    // insert되는 트랙만 파일 정보 조회
+    const inserts = ops.filter((op) => op.op === 'insert')
+    const files = await getTracksWithFileInfo(inserts.map((op) => op.track))
+    if (files.every((file) => file)) {
+      inserts.forEach((op, i) => (op.track = files[i]))
+      return sendTracksPatch(ops)
+    }
+  }
+  sendTracks(await getTracksWithFileInfo(tracks))
+}
+
+// 플레이어가 버전 불일치로 재동기화를 요청한 경우 전체 트랙 목록 재전송
+const resyncTracks = async () => {
+  sendTracks(await getTracksWithFileInfo(pStatus.tracks || []))
+}
+
 const getPlaylist = async (playlistId) => {
   if (!playlistId) {
     throw new Error('Playlist ID is required')
@@ -59,17 +143,23 @@ const fnAddPlaylists = async (args) => {
 const fnEditPlaylists = async (args) => {
   const { id, ...updateData } = args
   if (!id) return new Error('Playlist ID is required')
-  return await dbPlaylists.update({ _id: id }, { $set: updateData })
+  const result = await dbPlaylists.update({ _id: id }, { $set: updateData })
+  if (updateData.tracks) {
+    await updateCurrentTracks(await dbPlaylists.findOne({ _id: id }))
+  }
+  return result
 }
 
 const fnAddTracksToPlaylist = async (playlistId, tracks) => {
   if (!playlistId || !Array.isArray(tracks)) {
     throw new Error('Playlist ID and tracks are required')
   }
-  return await dbPlaylists.update(
+  const result = await dbPlaylists.update(
     { _id: playlistId },
     { $addToSet: { tracks: { $each: tracks } } }
   )
+  await updateCurrentTracks(await dbPlaylists.findOne({ _id: playlistId }))
+  return result
 }
 
 const setPlaylist = async (playlistId) => {
@@ -85,9 +175,7 @@ const setPlaylist = async (playlistId) => {
     pStatus.currentPlaylistId = playlistId
     pStatus.tracks = playlist.tracks || []
     playlist.tracks = await getTracksWithFileInfo(playlist.tracks)
-    sendPlayerCommand('set_tracks', {
-      tracks: playlist.tracks
-    })
+    sendTracks(playlist.tracks)
     sendMessageToClient('pStatus', {
       playlist: pStatus.playlist,
       currentPlaylistId: pStatus.currentPlaylistId,
@@ -133,14 +221,11 @@ const editImageRenderTime = async (playlistId, idx, time) => {
   if (!playlist.tracks || !playlist.tracks[idx]) {
     throw new Error('Track not found in playlist')
   }
-  playlist.tracks[idx].time = time
-  await dbPlaylists.update(
-    { _id: playlistId },
-    { $set: { tracks: playlist.tracks } }
+  const tracks = playlist.tracks.map((track, i) =>
+    i === idx ? { ...track, time } : track
   )
-  sendPlayerCommand('set_tracks', {
-    tracks: playlist.tracks
-  })
+  await dbPlaylists.update({ _id: playlistId }, { $set: { tracks } })
+  await updateCurrentTracks({ ...playlist, tracks })
 }
 
 const playlistPlay = async (playlistId, trackIndex) => {
@@ -179,5 +264,6 @@ module.exports = {
   setPlaylistMode,
   setplaylistTrackIndex,
   playlistPlay,
-  editImageRenderTime
+  editImageRenderTime,
+  resyncTracks
 }
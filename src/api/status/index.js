@@ -71,6 +71,13 @@ const getSetupfromDB = async () => {
       case 'image_time':
         pStatus.imageTime = setup.time || 5
         break
+      case 'transition':
+        pStatus.transition = {
+          ...pStatus.transition,
+          mode: setup.mode || 'cut',
+          durationMs: setup.durationMs ?? pStatus.transition.durationMs
+        }
+        break
       case 'startOnPlay':
         pStatus.startOnPlay = setup.value
         pStatus.startOnPlaylist = setup.playlistId || null
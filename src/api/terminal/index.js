@@ -79,6 +79,23 @@ async function handleMessage(msg) {
       case 'prev':
         player.setPrevious()
         break
+      case 'transition':
+        r = await player.setTransition(params[0], Number(params[1]))
+        break
+      // 컨트롤러 시계 핸드셰이크: clock,<t0> → clock,<t0>,<이 PC 시계>
+      case 'clock':
+        r = `clock,${params[0]},${Date.now()}`
+        break
+      case 'play_at':
+        r = await player.playAt(
+          Number(params[0]),
+          Number(params[1]),
+          Number(params[2] ?? 0)
+        )
+        break
+      case 'next_at':
+        r = await player.nextAt(Number(params[0]), Number(params[1] ?? 0))
+        break
       default:
         r = `Unknown command: ${command}`
         break
@@ -3,14 +3,41 @@ const { app } = require('electron')
 const path = require('path')
 const logger = require('../logger')
 const { pStatus, getPythonProcess, setPlayerProcess } = require('../_status.js')
-const { parsing } = require('./parsing')
+const { parsing, resetParsing } = require('./parsing')
+const { closeState } = require('./state')
 
-function startPlayerProcess() {
+// stdin 프레이밍: 'line'(JSON 한 줄) 또는 'frame'(길이 prefix + JSON batch)
+// player가 window_open 메시지로 frame 지원을 알리면 frame 모드로 전환한다
+const FRAME_MAGIC = 0x1e
+const FRAME_ENCODING_JSON = 0x6a // 'j'
+let framing = 'line'
+
+// 비정상 종료 시 체크포인트에서 이어서 재생하도록 다시 시작 (restartWindowMs 안에서 maxRestarts번까지)
+let stopping = false
+let restarts = []
+
+function shouldRestart(code) {
+  const checkpoint = pStatus.checkpoint || {}
+  if (stopping || code === 0 || checkpoint.enabled === false || checkpoint.restart === false) {
+    return false
+  }
+  const now = Date.now()
+  restarts = restarts.filter((at) => now - at < (checkpoint.restartWindowMs ?? 60000))
+  if (restarts.length >= (checkpoint.maxRestarts ?? 3)) {
+    logger.error(`Player crashed ${restarts.length} times recently, not restarting.`)
+    return false
+  }
+  restarts.push(now)
+  return true
+}
+
+function startPlayerProcess(resume = false) {
   try {
     if (getPythonProcess()) {
       logger.warn('Python process is already running.')
       return
     }
+    stopping = false
     // const pythonPath = path.join(
     //   app.getAppPath(),
     //   'src',
@@ -47,16 +74,27 @@ function startPlayerProcess() {
         encoding: 'utf-8',
         VP_PSTATUS: JSON.stringify(pStatus), // pStatus를 JSON 문자열로 전달
         APP_PATH: app.getAppPath(), // 앱 경로 전달
+        VP_CACHE_DIR: app.getPath('userData'), // 미디어 메타데이터 인덱스 등 캐시 경로
+        VP_RESUME: resume ? '1' : '0', // 체크포인트에서 이어서 재생
         PYTHONIOENCODING: 'utf-8' // Python 출력 인코딩 설정
       }
     })
 
+    resetParsing()
     proc.stdout.on('data', parsing)
     proc.stderr.on('data', (data) => logger.error('Python stderr: ' + data))
     proc.on('close', (code) => {
       logger.warn('Python process exited with code ' + code)
+      closeState()
+      setPlayerProcess(null)
+      if (shouldRestart(code)) {
+        logger.warn('Restarting player process and resuming from checkpoint.')
+        startPlayerProcess(true)
+        return
+      }
       app.quit() // Python 프로세스가 종료되면 앱도 종료
     })
+    framing = 'line'
     setPlayerProcess(proc)
     logger.info('Python process started with PID: ' + proc.pid)
   } catch (error) {
@@ -71,6 +109,7 @@ function stopPlayerProcess() {
     logger.warn('Python process is not running.')
     return
   }
+  stopping = true
   proc.kill()
   logger.info('Python process has been terminated.')
 }
@@ -90,6 +129,46 @@ function send(message) {
   }
 }
 
+function encodeFrame(payload) {
+  const body = Buffer.from(JSON.stringify(payload), 'utf8')
+  const header = Buffer.alloc(6)
+  header.writeUInt8(FRAME_MAGIC, 0)
+  header.writeUInt8(FRAME_ENCODING_JSON, 1)
+  header.writeUInt32BE(body.length, 2)
+  return Buffer.concat([header, body])
+}
+
+function sendBatch(messages) {
+  if (!messages.length) return
+  if (framing !== 'frame') {
+    messages.forEach(send)
+    return
+  }
+  const proc = getPythonProcess()
+  if (!proc) {
+    logger.warn('Python process is not running.')
+    return
+  }
+  if (proc.stdin.writable) {
+    proc.stdin.write(encodeFrame(messages))
+  } else {
+    logger.error('Python process stdin is not writable.')
+  }
+}
+
+function setFraming(capabilities) {
+  if (capabilities && Array.isArray(capabilities.modes)) {
+    framing = capabilities.modes.includes('frame') ? 'frame' : 'line'
+  } else {
+    framing = 'line'
+  }
+  logger.info(`Player stdin framing set to ${framing}`)
+}
+
+function getFraming() {
+  return framing
+}
+
 function getAudioDevices() {
   const proc = getPythonProcess()
   if (!proc) {
@@ -103,5 +182,8 @@ module.exports = {
   startPlayerProcess,
   stopPlayerProcess,
   send,
+  sendBatch,
+  setFraming,
+  getFraming,
   getAudioDevices
 }
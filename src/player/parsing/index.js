@@ -1,3 +1,4 @@
+const { StringDecoder } = require('string_decoder')
 let { pStatus } = require('../../_status.js')
 const logger = require('../../logger')
 const { dbStatus, dbFiles } = require('../../db')
@@ -6,6 +7,7 @@ const {
   sendPlayerCommand,
   broadcastTcpMessage
 } = require('../../api')
+const { openState } = require('../state')
 let lastEndReachedEvent = null
 let lastEndReachedTime = 0
 
@@ -80,11 +82,30 @@ function handleEndReached(data) {
   }
 }
 
+// player가 자동 진행한 전환은 end_reached가 오지 않으므로 handleEndReached와 같은 TCP 알림을 보낸다
+function handleAdvanceReport(data) {
+  sendMessageToClient('advanceReport', data)
+  logger.info(
+    `Track ${data.from_track} -> ${data.to_track} (${data.reason}): gap ${data.gap_ms} ms, drift ${data.drift_ms} ms${data.late ? ' (late)' : ''}`
+  )
+  if (pStatus.repeat === 'repeat_one') {
+    broadcastTcpMessage(
+      `next,${pStatus.playlist.playlistId},${data.to_track}`
+    )
+  }
+}
+
 async function handleMediaChanged(data) {
   logger.info(`Media changed event received: ${JSON.stringify(data)}`)
 
   let updated = false
 
+  // player가 preparse 해 둔 길이/해상도 정보
+  if (data.metadata) {
+    pStatus.player[data.idx] = { ...pStatus.player[data.idx], ...data.metadata }
+    updated = true
+  }
+
   if (data.uuid) {
     const file = await dbFiles.findOne({ uuid: data.uuid })
     if (file) {
@@ -123,11 +144,94 @@ async function handleMediaChanged(data) {
   }
 }
 
+// video wall 추가 출력 창 메시지: 첫 번째 출력의 pStatus와 섞지 않고 output별 상태에 기록
+function handleOutputMessage(output, type, data) {
+  if (!pStatus.outputStatus[output]) {
+    pStatus.outputStatus[output] = { player: [] }
+  }
+  const status = pStatus.outputStatus[output]
+  switch (type) {
+    case 'info':
+      logger.info(`Received info message from output ${output}:` + data)
+      return
+    case 'warn':
+      logger.warn(`Received warning message from output ${output}:` + data)
+      return
+    case 'debug':
+      logger.debug(`Received debug message from output ${output}:` + data)
+      return
+    case 'error':
+      logger.error(`Received error from output ${output}:` + data)
+      return
+    case 'command_error':
+      logger.error(
+        `Output ${output} rejected command ${data.command}: ${data.message}`
+      )
+      return
+    case 'startup':
+      status.startupTimings = data.timings || {}
+      status.sharedState = data.shared_state
+      logger.info(
+        `Output ${output} ready, startup timings(ms): ${JSON.stringify(status.startupTimings)}, queued commands: ${data.queued_commands}`
+      )
+      break
+    case 'player_data':
+      status.player[data.id] = { ...status.player[data.id], ...data }
+      break
+    case 'media_metadata':
+      status.player[data.idx] = { ...status.player[data.idx], ...data.metadata }
+      break
+    case 'active_player_id':
+      status.activePlayerId = data.value
+      break
+    case 'track_index':
+      status.playlistTrackIndex = data.value || 0
+      break
+    case 'media_changed':
+      status.media = data
+      break
+    case 'end_reached':
+      status.playlistTrackIndex = data.playlist_track_index
+      status.activePlayerId = data.active_player_id
+      logger.info(`Output ${output} end reached: ${JSON.stringify(data)}`)
+      break
+    case 'stats':
+      status.stats = data
+      break
+    case 'metrics':
+      status.metrics = data
+      break
+    default:
+      logger.debug(
+        `Received ${type} message from output ${output}: ` + JSON.stringify(data)
+      )
+      return
+  }
+  sendMessageToClient('outputStatus', { output, status })
+}
+
+// stdout chunk는 줄 경계와 무관하게 나뉘므로 마지막 미완성 줄(과 잘린 UTF-8 바이트)은 다음 chunk까지 보관
+let decoder = new StringDecoder('utf8')
+let partialLine = ''
+
+function resetParsing() {
+  decoder = new StringDecoder('utf8')
+  partialLine = ''
+}
+
 const parsing = async (data) => {
-  const lines = data.toString('utf8').split('\n').filter(Boolean)
+  const lines = (partialLine + decoder.write(data)).split('\n')
+  partialLine = lines.pop()
   for (const line of lines) {
+    if (!line) {
+      continue
+    }
     try {
-      const { type, data } = JSON.parse(line)
+      const { type, data, output } = JSON.parse(line)
+      if (output) {
+        handleOutputMessage(output, type, data)
+        continue
+      }
       switch (type) {
         case 'info':
           logger.info('Received info message from Python:' + data)
@@ -142,9 +246,28 @@ const parsing = async (data) => {
           logger.error('Received error from Python:' + data)
           break
         case 'window_open':
+          require('..').setFraming(data.framing)
           pStatus.windowOpen = data.value
-          sendMessageToClient('pStatus', { windowOpen: pStatus.windowOpen })
-          logger.info(`Video player Window opend`)
+          pStatus.startupTimings = data.timings || {}
+          sendMessageToClient('pStatus', {
+            windowOpen: pStatus.windowOpen,
+            startupTimings: pStatus.startupTimings
+          })
+          logger.info(
+            `Video player Window opend, startup timings(ms): ${JSON.stringify(pStatus.startupTimings)}`
+          )
+          break
+        case 'startup':
+          pStatus.startupTimings = data.timings || {}
+          // 공유 상태 블록: 현재 상태는 stdout 대신 파일에서 바로 읽는다 (GET /status/state)
+          openState(data.shared_state)
+          sendMessageToClient('pStatus', { startupTimings: pStatus.startupTimings })
+          logger.info(
+            `Video player ready, startup timings(ms): ${JSON.stringify(pStatus.startupTimings)}, queued commands: ${data.queued_commands}`
+          )
+          break
+        case 'resumed':
+          logger.info(`Player resumed from checkpoint: ${JSON.stringify(data)}`)
           break
         case 'active_player_id':
           pStatus.activePlayerId = data.value
@@ -163,6 +286,14 @@ const parsing = async (data) => {
         case 'media_changed':
           handleMediaChanged(data)
           break
+        case 'media_metadata':
+          // media_changed 이후에 끝난 preparse의 길이/해상도 정보
+          pStatus.player[data.idx] = {
+            ...pStatus.player[data.idx],
+            ...data.metadata
+          }
+          sendMessageToClient('pStatus', { player: pStatus.player })
+          break
         case 'end_reached':
           handleEndReached(data)
           break
@@ -172,6 +303,33 @@ const parsing = async (data) => {
           logger.info(
             `Audio devices updated: ${data.devices.length} devices found`
           )
+          if (data.added && data.added.length) {
+            logger.info(
+              `Audio devices connected: ${data.added.map((device) => device.name).join(', ')}`
+            )
+          }
+          if (data.removed && data.removed.length) {
+            logger.warn(
+              `Audio devices disconnected: ${data.removed.map((device) => device.name).join(', ')}`
+            )
+          }
+          break
+        case 'advance_report':
+          handleAdvanceReport(data)
+          break
+        case 'transition':
+          if (data.fallback) {
+            logger.warn(
+              `Transition ${data.mode} ${data.from} -> ${data.to} fell back to cut: frame time ${data.max_frame_ms} ms, ${data.budget_misses} frames over budget`
+            )
+          } else {
+            logger.debug(
+              `Transition ${data.mode} ${data.from} -> ${data.to}: ${data.duration_ms} ms, ${data.frames} frames, avg ${data.avg_frame_ms} ms`
+            )
+          }
+          break
+        case 'set_transition':
+          logger.info(`Player transition: ${data.mode} ${data.duration_ms} ms`)
           break
         case 'set_image_time':
           pStatus.image_time = data.value || 5
@@ -253,6 +411,69 @@ const parsing = async (data) => {
             `Playlist track index set to ${pStatus.playlistTrackIndex}`
           )
           break
+        case 'command_error':
+          logger.error(
+            `Player rejected command ${data.command}: ${data.message}`
+          )
+          break
+        case 'playlist_resync':
+          logger.warn(
+            `Player requested playlist resync (version ${data.version}): ${data.reason}`
+          )
+          await require('../../api/playlists').resyncTracks()
+          break
+        case 'tracks_version':
+          logger.debug(
+            `Player tracks updated to version ${data.version} (${data.count} tracks)`
+          )
+          break
+        case 'stats':
+          pStatus.playerStats = data
+          sendMessageToClient('playerStats', data)
+          logger.debug('Received player stats: ' + JSON.stringify(data))
+          break
+        case 'metrics':
+          pStatus.playerMetrics = data
+          sendMessageToClient('playerMetrics', data)
+          break
+        case 'clock_sync': {
+          const t3 = Date.now()
+          pStatus.playerClock = {
+            offset: data.t1 - (data.t0 + t3) / 2,
+            rtt: t3 - data.t0
+          }
+          logger.debug(
+            `Player clock offset ${pStatus.playerClock.offset} ms, round trip ${pStatus.playerClock.rtt} ms`
+          )
+          break
+        }
+        case 'start_report':
+          sendMessageToClient('startReport', data)
+          if (data.cancelled) {
+            logger.warn(`Scheduled start ${data.id} cancelled: ${data.cancelled}`)
+          } else {
+            logger.info(
+              `Scheduled start ${data.id}: error ${data.start_error_ms} ms, playing ${data.playing_error_ms} ms, preroll ${data.preroll_ms} ms${data.late ? ' (late)' : ''}`
+            )
+            broadcastTcpMessage(`start_report,${data.id},${data.start_error_ms}`)
+          }
+          break
+        case 'quality_report':
+          pStatus.player[data.idx] = {
+            ...pStatus.player[data.idx],
+            quality: data
+          }
+          sendMessageToClient('qualityReport', data)
+          logger.info(
+            `Playback quality (${data.reason}) ${data.path}: dropped ${data.video.lost}/${data.video.decoded} frames, lost audio buffers ${data.audio.lost}, ${data.input_kbps} kb/s`
+          )
+          break
+        case 'quality_warning':
+          sendMessageToClient('qualityWarning', data)
+          logger.warn(
+            `Playback quality warning for ${data.path}: ${data.metric} ${data.value} exceeds ${data.threshold}`
+          )
+          break
 
         default:
           logger.warn(
@@ -268,5 +489,6 @@ const parsing = async (data) => {
 }
 
 module.exports = {
-  parsing
+  parsing,
+  resetParsing
 }
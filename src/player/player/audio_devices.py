@@ -0,0 +1,158 @@
+import time
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, Signal
+from vlc_backend import vlc
+
+# =========================
+# 오디오 디바이스 서비스
+# =========================
+#
+# libVLC 디바이스 목록(audio_output_device_enum, ctypes 연결 리스트) 조회는 워커 스레드에서 하고
+# 결과는 GUI 스레드에서 캐시와 비교한다.
+# - get_audio_devices 명령은 캐시를 바로 응답하고 백그라운드로 다시 조회
+# - poll_ms마다 다시 조회해 장치가 추가/제거됐을 때만 audiodevices(added/removed 포함) 전송
+# - 설정된 장치(pstatus.device.audiodevice)가 사라졌다가 다시 나타나면 available 신호로 다시 적용
+# 기본 장치("", "default")는 항상 있는 것으로 본다.
+
+DEFAULT_DEVICES = ("", "default")
+
+
+def read_devices(player):
+    """플레이어의 오디오 출력 장치 목록 [{deviceid, name}]"""
+    devices = []
+    dev_list = player.audio_output_device_enum()
+    dev = dev_list
+    while dev:
+        dev_info = dev.contents
+        devices.append({
+            "deviceid": dev_info.device.decode() if dev_info.device else "default",
+            "name": dev_info.description.decode() if dev_info.description else "기본 장치"
+        })
+        dev = dev_info.next
+    release = getattr(vlc, "libvlc_audio_output_device_list_release", None)
+    if dev_list and release is not None:
+        release(dev_list)
+    return devices
+
+
+class DeviceEnumTask(QRunnable):
+    def __init__(self, service, player):
+        super().__init__()
+        self.service = service
+        self.player = player
+
+    def run(self):
+        started = time.perf_counter()
+        try:
+            devices = read_devices(self.player)
+        except Exception as e:
+            self.service.enum_failed.emit(str(e))
+            return
+        self.service.enumerated.emit(devices, (time.perf_counter() - started) * 1000)
+
+
+class AudioDeviceService(QObject):
+    enumerated = Signal(list, float)
+    enum_failed = Signal(str)
+    # (전체 목록, 추가된 장치, 제거된 장치)
+    changed = Signal(list, list, list)
+    # 설정된 장치를 (다시) 사용할 수 있게 됨
+    available = Signal(str)
+    missing = Signal(str)
+    error = Signal(str)
+
+    def __init__(self, player_source, device_id="", poll_ms=5000, parent=None):
+        super().__init__(parent)
+        # 조회에 사용할 VLC 플레이어를 반환하는 함수 (GUI 스레드에서 호출)
+        self.player_source = player_source
+        self.device_id = device_id
+        self.devices = None
+        self.device_present = None
+        self.in_flight = False
+        self.force_emit = False
+        self.enumerations = 0
+        self.changes = 0
+        self.reapplied = 0
+        self.failures = 0
+        self.last_enum_ms = 0.0
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self.timer = QTimer(self)
+        self.timer.setInterval(poll_ms)
+        self.timer.timeout.connect(self.refresh)
+        self.enumerated.connect(self.on_enumerated)
+        self.enum_failed.connect(self.on_enum_failed)
+
+    def start(self):
+        """첫 조회 및 주기 조회 시작 (VLC 플레이어 생성 이후)"""
+        self.refresh(emit=True)
+        if self.timer.interval() > 0:
+            self.timer.start()
+
+    def configure(self, device_id):
+        """설정된 장치 변경 (set_audio_device)"""
+        self.device_id = device_id
+        self.device_present = self.is_present(device_id) if self.devices is not None else None
+
+    def refresh(self, emit=False):
+        """백그라운드 조회 요청. emit이면 변경이 없어도 목록 전송"""
+        self.force_emit = self.force_emit or emit
+        if self.in_flight:
+            return
+        player = self.player_source()
+        if player is None:
+            return
+        self.in_flight = True
+        self.pool.start(DeviceEnumTask(self, player))
+
+    def cached(self):
+        """캐시된 목록 (아직 조회 전이면 None)"""
+        return self.devices
+
+    def is_present(self, device_id):
+        if device_id in DEFAULT_DEVICES:
+            return True
+        return any(device["deviceid"] == device_id for device in self.devices or ())
+
+    def on_enumerated(self, devices, elapsed_ms):
+        """조회 완료 (GUI 스레드): 이전 목록과 비교"""
+        self.in_flight = False
+        self.enumerations += 1
+        self.last_enum_ms = elapsed_ms
+        previous = self.devices
+        self.devices = devices
+        if previous is None:
+            added, removed = [], []
+        else:
+            before = {device["deviceid"] for device in previous}
+            after = {device["deviceid"] for device in devices}
+            added = [device for device in devices if device["deviceid"] not in before]
+            removed = [device for device in previous if device["deviceid"] not in after]
+        if added or removed:
+            self.changes += 1
+        if added or removed or self.force_emit:
+            self.force_emit = False
+            self.changed.emit(devices, added, removed)
+
+        present = self.is_present(self.device_id)
+        if present and self.device_present is False:
+            self.reapplied += 1
+            self.available.emit(self.device_id)
+        elif not present and self.device_present is not False:
+            self.missing.emit(self.device_id)
+        self.device_present = present
+
+    def on_enum_failed(self, message):
+        self.in_flight = False
+        self.failures += 1
+        self.error.emit(f"Error getting audio devices: {message}")
+
+    def stats(self):
+        return {
+            "devices": len(self.devices) if self.devices is not None else None,
+            "enumerations": self.enumerations,
+            "changes": self.changes,
+            "reapplied": self.reapplied,
+            "failures": self.failures,
+            "last_enum_ms": round(self.last_enum_ms, 3),
+            "device_present": self.device_present,
+        }
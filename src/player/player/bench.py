@@ -0,0 +1,442 @@
+import os, sys, json, time, queue, argparse, platform, tempfile, threading, subprocess, statistics
+
+# =========================
+# 헤드리스 벤치마크
+# =========================
+#
+# player.py를 자식 프로세스로 실행해 실제 stdin/stdout 프로토콜로 측정한다.
+# Windows/디스플레이/실제 미디어 없이 Linux에서 실행 가능:
+#   QT_QPA_PLATFORM=offscreen, VP_VLC_BACKEND=fake (fake_vlc.py)
+# 사용 예:
+#   python bench.py --output result.json
+#   python bench.py --quick
+#   python bench.py --only next,soak --soak 600
+# 측정 항목 (결과는 JSON):
+# - startup       : 프로세스 시작 → window_open / startup 메시지, player가 보고한 단계별 시간
+# - media_changed : playid 명령 → media_changed 응답 지연 (비디오/이미지)
+# - next          : next 명령 → track_index 응답 지연 (미리 로드된 슬롯 전환)
+# - stdout        : 재생 중 초당 stdout 메시지 수/바이트
+# - image         : 이미지 디코딩/축소 시간 (이 프로세스에서 image_cache 함수로 측정)
+# - soak          : 짧은 트랙 플레이리스트 연속 재생 중 RSS/스레드 수 변화
+# - quality       : 일시정지/재개를 반복해도 quality_report가 트랙 종료 때 한 번만 나오는지 (ok)
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+PLAYER = os.path.join(HERE, "player.py")
+BENCHMARKS = ("startup", "media_changed", "next", "stdout", "image", "soak", "quality")
+
+
+def summarize(values):
+    """지연시간 목록 요약 (ms)"""
+    if not values:
+        return {"count": 0}
+    ordered = sorted(values)
+    return {
+        "count": len(ordered),
+        "min": round(ordered[0], 3),
+        "p50": round(statistics.median(ordered), 3),
+        "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+        "max": round(ordered[-1], 3),
+        "mean": round(statistics.fmean(ordered), 3),
+    }
+
+
+def proc_status(pid):
+    """/proc/<pid>/status의 RSS(KB)와 스레드 수 (Linux 전용, 없으면 None)"""
+    try:
+        with open(f"/proc/{pid}/status", "r") as f:
+            fields = dict(line.split(":", 1) for line in f if ":" in line)
+        return int(fields["VmRSS"].split()[0]), int(fields["Threads"])
+    except (OSError, KeyError, ValueError):
+        return None, None
+
+
+class PlayerProcess:
+    """player.py 자식 프로세스. stdout은 전용 스레드가 읽어 큐에 넣는다"""
+
+    def __init__(self, workdir, pstatus=None, fake_settings=None):
+        env = dict(os.environ)
+        env.update({
+            "QT_QPA_PLATFORM": "offscreen",
+            "VP_VLC_BACKEND": "fake",
+            "VP_CACHE_DIR": workdir,
+            "VP_PSTATUS": json.dumps(pstatus or {}),
+            "APP_PATH": workdir,
+        })
+        if fake_settings:
+            env["VP_FAKE_VLC"] = ",".join(f"{key}={value}" for key, value in fake_settings.items())
+        self.started = time.perf_counter()
+        self.proc = subprocess.Popen(
+            [sys.executable, PLAYER], cwd=HERE, env=env,
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+        )
+        self.messages = queue.Queue()
+        self.lock = threading.Lock()
+        self.count = 0
+        self.bytes = 0
+        self.by_type = {}
+        self.on_message = None
+        self.reader = threading.Thread(target=self.read, name="benchReader", daemon=True)
+        self.reader.start()
+
+    def read(self):
+        for line in self.proc.stdout:
+            received = time.perf_counter()
+            try:
+                message = json.loads(line)
+            except ValueError:
+                continue
+            type = message.get("type")
+            with self.lock:
+                self.count += 1
+                self.bytes += len(line)
+                self.by_type[type] = self.by_type.get(type, 0) + 1
+            if self.on_message:
+                self.on_message(type, message.get("data"))
+            self.messages.put((received, type, message.get("data")))
+
+    def counters(self):
+        with self.lock:
+            return self.count, self.bytes, dict(self.by_type)
+
+    def send(self, command, **data):
+        """명령 한 줄 전송. 전송 시각 반환"""
+        line = json.dumps({"command": command, **data}) + "\n"
+        sent = time.perf_counter()
+        self.proc.stdin.write(line.encode("utf-8"))
+        self.proc.stdin.flush()
+        return sent
+
+    def wait_for(self, predicate, timeout=5.0):
+        """조건에 맞는 메시지가 올 때까지 대기. (수신 시각, type, data) 또는 None"""
+        deadline = time.perf_counter() + timeout
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return None
+            try:
+                received, type, data = self.messages.get(timeout=remaining)
+            except queue.Empty:
+                return None
+            if predicate(type, data):
+                return received, type, data
+
+    def drain(self):
+        while True:
+            try:
+                self.messages.get_nowait()
+            except queue.Empty:
+                return
+
+    def status(self):
+        return proc_status(self.proc.pid)
+
+    def close(self):
+        try:
+            self.proc.stdin.close()
+        except OSError:
+            pass
+        self.proc.terminate()
+        try:
+            self.proc.wait(3)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+
+
+def video_track(workdir, name, duration_ms):
+    """모의 백엔드용 비디오 트랙 (파일 이름의 _<ms>ms가 길이)"""
+    path = os.path.join(workdir, f"{name}_{duration_ms}ms.mp4")
+    if not os.path.exists(path):
+        with open(path, "wb") as f:
+            f.write(b"\0" * 1024)
+    return {"uuid": name, "path": path, "filename": os.path.basename(path), "is_image": False, "mimetype": "video/mp4"}
+
+
+def image_track(workdir, name, width=1920, height=1080, time_s=1, ext="png"):
+    from PySide6.QtGui import QImage, QColor
+    path = os.path.join(workdir, f"{name}.{ext}")
+    if not os.path.exists(path):
+        image = QImage(width, height, QImage.Format_RGB32)
+        image.fill(QColor(hash(name) % 256, 64, 128))
+        image.save(path)
+    return {"uuid": name, "path": path, "filename": os.path.basename(path), "is_image": True, "mimetype": f"image/{ext}", "time": time_s}
+
+
+def start_player(workdir, **kwargs):
+    player = PlayerProcess(workdir, **kwargs)
+    if player.wait_for(lambda type, data: type == "startup", timeout=20) is None:
+        player.close()
+        raise RuntimeError("player did not report startup")
+    return player
+
+
+def bench_startup(workdir, args):
+    player = PlayerProcess(workdir)
+    try:
+        window_open = player.wait_for(lambda type, data: type == "window_open", timeout=20)
+        startup = player.wait_for(lambda type, data: type == "startup", timeout=20)
+        if window_open is None or startup is None:
+            return {"error": "player did not start"}
+        rss_kb, threads = player.status()
+        return {
+            "window_open_ms": round((window_open[0] - player.started) * 1000, 3),
+            "startup_ms": round((startup[0] - player.started) * 1000, 3),
+            "player_timings_ms": startup[2].get("timings"),
+            "rss_kb": rss_kb,
+            "threads": threads,
+        }
+    finally:
+        player.close()
+
+
+def bench_media_changed(workdir, args):
+    player = start_player(workdir)
+    try:
+        files = {
+            "video": [video_track(workdir, f"mc_video{i}", 10000) for i in range(2)],
+            "image": [image_track(workdir, f"mc_image{i}") for i in range(2)],
+        }
+        result = {}
+        for kind, tracks in files.items():
+            latencies = []
+            for i in range(args.iterations):
+                track = tracks[i % len(tracks)]
+                player.drain()
+                sent = player.send("playid", file=track)
+                reply = player.wait_for(
+                    lambda type, data: type == "media_changed" and data.get("path") == track["path"], timeout=5
+                )
+                if reply is not None:
+                    latencies.append((reply[0] - sent) * 1000)
+                # 합치기(coalescing) 창과 겹치지 않도록 간격을 둔다
+                time.sleep(0.05)
+            result[kind] = summarize(latencies)
+        return result
+    finally:
+        player.close()
+
+
+def bench_next(workdir, args):
+    player = start_player(workdir, pstatus={"commands": {"stepDebounceMs": 50}})
+    try:
+        tracks = []
+        for i in range(8):
+            tracks.append(video_track(workdir, f"next_video{i}", 60000) if i % 2 == 0 else image_track(workdir, f"next_image{i}", time_s=60))
+        player.send("set_tracks", tracks=tracks, version=1)
+        player.send("playlist_mode", value=True)
+        player.send("playlist_play", idx=0)
+        player.wait_for(lambda type, data: type == "track_index" and data.get("value") == 0, timeout=5)
+        latencies = []
+        current = 0
+        for _ in range(args.iterations):
+            # 다음 슬롯 미리 로드가 끝나도록 대기 후 전환
+            time.sleep(0.2)
+            player.drain()
+            expected = (current + 1) % len(tracks)
+            sent = player.send("next")
+            reply = player.wait_for(lambda type, data: type == "track_index" and data.get("value") == expected, timeout=5)
+            if reply is None:
+                break
+            latencies.append((reply[0] - sent) * 1000)
+            current = expected
+        return {"transition": summarize(latencies), "tracks": len(tracks)}
+    finally:
+        player.close()
+
+
+def bench_stdout(workdir, args):
+    player = start_player(workdir)
+    try:
+        track = video_track(workdir, "stdout_video", int((args.window + 5) * 1000))
+        player.send("playid", file=track)
+        player.wait_for(lambda type, data: type == "media_changed", timeout=5)
+        time.sleep(0.5)
+        count, size, by_type = player.counters()
+        time.sleep(args.window)
+        count2, size2, by_type2 = player.counters()
+        return {
+            "window_s": args.window,
+            "messages_per_s": round((count2 - count) / args.window, 2),
+            "bytes_per_s": round((size2 - size) / args.window, 2),
+            "by_type": {type: by_type2[type] - by_type.get(type, 0) for type in by_type2 if by_type2[type] != by_type.get(type, 0)},
+        }
+    finally:
+        player.close()
+
+
+def bench_image(workdir, args):
+    """이미지 디코딩/축소 비용 (player와 같은 image_cache 함수 사용)"""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    sys.path.insert(0, HERE)
+    from PySide6.QtGui import QGuiApplication, QImage
+    from image_cache import read_image, scale_image, FAST, SMOOTH
+    app = QGuiApplication.instance() or QGuiApplication([])
+    result = {}
+    for width, height in ((1920, 1080), (3840, 2160)):
+        path = image_track(workdir, f"decode_{width}x{height}", width, height)["path"]
+        decode, fast, smooth = [], [], []
+        for _ in range(args.iterations):
+            started = time.perf_counter()
+            image = QImage(path)
+            decode.append((time.perf_counter() - started) * 1000)
+            started = time.perf_counter()
+            scale_image(image, 1280, 720, FAST)
+            fast.append((time.perf_counter() - started) * 1000)
+            started = time.perf_counter()
+            scale_image(image, 1280, 720, SMOOTH)
+            smooth.append((time.perf_counter() - started) * 1000)
+        result[f"{width}x{height}"] = {
+            "decode_ms": summarize(decode),
+            "scale_fast_ms": summarize(fast),
+            "scale_smooth_ms": summarize(smooth),
+            "bytes": image.sizeInBytes(),
+        }
+    # 원본 디코딩 vs 출력 크기(1920x1080 × 1.25) 축소 디코딩
+    bound = (2400, 1350)
+    for width, height in ((3840, 2160), (7680, 4320)):
+        path = image_track(workdir, f"decode_{width}x{height}", width, height, ext="jpg")["path"]
+        full, scaled = [], []
+        for _ in range(args.iterations):
+            full.append(read_image(path)[1])
+            scaled.append(read_image(path, bound)[1])
+        result[f"{width}x{height}_jpeg"] = {
+            "full_decode_ms": summarize([record["decode_ms"] for record in full]),
+            "scaled_decode_ms": summarize([record["decode_ms"] for record in scaled]),
+            "full_peak_bytes": full[-1]["peak_bytes"],
+            "scaled_peak_bytes": scaled[-1]["peak_bytes"],
+            "scaled_bytes": scaled[-1]["bytes"],
+            "decoded": scaled[-1]["decoded"],
+        }
+    return result
+
+
+def bench_soak(workdir, args):
+    """짧은 트랙을 계속 전환하며 RSS/스레드 수 추적 (플레이어 자동 진행 + 목록 끝 end_reached에 Node처럼 next 전송)"""
+    player = start_player(workdir, pstatus={"commands": {"stepDebounceMs": 50}})
+    try:
+        tracks = []
+        for i in range(6):
+            tracks.append(video_track(workdir, f"soak_video{i}", 400 + i * 50) if i % 3 else image_track(workdir, f"soak_image{i}", time_s=1))
+        transitions = [0]
+
+        def on_message(type, data):
+            if type == "advance_report":
+                transitions[0] += 1
+            elif type == "end_reached":
+                transitions[0] += 1
+                player.send("next")
+        player.send("set_tracks", tracks=tracks, version=1)
+        player.send("playlist_mode", value=True)
+        player.send("image_time", time=1)
+        player.on_message = on_message
+        player.send("playlist_play", idx=0)
+        samples = []
+        started = time.perf_counter()
+        while time.perf_counter() - started < args.soak:
+            time.sleep(1)
+            rss_kb, threads = player.status()
+            if rss_kb is not None:
+                samples.append((time.perf_counter() - started, rss_kb, threads))
+            player.drain()
+        player.on_message = None
+        if not samples:
+            return {"error": "RSS is not available on this platform", "transitions": transitions[0]}
+        rss = [sample[1] for sample in samples]
+        # 전반부 이후 구간의 선형 기울기 (워밍업 제외)
+        tail = samples[len(samples) // 2:]
+        slope = 0.0
+        if len(tail) > 1:
+            xs = [sample[0] for sample in tail]
+            ys = [sample[1] for sample in tail]
+            mean_x, mean_y = statistics.fmean(xs), statistics.fmean(ys)
+            denominator = sum((x - mean_x) ** 2 for x in xs)
+            if denominator:
+                slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / denominator
+        return {
+            "duration_s": args.soak,
+            "transitions": transitions[0],
+            "rss_kb": {"first": rss[0], "last": rss[-1], "min": min(rss), "max": max(rss)},
+            "rss_slope_kb_per_min": round(slope * 60, 2),
+            "threads": {"first": samples[0][2], "last": samples[-1][2], "max": max(sample[2] for sample in samples)},
+        }
+    finally:
+        player.close()
+
+
+def bench_quality(workdir, args):
+    """pause → 재개 반복 중에는 quality_report가 없고 stop 때 한 번만 나와야 함"""
+    player = start_player(workdir, pstatus={"quality": {"intervalMs": 200}})
+    try:
+        track = video_track(workdir, "quality_video", 60000)
+        player.send("playid", file=track)
+        if player.wait_for(lambda type, data: type == "player_data" and "Playing" in str(data.get("state")), timeout=5) is None:
+            return {"error": "video did not start"}
+        reports = []
+        player.on_message = lambda type, data: reports.append(data) if type == "quality_report" else None
+        cycles = max(3, args.iterations // 4)
+        for _ in range(cycles):
+            time.sleep(0.3)
+            player.send("pause", idx=0)
+            time.sleep(0.1)
+            player.send("pause", idx=0)
+        time.sleep(0.3)
+        during = len(reports)
+        player.send("stop", idx=0)
+        player.wait_for(lambda type, data: type == "quality_report", timeout=5)
+        player.on_message = None
+        return {
+            "pause_cycles": cycles,
+            "reports_during_pause": during,
+            "reports": len(reports),
+            "seconds": reports[-1]["seconds"] if reports else None,
+            "ok": during == 0 and len(reports) == 1,
+        }
+    finally:
+        player.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless player benchmark (offscreen Qt, simulated VLC backend)")
+    parser.add_argument("--only", default=",".join(BENCHMARKS), help="comma separated: " + ",".join(BENCHMARKS))
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--window", type=float, default=5.0, help="stdout measurement window (s)")
+    parser.add_argument("--soak", type=float, default=60.0, help="soak duration (s)")
+    parser.add_argument("--quick", action="store_true", help="few iterations and short soak")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+    if args.quick:
+        args.iterations, args.window, args.soak = 5, 2.0, 5.0
+
+    selected = [name for name in args.only.split(",") if name]
+    unknown = [name for name in selected if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark: {', '.join(unknown)}")
+
+    results = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "iterations": args.iterations,
+        },
+    }
+    functions = {
+        "startup": bench_startup, "media_changed": bench_media_changed, "next": bench_next,
+        "stdout": bench_stdout, "image": bench_image, "soak": bench_soak, "quality": bench_quality,
+    }
+    with tempfile.TemporaryDirectory(prefix="vp_bench_") as workdir:
+        for name in selected:
+            try:
+                results[name] = functions[name](workdir, args)
+            except Exception as e:
+                results[name] = {"error": str(e)}
+
+    text = json.dumps(results, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
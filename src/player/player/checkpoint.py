@@ -0,0 +1,159 @@
+import os, json, time, tempfile
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, Signal
+
+# =========================
+# 재생 상태 체크포인트
+# =========================
+#
+# 플레이어 프로세스가 죽었다가 다시 시작될 때 이어서 재생할 수 있도록
+# 트랙 목록/버전, 트랙 인덱스, 활성 슬롯, 재생 위치, 로고, 배경색을 파일로 남긴다.
+# - interval_ms마다 수집해서 바뀐 경우에만 저장 (재생 중에는 위치가 바뀌므로 interval_ms마다 한 번)
+# - 트랙 전환 등은 request()로 바로 저장하되 min_gap_ms보다 자주 쓰지 않는다
+# - 저장은 워커 스레드에서 임시 파일에 쓰고 fsync 후 os.replace (중간에 죽어도 이전 파일이 남음)
+# - 트랙 목록 JSON은 playlist 버전이 바뀔 때만 다시 만든다
+
+VERSION = 1
+
+
+def default_path():
+    """VP_CACHE_DIR(없으면 임시 폴더)/player_checkpoint.json"""
+    cache_dir = os.environ.get("VP_CACHE_DIR") or os.path.join(tempfile.gettempdir(), "vp_app")
+    return os.path.join(cache_dir, "player_checkpoint.json")
+
+
+def load(path):
+    """체크포인트 읽기. 없거나 버전이 다르면 None (깨진 파일은 ValueError)"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    if not isinstance(data, dict) or data.get("version") != VERSION:
+        return None
+    return data
+
+
+class CheckpointWriteTask(QRunnable):
+    def __init__(self, checkpoint, path, text):
+        super().__init__()
+        self.checkpoint = checkpoint
+        self.path = path
+        self.text = text
+
+    def run(self):
+        started = time.perf_counter()
+        try:
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(self.text)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+            self.checkpoint.written.emit((time.perf_counter() - started) * 1000, "")
+        except Exception as e:
+            self.checkpoint.written.emit((time.perf_counter() - started) * 1000, str(e))
+
+
+class Checkpoint(QObject):
+    # (소요 시간 ms, 에러 메시지 또는 "")
+    written = Signal(float, str)
+    error = Signal(str)
+
+    def __init__(self, path, collect, tracks, interval_ms=2000, min_gap_ms=250, parent=None):
+        super().__init__(parent)
+        self.path = path
+        # collect() → 상태 dict (playlist.version 포함), tracks() → 현재 트랙 목록
+        self.collect = collect
+        self.tracks = tracks
+        self.min_gap_ms = min_gap_ms
+        self.last_body = None
+        self.last_save = 0.0
+        self.tracks_version = None
+        self.tracks_json = "[]"
+        self.writing = False
+        self.queued = None
+        self.saves = 0
+        self.skipped = 0
+        self.failures = 0
+        self.write_ms_max = 0.0
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self.written.connect(self.on_written)
+        self.interval_ms = interval_ms
+        self.active = False
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.save)
+        self.soon = QTimer(self)
+        self.soon.setSingleShot(True)
+        self.soon.timeout.connect(self.save)
+
+    def start(self):
+        """저장 시작 (재개할 체크포인트를 덮어쓰지 않도록 재개가 끝난 뒤 호출)"""
+        self.active = True
+        if self.interval_ms > 0:
+            self.timer.start(self.interval_ms)
+
+    def request(self):
+        """상태가 크게 바뀜 (트랙 전환 등): min_gap_ms 안에서 가능한 빨리 저장"""
+        if not self.active or self.soon.isActive():
+            return
+        elapsed_ms = (time.monotonic() - self.last_save) * 1000
+        self.soon.start(max(0, int(self.min_gap_ms - elapsed_ms)))
+
+    def save(self, force=False):
+        """바뀐 경우에만 저장 (쓰는 중이면 마지막 내용만 대기)"""
+        state = self.collect()
+        version = state.get("playlist", {}).get("version")
+        if version != self.tracks_version:
+            self.tracks_version = version
+            self.tracks_json = json.dumps(self.tracks(), ensure_ascii=False)
+        body = json.dumps(state, ensure_ascii=False, sort_keys=True)
+        if not force and body == self.last_body:
+            self.skipped += 1
+            return
+        self.last_body = body
+        self.last_save = time.monotonic()
+        header = json.dumps({"version": VERSION, "saved_at": int(time.time() * 1000), "pid": os.getpid()})
+        text = f'{header[:-1]}, "state": {body}, "tracks": {self.tracks_json}}}'
+        if self.writing:
+            self.queued = text
+            return
+        self.writing = True
+        self.pool.start(CheckpointWriteTask(self, self.path, text))
+
+    def on_written(self, elapsed_ms, message):
+        """워커 저장 완료 (GUI 스레드)"""
+        self.writing = False
+        self.write_ms_max = max(self.write_ms_max, elapsed_ms)
+        if message:
+            self.failures += 1
+            self.error.emit(f"Failed to save checkpoint: {message}")
+        else:
+            self.saves += 1
+        if self.queued is not None:
+            text, self.queued = self.queued, None
+            self.writing = True
+            self.pool.start(CheckpointWriteTask(self, self.path, text))
+
+    def flush(self):
+        """종료 전 마지막 상태를 바로 저장 (GUI 스레드에서 대기)"""
+        if not self.active:
+            return
+        self.timer.stop()
+        self.soon.stop()
+        self.save()
+        self.pool.waitForDone(1000)
+        if self.queued is not None:
+            text, self.queued = self.queued, None
+            CheckpointWriteTask(self, self.path, text).run()
+
+    def stats(self):
+        return {
+            "path": self.path,
+            "saves": self.saves,
+            "skipped": self.skipped,
+            "failures": self.failures,
+            "pending": self.writing,
+            "write_ms_max": round(self.write_ms_max, 3),
+        }
@@ -0,0 +1,270 @@
+import time
+from metrics import Histogram
+
+# =========================
+# 명령 디스패처
+# =========================
+#
+# 명령별 스펙(인자 이름/타입/기본값, VLC 필요 여부)을 기동 시 한 번 등록하고,
+# 들어온 명령은 인자를 검증/변환한 뒤 handler(*args)로 호출한다.
+# 잘못된 인자는 handler를 호출하지 않고 CommandError로 알린다.
+# 명령별 처리 횟수/오류 수와 대기(stdin 수신 → 실행 시작) + 실행 시간 히스토그램을 기록한다.
+#
+# 같은 이벤트 루프 턴(프레임)에 도착한 명령은 실행 전에 명령별 정책으로 합친다 (CommandCoalescer).
+# - latest     : 명령 + key 인자가 같으면 마지막 명령만 남김 (seek, 볼륨, 로고/배경 같은 설정값)
+# - idempotent : 바로 앞 명령과 인자까지 같으면 합침 (반복 전송된 play/stop/set_media 등)
+#                key가 있고 key 인자 값이 모두 있으면 key만 비교 (set_tracks의 version)
+# - none       : 합치지 않음 (pause 토글, 패치, next/previous 등 상태가 있는 명령)
+
+LATEST = "latest"
+IDEMPOTENT = "idempotent"
+NONE = "none"
+
+REQUIRED = object()
+
+
+class CommandError(ValueError):
+    def __init__(self, command, message, arg=None):
+        super().__init__(message)
+        self.command = command
+        self.arg = arg
+
+
+def to_int(value):
+    if isinstance(value, bool):
+        raise ValueError("expected an integer")
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str) and value.strip().lstrip("-").isdigit():
+        return int(value)
+    raise ValueError("expected an integer")
+
+
+def to_float(value):
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise ValueError("expected a number")
+    return float(value)
+
+
+def to_bool(value):
+    if isinstance(value, bool):
+        return value
+    if value in (0, 1):
+        return bool(value)
+    if isinstance(value, str) and value.lower() in ("true", "false"):
+        return value.lower() == "true"
+    raise ValueError("expected a boolean")
+
+
+def to_str(value):
+    if not isinstance(value, str):
+        raise ValueError("expected a string")
+    return value
+
+
+def to_dict(value):
+    if not isinstance(value, dict):
+        raise ValueError("expected an object")
+    return value
+
+
+def to_list(value):
+    if not isinstance(value, list):
+        raise ValueError("expected a list")
+    return value
+
+
+CONVERTERS = {int: to_int, float: to_float, bool: to_bool, str: to_str, dict: to_dict, list: to_list}
+
+
+class Arg:
+    """명령 인자 스펙. nullable이면 None을 그대로 전달"""
+
+    def __init__(self, key, kind, default=REQUIRED, nullable=False):
+        self.key = key
+        self.kind = kind
+        self.default = default
+        self.nullable = nullable
+        self.convert = CONVERTERS[kind]
+
+    def parse(self, command, data):
+        if self.key not in data:
+            if self.default is REQUIRED:
+                raise CommandError(command, f"missing argument '{self.key}'", self.key)
+            # dict/list 기본값은 명령마다 새로 만든다
+            return type(self.default)() if isinstance(self.default, (dict, list)) else self.default
+        value = data[self.key]
+        if value is None and self.nullable:
+            return None
+        try:
+            return self.convert(value)
+        except (TypeError, ValueError) as e:
+            raise CommandError(command, f"invalid argument '{self.key}': {e}, got {value!r}", self.key)
+
+
+class CommandSpec:
+    def __init__(self, name, handler, args=(), needs_vlc=True, coalesce=NONE, key=()):
+        self.name = name
+        self.handler = handler
+        self.args = tuple(args)
+        # VLC 초기화 전에 들어오면 대기열에 보관할지
+        self.needs_vlc = needs_vlc
+        # 같은 프레임 안의 명령 합치기 정책과 latest 정책의 key 인자
+        self.coalesce = coalesce
+        keys = [arg.key for arg in self.args]
+        self.key_indices = tuple(keys.index(name) for name in key)
+
+    def parse(self, data):
+        return [arg.parse(self.name, data) for arg in self.args]
+
+
+class CommandStats:
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.wait_total = 0.0
+        self.exec_total = 0.0
+        self.latency = Histogram()
+
+    def to_dict(self):
+        data = {
+            "count": self.count,
+            "errors": self.errors,
+            "wait_avg_ms": round(self.wait_total / self.count, 3) if self.count else 0,
+            "exec_avg_ms": round(self.exec_total / self.count, 3) if self.count else 0,
+        }
+        data.update(self.latency.to_dict())
+        return data
+
+
+class CommandDispatcher:
+    def __init__(self):
+        self.specs = {}
+        self.stats_by_command = {}
+        self.unknown = 0
+        self.invalid = 0
+        # 실행한 명령 수 (누적, 초당 처리량 계산용)
+        self.executed = 0
+
+    def register(self, name, handler, *args, needs_vlc=True, coalesce=NONE, key=()):
+        self.specs[name] = CommandSpec(name, handler, args, needs_vlc=needs_vlc, coalesce=coalesce, key=key)
+
+    def parse(self, data):
+        """(스펙, 변환된 인자) 반환. 알 수 없는 명령이나 잘못된 인자는 CommandError"""
+        command = data.get("command")
+        if not isinstance(command, str):
+            self.invalid += 1
+            raise CommandError(None, f"Invalid command type: {type(command)}. Expected a string.")
+        spec = self.specs.get(command)
+        if spec is None:
+            self.unknown += 1
+            raise CommandError(command, f"Unknown command: {command}")
+        try:
+            return spec, spec.parse(data)
+        except CommandError:
+            self.invalid += 1
+            self.command_stats(command).errors += 1
+            raise
+
+    def execute(self, spec, args, received=None):
+        """handler 실행 및 지연시간 기록 (received: stdin 수신 시각, time.perf_counter 기준)"""
+        started = time.perf_counter()
+        stats = self.command_stats(spec.name)
+        try:
+            spec.handler(*args)
+        except Exception:
+            stats.errors += 1
+            raise
+        finally:
+            finished = time.perf_counter()
+            wait = (started - received) * 1000 if received is not None else 0.0
+            run = (finished - started) * 1000
+            stats.count += 1
+            self.executed += 1
+            stats.wait_total += wait
+            stats.exec_total += run
+            stats.latency.add(wait + run)
+
+    def command_stats(self, name):
+        stats = self.stats_by_command.get(name)
+        if stats is None:
+            stats = self.stats_by_command[name] = CommandStats()
+        return stats
+
+    def stats(self, reset=False):
+        data = {
+            "unknown": self.unknown,
+            "invalid": self.invalid,
+            "commands": {name: stats.to_dict() for name, stats in sorted(self.stats_by_command.items())},
+        }
+        if reset:
+            self.stats_by_command = {}
+            self.unknown = 0
+            self.invalid = 0
+        return data
+
+
+class CommandCoalescer:
+    """한 프레임 동안 들어온 명령을 정책에 따라 합친다 (GUI 스레드 전용)"""
+
+    def __init__(self):
+        self.pending = []
+        self.latest = {}
+        self.merged = {}
+        self.received = 0
+        self.frames = 0
+
+    def add(self, spec, args, received=None):
+        self.received += 1
+        if spec.coalesce == LATEST:
+            key = (spec.name,) + tuple(args[i] for i in spec.key_indices)
+            position = self.latest.get(key)
+            if position is not None:
+                # 앞의 명령은 지우고 마지막 명령을 도착 순서 위치에 둔다
+                self.pending[position] = None
+                self.count_merge(spec.name)
+            self.latest[key] = len(self.pending)
+        elif spec.coalesce == IDEMPOTENT:
+            previous = next((item for item in reversed(self.pending) if item is not None), None)
+            if previous is not None and previous[0] is spec and self.same(spec, previous[1], args):
+                self.count_merge(spec.name)
+                return
+        self.pending.append((spec, args, received))
+
+    @staticmethod
+    def same(spec, previous, args):
+        """IDEMPOTENT 명령 비교. key 인자 값이 모두 있으면 key만 비교 (예: set_tracks는 version)"""
+        if spec.key_indices:
+            keys = [args[i] for i in spec.key_indices]
+            if all(key is not None for key in keys):
+                return keys == [previous[i] for i in spec.key_indices]
+        return previous == args
+
+    def count_merge(self, name, count=1):
+        self.merged[name] = self.merged.get(name, 0) + count
+
+    def drain(self):
+        """합쳐진 명령 목록 (도착 순서)"""
+        items = [item for item in self.pending if item is not None]
+        self.pending = []
+        self.latest = {}
+        self.frames += 1
+        return items
+
+    def __len__(self):
+        return len(self.pending)
+
+    def stats(self, reset=False):
+        data = {
+            "received": self.received,
+            "frames": self.frames,
+            "merged": sum(self.merged.values()),
+            "merged_by_command": dict(self.merged),
+        }
+        if reset:
+            self.merged = {}
+            self.received = 0
+            self.frames = 0
+        return data
@@ -0,0 +1,136 @@
+import time, threading
+from collections import deque
+from PySide6.QtCore import QObject, QTimer, Qt, Signal
+
+# =========================
+# VLC 이벤트 펌프
+# =========================
+#
+# libVLC 콜백은 VLC 내부 이벤트 스레드에서 실행된다.
+# 콜백에서는 (플레이어 인덱스, 이벤트 종류, 값, 시각) 레코드만 큐에 넣고 바로 반환하고,
+# GUI 스레드의 drain()이 큐를 한 번에 비우면서 핸들러를 실행한다.
+# dedupe로 등록한 이벤트(TimeChanged 등)는 같은 batch 안에서 플레이어별 마지막 값만 처리한다.
+
+
+class VlcEventPump(QObject):
+    wake = Signal()
+
+    def __init__(self, on_error=None, max_batch=512, parent=None):
+        super().__init__(parent)
+        self.on_error = on_error
+        self.max_batch = max_batch
+        self.queue = deque()
+        self.lock = threading.Lock()
+        self.scheduled = False
+        self.handlers = {}
+        self.dedupe_kinds = set()
+        # 플레이어별 누적 이벤트 수 (reset_stats와 무관, 메트릭의 초당 이벤트 수 계산용)
+        self.posted_by_player = {}
+        # libVLC는 일부 이벤트(MediaChanged, Stopped 등)를 호출한 스레드에서 바로 보내므로
+        # GUI 스레드에서 post해도 핸들러가 호출 도중에 재진입하지 않도록 항상 큐로 전달
+        self.wake.connect(self.drain, Qt.QueuedConnection)
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.enqueued = 0
+        self.handled = 0
+        self.deduped = 0
+        self.batches = 0
+        self.max_depth = 0
+        self.latency_count = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    def register(self, kind, handler, dedupe=False):
+        """이벤트 종류별 핸들러 등록. handler(idx, value)는 GUI 스레드에서 호출"""
+        self.handlers[kind] = handler
+        if dedupe:
+            self.dedupe_kinds.add(kind)
+
+    def attach(self, event_manager, event_type, idx, kind, extract=None):
+        """VLC 이벤트를 큐에 넣는 콜백 등록. extract(event)는 콜백 안에서 값만 꺼낸다"""
+        def callback(event):
+            try:
+                value = extract(event) if extract else None
+            except Exception:
+                value = None
+            self.post(idx, kind, value)
+        event_manager.event_attach(event_type, callback)
+        return callback
+
+    def post(self, idx, kind, value=None):
+        """이벤트 레코드 추가 (임의 스레드에서 호출 가능)"""
+        with self.lock:
+            self.queue.append((idx, kind, value, time.monotonic()))
+            self.enqueued += 1
+            self.posted_by_player[idx] = self.posted_by_player.get(idx, 0) + 1
+            depth = len(self.queue)
+            if depth > self.max_depth:
+                self.max_depth = depth
+            if self.scheduled:
+                return
+            self.scheduled = True
+        self.wake.emit()
+
+    def drain(self):
+        """큐에 쌓인 이벤트를 batch로 처리 (GUI 스레드)"""
+        with self.lock:
+            count = min(len(self.queue), self.max_batch)
+            batch = [self.queue.popleft() for _ in range(count)]
+            more = bool(self.queue)
+            self.scheduled = more
+        if more:
+            QTimer.singleShot(0, self.drain)
+        if not batch:
+            return
+        self.batches += 1
+
+        # 같은 batch 안에서 dedupe 대상은 (플레이어, 종류)별 마지막 레코드만 남긴다
+        latest = {}
+        for position, record in enumerate(batch):
+            if record[1] in self.dedupe_kinds:
+                latest[(record[0], record[1])] = position
+
+        now = time.monotonic()
+        for position, (idx, kind, value, posted) in enumerate(batch):
+            if kind in self.dedupe_kinds and latest[(idx, kind)] != position:
+                self.deduped += 1
+                continue
+            latency = now - posted
+            self.latency_count += 1
+            self.latency_total += latency
+            if latency > self.latency_max:
+                self.latency_max = latency
+            handler = self.handlers.get(kind)
+            if handler is None:
+                continue
+            self.handled += 1
+            try:
+                handler(idx, value)
+            except Exception as e:
+                if self.on_error:
+                    self.on_error(f"Error in {kind} handler for player {idx}: {e}")
+
+    def posted_counts(self):
+        with self.lock:
+            return dict(self.posted_by_player)
+
+    def depth(self):
+        with self.lock:
+            return len(self.queue)
+
+    def stats(self, reset=False):
+        """큐 깊이, 처리량, 콜백→핸들러 지연시간(ms)"""
+        data = {
+            "depth": self.depth(),
+            "max_depth": self.max_depth,
+            "enqueued": self.enqueued,
+            "handled": self.handled,
+            "deduped": self.deduped,
+            "batches": self.batches,
+            "latency_avg_ms": round(self.latency_total / self.latency_count * 1000, 3) if self.latency_count else 0,
+            "latency_max_ms": round(self.latency_max * 1000, 3),
+        }
+        if reset:
+            self.reset_stats()
+        return data
@@ -0,0 +1,528 @@
+import os, re, time, random, threading
+from enum import IntEnum
+
+# =========================
+# 모의 libVLC 백엔드
+# =========================
+#
+# python-vlc 중 player가 사용하는 부분만 흉내 낸다 (VP_VLC_BACKEND=fake).
+# Windows/디스플레이/실제 미디어 없이 벤치마크와 동작 확인을 하기 위한 것이다.
+# - 이벤트 콜백은 실제 libVLC처럼 GUI가 아닌 별도 스레드(인스턴스 클럭 스레드)에서 호출된다.
+# - play() 후 Opening → Playing까지 start_delay_ms, TimeChanged는 tick_ms 간격,
+#   길이에 도달하면 EndReached. preparse는 parse_delay_ms 후 MediaParsedChanged.
+# - 미디어 길이는 파일 이름의 "_<숫자>ms" (예: clip_3000ms.mp4), 없으면 duration_ms.
+# - Media.get_stats()는 재생한 시간만큼 fps/bitrate_kbps로 계산한 누적 통계를 돌려준다.
+#   영상 프레임 손실률(천분율)은 파일 이름의 "_drop<숫자>" (예: clip_3000ms_drop50.mp4), 없으면 drop_permille.
+# 타이밍은 VP_FAKE_VLC 환경변수(JSON 아님, "key=value,key=value")로 바꿀 수 있다.
+
+SETTINGS = {
+    "duration_ms": 5000,
+    "start_delay_ms": 40,
+    "start_jitter_ms": 20,
+    "tick_ms": 40,
+    "parse_delay_ms": 15,
+    "width": 1920,
+    "height": 1080,
+    "fps": 30,
+    "bitrate_kbps": 8000,
+    "drop_permille": 0,
+    "audio_lost_permille": 0,
+}
+
+
+def configure(**values):
+    SETTINGS.update(values)
+
+
+def configure_from_env(text):
+    for item in filter(None, (text or "").split(",")):
+        key, _, value = item.partition("=")
+        if key.strip() in SETTINGS:
+            SETTINGS[key.strip()] = int(value)
+
+
+configure_from_env(os.environ.get("VP_FAKE_VLC"))
+
+
+class VlcEnum(IntEnum):
+    """str()이 python-vlc와 같은 "EventType.MediaPlayerPlaying" 형식"""
+
+    def __str__(self):
+        return f"{type(self).__name__}.{self.name}"
+
+
+class EventType(VlcEnum):
+    MediaParsedChanged = 3
+    MediaPlayerMediaChanged = 0x100
+    MediaPlayerOpening = 0x102
+    MediaPlayerPlaying = 0x104
+    MediaPlayerPaused = 0x105
+    MediaPlayerStopped = 0x106
+    MediaPlayerEndReached = 0x109
+    MediaPlayerEncounteredError = 0x10A
+    MediaPlayerTimeChanged = 0x10B
+    MediaPlayerLengthChanged = 0x111
+    MediaPlayerAudioVolume = 0x11A
+
+
+class State(VlcEnum):
+    NothingSpecial = 0
+    Opening = 1
+    Buffering = 2
+    Playing = 3
+    Paused = 4
+    Stopped = 5
+    Ended = 6
+    Error = 7
+
+
+class MediaParseFlag(VlcEnum):
+    local = 0
+    network = 1
+
+
+class MediaParsedStatus(VlcEnum):
+    skipped = 1
+    failed = 2
+    timeout = 3
+    done = 4
+
+
+class TrackType(VlcEnum):
+    unknown = -1
+    audio = 0
+    video = 1
+    ext = 2
+
+
+class VideoAdjustOption(VlcEnum):
+    Enable = 0
+    Contrast = 1
+    Brightness = 2
+    Hue = 3
+    Saturation = 4
+    Gamma = 5
+
+
+class VideoTrack:
+    pass
+
+
+class EventUnion:
+    def __init__(self, new_time=0, new_length=0):
+        self.new_time = new_time
+        self.new_length = new_length
+
+
+class Event:
+    def __init__(self, type, **values):
+        self.type = type
+        self.u = EventUnion(**values)
+
+
+class EventManager:
+    def __init__(self):
+        self.callbacks = {}
+        self.lock = threading.Lock()
+
+    def event_attach(self, event_type, callback, *args, **kwargs):
+        with self.lock:
+            self.callbacks.setdefault(event_type, []).append((callback, args, kwargs))
+        return 0
+
+    def event_detach(self, event_type):
+        with self.lock:
+            self.callbacks.pop(event_type, None)
+
+    def emit(self, event_type, **values):
+        with self.lock:
+            callbacks = list(self.callbacks.get(event_type, ()))
+        if not callbacks:
+            return
+        event = Event(event_type, **values)
+        for callback, args, kwargs in callbacks:
+            try:
+                callback(event, *args, **kwargs)
+            except Exception:
+                pass
+
+
+def duration_for(mrl):
+    match = re.search(r"_(\d+)ms", mrl)
+    return int(match.group(1)) if match else SETTINGS["duration_ms"]
+
+
+def drop_permille_for(mrl):
+    match = re.search(r"_drop(\d+)", mrl)
+    return int(match.group(1)) if match else SETTINGS["drop_permille"]
+
+
+class MediaStats:
+    """python-vlc MediaStats와 같은 필드"""
+
+    def __init__(self):
+        self.i_read_bytes = 0
+        self.f_input_bitrate = 0.0
+        self.i_demux_read_bytes = 0
+        self.f_demux_bitrate = 0.0
+        self.i_demux_corrupted = 0
+        self.i_demux_discontinuity = 0
+        self.i_decoded_video = 0
+        self.i_decoded_audio = 0
+        self.i_displayed_pictures = 0
+        self.i_lost_pictures = 0
+        self.i_played_abuffers = 0
+        self.i_lost_abuffers = 0
+        self.i_sent_packets = 0
+        self.i_sent_bytes = 0
+        self.f_send_bitrate = 0.0
+
+
+class Media:
+    def __init__(self, instance, mrl):
+        self.instance = instance
+        self.mrl = mrl
+        self.duration = duration_for(mrl)
+        self.drop_permille = drop_permille_for(mrl)
+        # 재생한 누적 시간 (ms). get_stats 계산용
+        self.played_ms = 0
+        self.parsed_status = 0
+        self.events = EventManager()
+
+    def get_mrl(self):
+        return self.mrl
+
+    def event_manager(self):
+        return self.events
+
+    def parse_with_options(self, flags, timeout):
+        self.instance.schedule(SETTINGS["parse_delay_ms"], self.on_parsed)
+        return 0
+
+    def on_parsed(self):
+        self.parsed_status = MediaParsedStatus.done
+        self.events.emit(EventType.MediaParsedChanged)
+
+    def get_parsed_status(self):
+        return self.parsed_status
+
+    def get_duration(self):
+        return self.duration if self.parsed_status else -1
+
+    def tracks_get(self):
+        return None
+
+    def get_stats(self, stats):
+        """재생한 시간 기준 누적 통계"""
+        seconds = self.played_ms / 1000
+        bytes_per_s = SETTINGS["bitrate_kbps"] * 1000 / 8
+        decoded = int(seconds * SETTINGS["fps"])
+        lost = decoded * self.drop_permille // 1000
+        # 48kHz, 버퍼당 1024 샘플
+        audio = int(seconds * 48000 / 1024)
+        lost_audio = audio * SETTINGS["audio_lost_permille"] // 1000
+        stats.i_read_bytes = int(seconds * bytes_per_s)
+        stats.f_input_bitrate = bytes_per_s / 1e6
+        stats.i_demux_read_bytes = int(seconds * bytes_per_s * 0.98)
+        stats.f_demux_bitrate = bytes_per_s * 0.98 / 1e6
+        stats.i_decoded_video = decoded
+        stats.i_displayed_pictures = decoded - lost
+        stats.i_lost_pictures = lost
+        stats.i_decoded_audio = audio
+        stats.i_played_abuffers = audio - lost_audio
+        stats.i_lost_abuffers = lost_audio
+        return True
+
+    def release(self):
+        pass
+
+
+class NativePointer:
+    """ctypes c_void_p처럼 .value로 주소를 읽는 값"""
+
+    def __init__(self, value):
+        self.value = value
+
+
+class MediaRef:
+    """MediaPlayer.get_media() 결과. python-vlc처럼 호출할 때마다 새 wrapper (같은 미디어여도 is로 비교 불가)"""
+
+    def __init__(self, media):
+        self._media = media
+        self._as_parameter_ = NativePointer(id(media))
+
+    def __getattr__(self, name):
+        return getattr(self._media, name)
+
+
+class AudioOutputDevice:
+    def __init__(self, device, description, next=None):
+        self.device = device
+        self.description = description
+        self.next = next
+
+
+class DevicePointer:
+    """ctypes 포인터처럼 .contents로 접근하는 장치 목록 노드"""
+
+    def __init__(self, contents):
+        self.contents = contents
+
+    def __bool__(self):
+        return self.contents is not None
+
+
+def device_list(devices):
+    node = None
+    for device, description in reversed(devices):
+        node = DevicePointer(AudioOutputDevice(device.encode(), description.encode(), node))
+    return node
+
+
+class MediaPlayer:
+    def __init__(self, instance):
+        self.instance = instance
+        self.events = EventManager()
+        self.media = None
+        self.state = State.NothingSpecial
+        self.time = 0
+        self.length = 0
+        self.volume = 100
+        self.muted = False
+        self.adjust = {VideoAdjustOption.Enable: 0, VideoAdjustOption.Brightness: 1.0}
+        self.rate = 1.0
+        self.fullscreen = False
+        self.device = None
+        self.started_at = None
+        self.generation = 0
+
+    def get_instance(self):
+        return self.instance
+
+    def event_manager(self):
+        return self.events
+
+    def set_hwnd(self, hwnd):
+        pass
+
+    def set_xwindow(self, xid):
+        pass
+
+    def audio_output_device_enum(self):
+        return device_list(self.instance.devices)
+
+    def audio_output_device_set(self, module, device_id):
+        self.device = device_id
+        return None
+
+    def audio_set_volume(self, volume):
+        self.volume = volume
+        self.events.emit(EventType.MediaPlayerAudioVolume)
+        return 0
+
+    def audio_get_volume(self):
+        return self.volume
+
+    def audio_set_mute(self, mute):
+        self.muted = bool(mute)
+
+    def audio_get_mute(self):
+        return int(self.muted)
+
+    def video_set_adjust_int(self, option, value):
+        self.adjust[option] = int(value)
+
+    def video_set_adjust_float(self, option, value):
+        self.adjust[option] = float(value)
+
+    def video_get_adjust_int(self, option):
+        return int(self.adjust.get(option, 0))
+
+    def video_get_adjust_float(self, option):
+        return float(self.adjust.get(option, 0.0))
+
+    def set_media(self, media):
+        with self.instance.lock:
+            self.generation += 1
+            self.media = media
+            self.state = State.NothingSpecial
+            self.time = 0
+            self.length = 0
+        self.events.emit(EventType.MediaPlayerMediaChanged)
+
+    def get_media(self):
+        return MediaRef(self.media) if self.media is not None else None
+
+    def play(self):
+        with self.instance.lock:
+            if self.media is None:
+                return -1
+            if self.state in (State.Opening, State.Playing):
+                return 0
+            if self.state == State.Paused:
+                self.resume()
+                resumed = True
+            else:
+                resumed = False
+                self.generation += 1
+                generation = self.generation
+                self.state = State.Opening
+                self.time = 0
+        if resumed:
+            self.events.emit(EventType.MediaPlayerPlaying)
+            return 0
+        self.events.emit(EventType.MediaPlayerOpening)
+        delay = SETTINGS["start_delay_ms"] + random.randint(0, SETTINGS["start_jitter_ms"])
+        self.instance.schedule(delay, lambda: self.on_started(generation))
+        return 0
+
+    def on_started(self, generation):
+        with self.instance.lock:
+            if generation != self.generation or self.state != State.Opening:
+                return
+            self.state = State.Playing
+            self.length = self.media.duration
+            self.started_at = time.monotonic()
+            self.instance.playing.add(self)
+        self.events.emit(EventType.MediaPlayerLengthChanged, new_length=self.length)
+        self.events.emit(EventType.MediaPlayerPlaying)
+
+    def tick(self, now):
+        """인스턴스 클럭 스레드에서 호출 (lock 보유 상태). 보낼 이벤트 목록 반환"""
+        if self.state != State.Playing:
+            return ()
+        previous = self.time
+        self.time = min(int((now - self.started_at) * 1000 * self.rate), self.length)
+        self.media.played_ms += max(0, self.time - previous)
+        if self.time >= self.length:
+            self.state = State.Ended
+            return ((EventType.MediaPlayerTimeChanged, {"new_time": self.time}), (EventType.MediaPlayerEndReached, {}))
+        return ((EventType.MediaPlayerTimeChanged, {"new_time": self.time}),)
+
+    def resume(self):
+        self.state = State.Playing
+        self.started_at = time.monotonic() - self.time / 1000
+        self.instance.playing.add(self)
+
+    def pause(self):
+        with self.instance.lock:
+            if self.state == State.Playing:
+                self.state = State.Paused
+                event = EventType.MediaPlayerPaused
+            elif self.state == State.Paused:
+                self.resume()
+                event = EventType.MediaPlayerPlaying
+            else:
+                return
+        self.events.emit(event)
+
+    def set_pause(self, do_pause):
+        """python-vlc와 같이 토글이 아닌 일시정지(1)/재개(0)"""
+        with self.instance.lock:
+            if do_pause and self.state == State.Playing:
+                self.state = State.Paused
+                event = EventType.MediaPlayerPaused
+            elif not do_pause and self.state == State.Paused:
+                self.resume()
+                event = EventType.MediaPlayerPlaying
+            else:
+                return
+        self.events.emit(event)
+
+    def stop(self):
+        with self.instance.lock:
+            self.generation += 1
+            stopped = self.state not in (State.NothingSpecial, State.Stopped)
+            self.state = State.Stopped
+            self.time = 0
+        if stopped:
+            self.events.emit(EventType.MediaPlayerStopped)
+
+    def is_playing(self):
+        return 1 if self.state == State.Playing else 0
+
+    def get_state(self):
+        return self.state
+
+    def get_time(self):
+        return self.time if self.media is not None else -1
+
+    def set_time(self, value):
+        with self.instance.lock:
+            self.time = max(0, min(int(value), self.length or int(value)))
+            if self.state == State.Playing:
+                self.started_at = time.monotonic() - self.time / 1000
+
+    def get_length(self):
+        return self.length
+
+    def get_position(self):
+        return self.time / self.length if self.length else 0.0
+
+    def get_rate(self):
+        return self.rate
+
+    def set_rate(self, rate):
+        self.rate = rate
+        return 0
+
+    def get_fullscreen(self):
+        return int(self.fullscreen)
+
+    def set_fullscreen(self, value):
+        self.fullscreen = bool(value)
+
+    def release(self):
+        self.stop()
+
+
+class Instance:
+    def __init__(self, *args):
+        self.args = args
+        self.lock = threading.RLock()
+        self.playing = set()
+        self.timers = []
+        self.devices = [("", "Default"), ("speakers", "Speakers"), ("hdmi", "HDMI Audio")]
+        self.wakeup = threading.Event()
+        self.running = True
+        self.thread = threading.Thread(target=self.run, name="fakeVlcClock", daemon=True)
+        self.thread.start()
+
+    def media_player_new(self):
+        return MediaPlayer(self)
+
+    def media_new(self, mrl):
+        return Media(self, mrl)
+
+    def schedule(self, delay_ms, callback):
+        """delay_ms 후 클럭 스레드에서 callback 실행"""
+        with self.lock:
+            self.timers.append((time.monotonic() + delay_ms / 1000, callback))
+        self.wakeup.set()
+
+    def run(self):
+        while self.running:
+            timeout = SETTINGS["tick_ms"] / 1000
+            with self.lock:
+                if self.timers:
+                    timeout = max(0.0, min(timeout, min(timer[0] for timer in self.timers) - time.monotonic()))
+            self.wakeup.wait(timeout)
+            self.wakeup.clear()
+            now = time.monotonic()
+            with self.lock:
+                due = [timer for timer in self.timers if timer[0] <= now]
+                self.timers = [timer for timer in self.timers if timer[0] > now]
+                events = []
+                for player in list(self.playing):
+                    player_events = player.tick(now)
+                    if player.state != State.Playing:
+                        self.playing.discard(player)
+                    events.extend((player, event_type, values) for event_type, values in player_events)
+            for _, callback in sorted(due, key=lambda timer: timer[0]):
+                callback()
+            for player, event_type, values in events:
+                player.events.emit(event_type, **values)
+
+    def release(self):
+        self.running = False
+        self.wakeup.set()
@@ -0,0 +1,434 @@
+import os, time, math, threading
+from collections import OrderedDict, deque
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QSize, Qt, Signal
+from PySide6.QtGui import QImageIOHandler, QImageReader, QPixmap
+from metrics import Histogram
+
+# =========================
+# 이미지 디코딩 캐시
+# =========================
+#
+# (경로, mtime, 크기)를 키로 하는 메모리 제한 LRU 캐시.
+# 디코딩은 워커 스레드에서 QImage로 하고, QPixmap 변환은 GUI 스레드에서 한다.
+# 플레이리스트의 다음 이미지들을 prefetch()로 미리 디코딩해 전환 시점의 디스크 I/O/디코딩을 없앤다.
+#
+# 화면에 그리는 것은 원본이 아니라 위젯 크기로 축소한 QPixmap이므로,
+# 축소 결과도 (이미지 키, 목표 크기, 변환 방식)을 키로 별도 LRU에 저장한다.
+# - FAST   : 리사이즈 중 GUI 스레드에서 바로 만드는 빠른 변환
+# - SMOOTH : 워커 스레드에서 만드는 고품질 변환 (scale_async)
+#
+# 원본 해상도로 디코딩하지 않고 출력 크기 × margin(decode bound) 안으로 축소 디코딩한다.
+# - QImageReader.setScaledSize: JPEG는 디코딩 단계에서 DCT 축소(1/2, 1/4, 1/8)를 하므로
+#   8K/12K 사진도 원본 크기의 버퍼를 만들지 않는다. 지원하지 않는 형식은 Qt가 원본 디코딩 후 축소한다.
+# - 원본이 bound의 2배 미만인 JPEG는 DCT 축소가 없어 축소 디코딩이 원본 + 결과 두 버퍼를 만든다.
+#   이때는 원본 크기로 디코딩해 캐시에 두고 화면 크기 축소는 축소 캐시에 맡긴다
+#   (최대 메모리는 원본 하나, 대신 캐시에는 원본 크기로 보관).
+# - 축소 디코딩한 이미지에는 원본 크기를 기록해 두고(NATIVE_TEXT),
+#   창이 커져 그 bound로는 부족해진 이미지만 다시 디코딩한다 (창이 작아지면 그대로 사용).
+# - get()이 prefetch 중인 이미지를 요청하면 같은 이미지를 다시 디코딩하지 않는다.
+#   워커가 아직 시작하지 않았으면 작업을 회수해 바로 디코딩하고, 진행 중이면 그 결과를 기다린다.
+# - 이미지별 원본/디코딩 크기, 보관 바이트, 추정 최대 메모리, 디코딩 시간을 기록한다 (stats()["decode"]).
+
+FAST = int(Qt.FastTransformation.value)
+SMOOTH = int(Qt.SmoothTransformation.value)
+
+
+def file_key(path):
+    """캐시 키 (경로, mtime, 파일 크기). 파일이 없으면 None"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (os.path.normcase(os.path.abspath(path)), stat.st_mtime_ns, stat.st_size)
+
+
+# 축소 디코딩한 QImage에 원본 크기("폭,높이")를 남기는 텍스트 키
+NATIVE_TEXT = "vp-native-size"
+# JPEG 핸들러가 디코딩 단계에서 쓰는 DCT 축소 비율
+JPEG_DENOMS = (8, 4, 2, 1)
+
+
+def native_size(image):
+    """축소 디코딩한 이미지의 원본 크기 (QSize). 원본 그대로면 None"""
+    text = image.text(NATIVE_TEXT)
+    if not text:
+        return None
+    width, height = text.split(",")
+    return QSize(int(width), int(height))
+
+
+def bounded_size(native, bound):
+    """원본 크기를 bound(폭, 높이) 안으로 비율 유지 축소. 이미 작으면 원본 크기"""
+    if bound is None or (native.width() <= bound[0] and native.height() <= bound[1]):
+        return native
+    return native.scaled(bound[0], bound[1], Qt.KeepAspectRatio)
+
+
+def jpeg_denom(native, target):
+    """Qt JPEG 핸들러의 DCT 축소 비율 (정수 비율로 target 이상이 되는 가장 큰 분모)"""
+    ratio = min(native.width() // max(1, target.width()), native.height() // max(1, target.height()))
+    return next(d for d in JPEG_DENOMS if d <= max(1, ratio))
+
+
+def jpeg_peak_pixels(native, target):
+    """Qt JPEG 핸들러의 DCT 축소 단계 픽셀 수"""
+    denom = jpeg_denom(native, target)
+    return math.ceil(native.width() / denom) * math.ceil(native.height() / denom)
+
+
+def read_image(path, bound=None):
+    """
+    QImageReader로 디코딩. bound(폭, 높이)보다 크면 그 안으로 축소 디코딩
+    (QImage, 기록) 반환. 기록은 크기/바이트/추정 최대 메모리/소요 시간
+    """
+    started = time.perf_counter()
+    reader = QImageReader(path)
+    native = reader.size()
+    target = bounded_size(native, bound) if native.isValid() else native
+    reduced = target != native
+    # read() 이후에는 핸들러 정보가 비므로 먼저 확인
+    jpeg = bytes(reader.format()) == b"jpeg"
+    # DCT 축소가 없는 JPEG는 축소 디코딩이 원본 디코딩보다 최대 메모리가 크므로 원본 그대로 디코딩
+    if reduced and jpeg and jpeg_denom(native, target) == 1:
+        reduced = False
+    in_decoder = reduced and reader.supportsOption(QImageIOHandler.ScaledSize)
+    if reduced:
+        reader.setScaledSize(target)
+    image = reader.read()
+    decode_ms = (time.perf_counter() - started) * 1000
+    if image.isNull():
+        return image, {"path": path, "error": reader.errorString(), "decode_ms": round(decode_ms, 3)}
+    if not native.isValid():
+        native = image.size()
+    if reduced:
+        image.setText(NATIVE_TEXT, f"{native.width()},{native.height()}")
+    pixel_bytes = max(image.depth(), 8) // 8
+    native_bytes = native.width() * native.height() * pixel_bytes
+    # 추정 최대 메모리: 디코딩 중 동시에 존재하는 버퍼 크기
+    # (축소 미지원 형식은 원본 + 결과, JPEG는 DCT 축소 결과 + 결과)
+    if not reduced:
+        peak_bytes = image.sizeInBytes()
+    elif not in_decoder:
+        peak_bytes = native_bytes + image.sizeInBytes()
+    elif jpeg:
+        peak_bytes = jpeg_peak_pixels(native, target) * pixel_bytes + image.sizeInBytes()
+    else:
+        peak_bytes = image.sizeInBytes()
+    return image, {
+        "path": path,
+        "native": [native.width(), native.height()],
+        "decoded": [image.width(), image.height()],
+        "scaled_decode": in_decoder,
+        "bytes": image.sizeInBytes(),
+        "native_bytes": native_bytes,
+        "peak_bytes": peak_bytes,
+        "decode_ms": round(decode_ms, 3),
+    }
+
+
+def pixmap_bytes(pixmap):
+    return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+
+def scale_image(image, width, height, mode):
+    return image.scaled(width, height, Qt.KeepAspectRatio, Qt.TransformationMode(mode))
+
+
+class LruCache:
+    """바이트 크기 제한 LRU (GUI 스레드 전용)"""
+
+    def __init__(self, max_bytes, sizeof):
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.evictions = 0
+
+    def get(self, key):
+        value = self.entries.get(key)
+        if value is not None:
+            self.entries.move_to_end(key)
+        return value
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def put(self, key, value):
+        if key in self.entries:
+            self.total_bytes -= self.sizeof(self.entries.pop(key))
+        self.entries[key] = value
+        self.total_bytes += self.sizeof(value)
+        # 방금 넣은 항목은 남기고 오래된 항목부터 제거
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            _, evicted = self.entries.popitem(last=False)
+            self.total_bytes -= self.sizeof(evicted)
+            self.evictions += 1
+        return value
+
+    def clear(self):
+        self.entries.clear()
+        self.total_bytes = 0
+
+
+class ImageDecodeTask(QRunnable):
+    """워커 디코딩. 결과는 done 이벤트로도 알려 get()이 진행 중인 디코딩을 기다릴 수 있게 한다"""
+
+    def __init__(self, cache, key, path, bound):
+        super().__init__()
+        # get()에서 pool.tryTake()로 회수할 수 있도록 Qt가 지우지 않게 한다 (in_flight가 참조를 가짐)
+        self.setAutoDelete(False)
+        self.cache = cache
+        self.key = key
+        self.path = path
+        self.bound = bound
+        self.result = None
+        self.done = threading.Event()
+
+    def run(self):
+        self.result = read_image(self.path, self.bound)
+        self.done.set()
+        self.cache.image_decoded.emit(self.key, self)
+
+
+class ImageScaleTask(QRunnable):
+    def __init__(self, cache, key, image, width, height):
+        super().__init__()
+        self.cache = cache
+        self.key = key
+        self.image = image
+        self.width = width
+        self.height = height
+
+    def run(self):
+        started = time.perf_counter()
+        scaled = scale_image(self.image, self.width, self.height, SMOOTH)
+        self.cache.image_scaled.emit((self.key, self.width, self.height, SMOOTH), scaled, (time.perf_counter() - started) * 1000)
+
+
+class ImageCache(QObject):
+    # (키, ImageDecodeTask)
+    image_decoded = Signal(object, object)
+    # (키, 이미지, 소요 시간 ms)
+    image_scaled = Signal(object, object, float)
+    # (이미지 키, 폭, 높이) 고품질 축소 완료 알림
+    scaled_ready = Signal(object, int, int)
+    # (이미지 키) 더 큰 bound로 다시 디코딩 완료 알림
+    image_ready = Signal(object)
+
+    def __init__(self, max_bytes=512 * 1024 * 1024, scaled_max_bytes=128 * 1024 * 1024, workers=2,
+                 scaled_decode=True, margin=1.25, recent=32, parent=None):
+        super().__init__(parent)
+        self.images = LruCache(max_bytes, lambda image: image.sizeInBytes())
+        self.scaled = LruCache(scaled_max_bytes, pixmap_bytes)
+        # 키 → 진행 중인 ImageDecodeTask
+        self.in_flight = {}
+        self.scaling = set()
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max(1, workers))
+        self.image_decoded.connect(self.on_image_decoded)
+        self.image_scaled.connect(self.on_image_scaled)
+        self.hits = 0
+        self.misses = 0
+        self.prefetched = 0
+        self.failures = 0
+        self.scaled_hits = 0
+        self.scaled_misses = 0
+        # 디코딩/축소 소요 시간 (워커 스레드 측정값도 GUI 스레드에서 기록)
+        self.decode_ms = Histogram()
+        self.scale_ms = Histogram()
+        # 축소 디코딩 bound (출력 크기 × margin). None이면 원본 해상도
+        self.scaled_decode = scaled_decode
+        self.margin = margin
+        self.bound = None
+        # 출력(창)별 bound. 여러 출력이 캐시를 공유하면 가장 큰 출력 기준으로 디코딩
+        self.output_bounds = {}
+        self.redecodes = 0
+        self.reduced = 0
+        self.bytes_saved = 0
+        self.peak_bytes_max = 0
+        self.recent = deque(maxlen=max(1, recent))
+
+    def set_output(self, width, height, output=0):
+        """출력(창) 크기 변경. bound가 커졌으면 True (축소 디코딩한 이미지의 재디코딩 필요)"""
+        if not self.scaled_decode or width <= 0 or height <= 0:
+            return False
+        self.output_bounds[output] = (math.ceil(width * self.margin), math.ceil(height * self.margin))
+        bound = (
+            max(size[0] for size in self.output_bounds.values()),
+            max(size[1] for size in self.output_bounds.values()),
+        )
+        grown = self.bound is not None and (bound[0] > self.bound[0] or bound[1] > self.bound[1])
+        self.bound = bound
+        return grown
+
+    def fits(self, image):
+        """현재 bound로 다시 디코딩해도 더 커지지 않는지"""
+        native = native_size(image)
+        if native is None:
+            return True
+        target = bounded_size(native, self.bound)
+        return target.width() <= image.width() and target.height() <= image.height()
+
+    def record(self, record):
+        """이미지별 디코딩 기록 (GUI 스레드)"""
+        self.decode_ms.add(record["decode_ms"])
+        if "bytes" not in record:
+            return
+        if record["decoded"] != record["native"]:
+            self.reduced += 1
+        self.bytes_saved += record["native_bytes"] - record["bytes"]
+        self.peak_bytes_max = max(self.peak_bytes_max, record["peak_bytes"])
+        self.recent.append(record)
+
+    def get(self, path):
+        """(캐시 키, QImage) 반환. 캐시에 없거나 현재 bound보다 작게 디코딩돼 있으면 바로 디코딩"""
+        key = file_key(path)
+        if key is None:
+            self.failures += 1
+            return None, None
+        image = self.images.get(key)
+        if image is not None:
+            if self.fits(image):
+                self.hits += 1
+                return key, image
+            self.redecodes += 1
+        self.misses += 1
+        task = self.in_flight.pop(key, None)
+        if task is not None and not self.pool.tryTake(task):
+            # 워커가 디코딩 중: 처음부터 다시 디코딩하지 않고 결과를 기다린다 (on_image_decoded는 무시됨)
+            task.done.wait()
+            image, record = task.result
+            self.record(record)
+            if image.isNull():
+                self.failures += 1
+                return key, None
+            if self.fits(image):
+                return key, self.store(key, image)
+        image, record = read_image(path, self.bound)
+        self.record(record)
+        if image.isNull():
+            self.failures += 1
+            return key, None
+        return key, self.store(key, image)
+
+    def store(self, key, image):
+        """get()에서 디코딩한 이미지 저장 (같은 키의 이전 크기 기준 축소 결과는 버림)"""
+        if key in self.images:
+            self.forget_scaled(key)
+        return self.images.put(key, image)
+
+    def prefetch(self, paths):
+        """이미지 경로들을 워커 스레드에서 미리 디코딩 (현재 bound보다 작게 디코딩된 항목은 다시 디코딩)"""
+        for path in paths:
+            key = file_key(path)
+            if key is None or key in self.in_flight:
+                continue
+            cached = self.images.entries.get(key)
+            if cached is not None:
+                if self.fits(cached):
+                    continue
+                self.redecodes += 1
+            task = self.in_flight[key] = ImageDecodeTask(self, key, path, self.bound)
+            self.prefetched += 1
+            self.pool.start(task)
+
+    def on_image_decoded(self, key, task):
+        """워커 디코딩 완료 (GUI 스레드). get()이 이미 결과를 가져갔으면 무시"""
+        if self.in_flight.get(key) is not task:
+            return
+        del self.in_flight[key]
+        image, record = task.result
+        self.record(record)
+        if image.isNull():
+            self.failures += 1
+            return
+        cached = self.images.entries.get(key)
+        if cached is None:
+            self.images.put(key, image)
+        elif image.width() > cached.width():
+            # 더 큰 bound로 다시 디코딩: 교체 후 이전 크기 기준 축소 결과는 버린다
+            self.images.put(key, image)
+            self.forget_scaled(key)
+            self.image_ready.emit(key)
+
+    def forget_scaled(self, key):
+        """이미지 키의 축소 결과 제거 (진행 중인 축소 결과도 버림)"""
+        for scaled_key in [k for k in self.scaled.entries if k[0] == key]:
+            self.scaled.total_bytes -= self.scaled.sizeof(self.scaled.entries.pop(scaled_key))
+        self.scaling = {k for k in self.scaling if k[0] != key}
+
+    def scaled_pixmap(self, key, image, width, height, mode=SMOOTH, create=True):
+        """축소된 QPixmap 반환. 없으면 create일 때 GUI 스레드에서 바로 축소"""
+        if width <= 0 or height <= 0:
+            return None
+        scaled_key = (key, width, height, mode)
+        pixmap = self.scaled.get(scaled_key)
+        if pixmap is not None:
+            self.scaled_hits += 1
+            return pixmap
+        self.scaled_misses += 1
+        if not create:
+            return None
+        started = time.perf_counter()
+        scaled = scale_image(image, width, height, mode)
+        self.scale_ms.add((time.perf_counter() - started) * 1000)
+        return self.scaled.put(scaled_key, QPixmap.fromImage(scaled))
+
+    def scale_async(self, key, image, width, height):
+        """고품질 축소를 워커 스레드에 요청. 완료되면 scaled_ready 발생"""
+        scaled_key = (key, width, height, SMOOTH)
+        if width <= 0 or height <= 0 or scaled_key in self.scaled or scaled_key in self.scaling:
+            return
+        self.scaling.add(scaled_key)
+        self.pool.start(ImageScaleTask(self, key, image, width, height))
+
+    def on_image_scaled(self, scaled_key, image, elapsed_ms):
+        """워커 축소 완료 (GUI 스레드): QPixmap 변환 후 저장"""
+        self.scale_ms.add(elapsed_ms)
+        if scaled_key not in self.scaling:
+            # 요청 후 원본이 다시 디코딩됨
+            return
+        self.scaling.discard(scaled_key)
+        if image.isNull():
+            return
+        self.scaled.put(scaled_key, QPixmap.fromImage(image))
+        key, width, height, _ = scaled_key
+        self.scaled_ready.emit(key, width, height)
+
+    def clear(self):
+        self.images.clear()
+        self.scaled.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        scaled_lookups = self.scaled_hits + self.scaled_misses
+        return {
+            "entries": len(self.images.entries),
+            "bytes": self.images.total_bytes,
+            "max_bytes": self.images.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0,
+            "evictions": self.images.evictions,
+            "prefetched": self.prefetched,
+            "in_flight": len(self.in_flight),
+            "failures": self.failures,
+            "scaled": {
+                "entries": len(self.scaled.entries),
+                "bytes": self.scaled.total_bytes,
+                "hits": self.scaled_hits,
+                "misses": self.scaled_misses,
+                "hit_rate": round(self.scaled_hits / scaled_lookups, 3) if scaled_lookups else 0,
+                "evictions": self.scaled.evictions,
+                "in_flight": len(self.scaling),
+            },
+            "decode": {
+                "bound": list(self.bound) if self.bound is not None else None,
+                "margin": self.margin,
+                "reduced": self.reduced,
+                "redecodes": self.redecodes,
+                "bytes_saved": self.bytes_saved,
+                "peak_bytes_max": self.peak_bytes_max,
+                "recent": list(self.recent),
+            },
+        }
@@ -0,0 +1,176 @@
+import os
+from PySide6.QtWidgets import QLabel
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Qt, Signal
+from PySide6.QtGui import QImage, QPainter, QPixmap
+from image_cache import read_image
+
+# =========================
+# 로고 표시
+# =========================
+#
+# 로고 위젯(QLabel) 하나를 계속 재사용한다.
+# - 표시 여부/위치 변경: 기존 위젯만 갱신 (다시 읽지 않음)
+# - 파일/크기 변경: 워커 스레드에서 다시 렌더링
+# 렌더링 결과는 (파일, mtime, 파일 크기, 로고 크기)별로 캐시한다.
+# QtSvg는 SVG 로고를 처음 렌더링할 때 워커 스레드에서 import 한다 (기동 시간 단축).
+# 래스터 로고는 로고 폭 안으로 축소 디코딩한다 (image_cache.read_image).
+
+# 축소 디코딩 bound의 높이 (폭만 제한)
+UNBOUNDED = 16777215
+
+
+def logo_key(path, size):
+    """캐시 키 (경로, mtime, 파일 크기, 로고 크기). 파일이 없으면 None"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (os.path.normcase(os.path.abspath(path)), stat.st_mtime_ns, stat.st_size, size)
+
+
+def fit_size(width, height, size):
+    """로고 크기(폭) 기준으로 비율 유지. size <= 0 이면 원본 크기"""
+    if size > 0 and width > 0:
+        return size, int(height * (size / width))
+    return width, height
+
+
+class LogoRenderTask(QRunnable):
+    def __init__(self, logo, key, path, size):
+        super().__init__()
+        self.logo = logo
+        self.key = key
+        self.path = path
+        self.size = size
+
+    def run(self):
+        try:
+            if self.path.lower().endswith(".svg"):
+                from PySide6.QtSvg import QSvgRenderer
+                renderer = QSvgRenderer(self.path)
+                if not renderer.isValid():
+                    self.logo.render_failed.emit(self.key, "Failed to load SVG logo file.")
+                    return
+                default_size = renderer.defaultSize()
+                width, height = fit_size(default_size.width(), default_size.height(), self.size)
+                image = QImage(max(1, width), max(1, height), QImage.Format_ARGB32_Premultiplied)
+                image.fill(Qt.transparent)
+                painter = QPainter(image)
+                renderer.render(painter)
+                painter.end()
+            else:
+                source, _ = read_image(self.path, (self.size, UNBOUNDED) if self.size > 0 else None)
+                if source.isNull():
+                    self.logo.render_failed.emit(self.key, "Pixmap is null. Failed to load image.")
+                    return
+                width, height = fit_size(source.width(), source.height(), self.size)
+                image = source.scaled(width, height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            self.logo.rendered.emit(self.key, image)
+        except Exception as e:
+            self.logo.render_failed.emit(self.key, f"Failed to render logo: {e}")
+
+
+class Logo(QObject):
+    rendered = Signal(object, object)
+    render_failed = Signal(object, str)
+    # 로고가 갱신되면 (파일, 크기, 표시 여부) 알림
+    updated = Signal(str, int, bool)
+    error = Signal(str)
+
+    def __init__(self, parent_widget, file="", size=0, visible=True, max_entries=8):
+        super().__init__(parent_widget)
+        self.parent_widget = parent_widget
+        self.widget = QLabel(parent_widget)
+        self.widget.setAttribute(Qt.WA_TranslucentBackground)
+        self.widget.setStyleSheet("background: transparent;")
+        self.widget.setVisible(False)
+        self.file = file
+        self.size = size
+        self.visible = visible
+        self.width = 0
+        self.height = 0
+        self.key = None
+        self.pending_key = None
+        self.cache = {}
+        self.max_entries = max_entries
+        self.renders = 0
+        self.cache_hits = 0
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self.rendered.connect(self.on_rendered)
+        self.render_failed.connect(self.on_render_failed)
+
+    def update(self, file=None, size=None, visible=None):
+        """로고 파일, 크기, 표시 여부 갱신. 파일/크기가 바뀐 경우에만 다시 렌더링"""
+        if file is not None:
+            self.file = file
+        if size is not None:
+            self.size = size
+        if visible is not None:
+            self.visible = visible
+
+        key = logo_key(self.file, self.size) if self.file else None
+        if key is None:
+            self.key = None
+            self.widget.clear()
+            self.widget.setVisible(False)
+            if self.file:
+                self.error.emit(f"Logo file not found: {self.file}")
+            return
+        if key != self.key:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.cache_hits += 1
+                self.apply(key, cached)
+            elif key != self.pending_key:
+                self.pending_key = key
+                self.renders += 1
+                self.pool.start(LogoRenderTask(self, key, self.file, self.size))
+            return
+        # 진행 중인 다른 크기/파일 렌더링 결과는 적용하지 않음
+        self.pending_key = None
+        self.show()
+
+    def on_rendered(self, key, image):
+        """렌더링 완료 (GUI 스레드)"""
+        pixmap = QPixmap.fromImage(image)
+        if len(self.cache) >= self.max_entries:
+            self.cache.pop(next(iter(self.cache)))
+        self.cache[key] = pixmap
+        if key == self.pending_key:
+            self.pending_key = None
+            self.apply(key, pixmap)
+
+    def on_render_failed(self, key, message):
+        if key == self.pending_key:
+            self.pending_key = None
+        self.error.emit(message)
+
+    def apply(self, key, pixmap):
+        self.key = key
+        self.width = pixmap.width()
+        self.height = pixmap.height()
+        self.widget.setPixmap(pixmap)
+        self.show()
+
+    def show(self):
+        """현재 표시 여부/위치 적용 (다시 읽지 않음)"""
+        self.widget.setVisible(self.visible and self.key is not None)
+        if self.visible:
+            self.widget.raise_()
+        self.layout()
+        self.updated.emit(self.file, self.size, self.visible)
+
+    def layout(self):
+        """부모 윈도우 중앙에 배치"""
+        x = (self.parent_widget.width() - self.width) // 2
+        y = (self.parent_widget.height() - self.height) // 2
+        self.widget.setGeometry(x, y, self.width, self.height)
+
+    def stats(self):
+        return {
+            "renders": self.renders,
+            "cache_hits": self.cache_hits,
+            "cache_entries": len(self.cache),
+            "pending": self.pending_key is not None,
+        }
@@ -0,0 +1,286 @@
+import os, json, ctypes, pathlib, tempfile
+from collections import deque, Counter
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, Signal
+from vlc_backend import vlc
+
+# =========================
+# vlc.Media 캐시 및 메타데이터 인덱스
+# =========================
+#
+# - 경로를 MRL(file:///...)로 정규화해서 재사용 가능한 vlc.Media를 보관한다.
+#   (get_mrl()과 원본 경로를 비교하면 항상 달라서 매번 media_new가 되던 문제)
+# - 플레이리스트의 비디오/오디오를 백그라운드에서 preparse 하고,
+#   길이/트랙/해상도를 (경로, mtime, 크기) 기준 인덱스 파일에 저장한다.
+#   재시작이나 플레이리스트 재설정 시 이미 조사한 파일은 다시 parse 하지 않는다.
+# - 인덱스가 아직 맞는지 확인하는 os.stat은 워커 스레드에서 한다 (트랙이 많아도 GUI 스레드는 막지 않음).
+# - 플레이리스트 패치는 추가/삭제된 경로만 반영한다 (update). MRL별 참조 수를 owner(출력 창)마다 센다.
+
+INDEX_VERSION = 1
+
+
+def to_mrl(path):
+    """파일 경로를 MRL로 변환 (이미 MRL이면 그대로)"""
+    if "://" in path:
+        return path
+    return pathlib.Path(os.path.abspath(path)).as_uri()
+
+
+def file_stat(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def default_index_path():
+    cache_dir = os.environ.get("VP_CACHE_DIR") or os.path.join(tempfile.gettempdir(), "vp_app")
+    return os.path.join(cache_dir, "media_index.json")
+
+
+def read_tracks(media):
+    """트랙 정보 (종류별 개수, 첫 비디오 트랙 해상도)"""
+    info = {"tracks": {"audio": 0, "video": 0, "text": 0}, "width": 0, "height": 0}
+    tracks = media.tracks_get()
+    if not tracks:
+        return info
+    for track in tracks:
+        if track.type == vlc.TrackType.audio:
+            info["tracks"]["audio"] += 1
+        elif track.type == vlc.TrackType.video:
+            info["tracks"]["video"] += 1
+            if not info["width"]:
+                # libvlc_media_track_t의 audio/video/subtitle은 C에서 union이므로 첫 포인터를 VideoTrack으로 읽는다
+                video = ctypes.cast(track.audio, ctypes.POINTER(vlc.VideoTrack))
+                if video:
+                    info["width"] = int(video.contents.width)
+                    info["height"] = int(video.contents.height)
+        else:
+            info["tracks"]["text"] += 1
+    return info
+
+
+class StatTask(QRunnable):
+    def __init__(self, cache, instance, paths, priority):
+        super().__init__()
+        self.cache = cache
+        self.instance = instance
+        self.paths = paths
+        self.priority = int(priority)
+
+    def run(self):
+        self.cache.stats_ready.emit((self.instance, [(path, file_stat(path)) for path in self.paths], self.priority))
+
+
+class MediaCache(QObject):
+    parsed = Signal(object, str)
+    # (인스턴스, [(경로, stat)], priority) 워커 스레드 stat 결과
+    stats_ready = Signal(object)
+    # (경로, 메타데이터) preparse 완료 알림
+    metadata_ready = Signal(str, dict)
+    error = Signal(str)
+
+    def __init__(self, index_path=None, max_parallel=2, parse_timeout=5000, parent=None):
+        super().__init__(parent)
+        self.index_path = index_path or default_index_path()
+        self.max_parallel = max_parallel
+        self.parse_timeout = parse_timeout
+        self.media = {}
+        # MRL → vlc.Media 키 목록, owner → MRL 참조 수 (플레이리스트에 있는 비디오/오디오)
+        self.keys_by_mrl = {}
+        self.refs = {}
+        # 이번 실행에서 인덱스가 파일과 맞는지 확인했거나 새로 parse 한 경로
+        self.fresh = set()
+        self.stat_pool = QThreadPool(self)
+        self.stat_pool.setMaxThreadCount(1)
+        self.stats_ready.connect(self.on_stats)
+        self.parse_queue = deque()
+        self.parsing = {}
+        self.index = {}
+        self.dirty = False
+        self.hits = 0
+        self.misses = 0
+        self.parsed_count = 0
+        self.parse_failures = 0
+        self.index_hits = 0
+        self.save_timer = QTimer(self)
+        self.save_timer.setSingleShot(True)
+        self.save_timer.setInterval(2000)
+        self.save_timer.timeout.connect(self.save)
+        self.parsed.connect(self.on_parsed)
+
+    # ---------- vlc.Media 재사용 ----------
+    def media_for(self, instance, path):
+        """경로에 해당하는 vlc.Media 반환 (같은 인스턴스/MRL이면 재사용)"""
+        mrl = to_mrl(path)
+        key = (id(instance), mrl)
+        media = self.media.get(key)
+        if media is not None:
+            self.hits += 1
+            return media
+        self.misses += 1
+        media = instance.media_new(mrl)
+        self.media[key] = media
+        self.keys_by_mrl.setdefault(mrl, set()).add(key)
+        return media
+
+    def referenced(self, mrl):
+        return any(refs[mrl] > 0 for refs in self.refs.values())
+
+    def release(self, mrls):
+        """참조가 없는 MRL의 vlc.Media 해제 (preparse 대기열의 항목은 start_parsing에서 건너뜀)"""
+        for mrl in mrls:
+            if self.referenced(mrl):
+                continue
+            for key in list(self.keys_by_mrl.get(mrl, ())):
+                if key in self.parsing:
+                    continue
+                self.keys_by_mrl[mrl].discard(key)
+                self.media.pop(key).release()
+            if not self.keys_by_mrl.get(mrl):
+                self.keys_by_mrl.pop(mrl, None)
+
+    def retain(self, paths, owner=0):
+        """owner의 플레이리스트 전체 교체 (set_tracks): 어느 플레이리스트에도 없는 vlc.Media 해제"""
+        self.refs[owner] = Counter(to_mrl(path) for path in paths)
+        self.release([mrl for mrl in list(self.keys_by_mrl) if mrl not in self.refs[owner]])
+
+    def update(self, added, removed, owner=0):
+        """플레이리스트 패치: 추가/삭제된 경로만 참조 수에 반영"""
+        refs = self.refs.setdefault(owner, Counter())
+        for path in added:
+            refs[to_mrl(path)] += 1
+        dropped = []
+        for path in removed:
+            mrl = to_mrl(path)
+            refs[mrl] -= 1
+            if refs[mrl] <= 0:
+                del refs[mrl]
+                dropped.append(mrl)
+        self.release(dropped)
+
+    # ---------- preparse ----------
+    def preparse(self, instance, paths, priority=False):
+        """인덱스에 없는 파일을 백그라운드에서 parse (인덱스 확인용 stat은 워커 스레드). priority면 대기열 앞에 추가"""
+        paths = [path for path in paths if path and path not in self.fresh]
+        if paths:
+            self.stat_pool.start(StatTask(self, instance, paths, priority))
+
+    def on_stats(self, result):
+        """워커 stat 결과 (GUI 스레드): 인덱스와 맞지 않는 파일만 parse 대기열에 추가"""
+        instance, results, priority = result
+        queued = {item[1] for item in self.parse_queue}
+        items = []
+        for path, stat in results:
+            entry = self.index.get(path)
+            if entry is not None and stat is not None and (entry.get("mtime"), entry.get("size")) == stat:
+                self.fresh.add(path)
+                self.index_hits += 1
+            elif path not in queued and path not in self.fresh and stat is not None and self.referenced(to_mrl(path)):
+                items.append((instance, path))
+        if priority:
+            self.parse_queue.extendleft(reversed(items))
+        else:
+            self.parse_queue.extend(items)
+        self.start_parsing()
+
+    def start_parsing(self):
+        while self.parse_queue and len(self.parsing) < self.max_parallel:
+            instance, path = self.parse_queue.popleft()
+            mrl = to_mrl(path)
+            if path in self.fresh or not self.referenced(mrl):
+                continue
+            media = self.media_for(instance, path)
+            key = (id(instance), mrl)
+            if key in self.parsing:
+                continue
+            callback = lambda event, key=key, path=path: self.parsed.emit(key, path)
+            media.event_manager().event_attach(vlc.EventType.MediaParsedChanged, callback)
+            self.parsing[key] = (media, path, callback)
+            if media.parse_with_options(vlc.MediaParseFlag.local, self.parse_timeout) != 0:
+                self.parsing.pop(key, None)
+                self.parse_failures += 1
+
+    def on_parsed(self, key, path):
+        """preparse 완료 (GUI 스레드)"""
+        entry = self.parsing.pop(key, None)
+        if entry is None:
+            return
+        media = entry[0]
+        try:
+            media.event_manager().event_detach(vlc.EventType.MediaParsedChanged)
+            if media.get_parsed_status() != vlc.MediaParsedStatus.done:
+                self.parse_failures += 1
+                return
+            stat = file_stat(path)
+            if stat is None:
+                return
+            metadata = {"mtime": stat[0], "size": stat[1], "duration": media.get_duration()}
+            metadata.update(read_tracks(media))
+            self.index[path] = metadata
+            self.fresh.add(path)
+            self.parsed_count += 1
+            self.dirty = True
+            self.save_timer.start()
+            self.metadata_ready.emit(path, self.public_metadata(metadata))
+        except Exception as e:
+            self.error.emit(f"Error reading parsed media {path}: {e}")
+        finally:
+            # parse 중에 플레이리스트에서 빠진 미디어는 release()가 건너뛰었으므로 여기서 해제
+            if not self.referenced(key[1]):
+                self.release([key[1]])
+            self.start_parsing()
+
+    # ---------- 메타데이터 인덱스 ----------
+    def metadata(self, path):
+        """인덱스에 저장된 메타데이터 (파일이 바뀌었으면 None)"""
+        entry = self.index.get(path)
+        if entry is None:
+            return None
+        stat = file_stat(path)
+        if stat is None or (entry.get("mtime"), entry.get("size")) != stat:
+            return None
+        self.index_hits += 1
+        return self.public_metadata(entry)
+
+    def public_metadata(self, entry):
+        return {key: entry[key] for key in ("duration", "tracks", "width", "height") if key in entry}
+
+    def load(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == INDEX_VERSION:
+                self.index = data.get("entries", {})
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            self.error.emit(f"Failed to load media index: {e}")
+
+    def save(self):
+        """인덱스 파일 저장 (임시 파일에 쓰고 교체)"""
+        if not self.dirty:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            tmp_path = self.index_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": INDEX_VERSION, "entries": self.index}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.index_path)
+            self.dirty = False
+        except Exception as e:
+            self.error.emit(f"Failed to save media index: {e}")
+
+    def stats(self):
+        return {
+            "media": len(self.media),
+            "hits": self.hits,
+            "misses": self.misses,
+            "index_entries": len(self.index),
+            "index_hits": self.index_hits,
+            "parsed": self.parsed_count,
+            "parse_failures": self.parse_failures,
+            "parsing": len(self.parsing),
+            "stat_pending": self.stat_pool.activeThreadCount(),
+            "queued": len(self.parse_queue),
+        }
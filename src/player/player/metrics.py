@@ -0,0 +1,277 @@
+import os, sys, time, bisect, threading
+from PySide6.QtCore import QObject, QTimer, Qt
+
+# =========================
+# 메트릭 레지스트리
+# =========================
+#
+# 각 모듈은 평소처럼 정수 카운터(self.count += 1)와 고정 구간 Histogram만 갱신하고,
+# 레지스트리는 스냅숏을 만들 때만 등록된 함수를 호출해 값을 모은다.
+# - gauge     : 현재 값 (큐 깊이, RSS 등)
+# - rate      : 누적 카운터 → 직전 스냅숏 이후 초당 값. dict를 반환하면 키별 초당 값
+# - ratio     : (적중, 조회) 누적값 → 직전 스냅숏 이후 적중률
+# - histogram : 직전 스냅숏 이후 분포. 스냅숏마다 비운다
+# 이름의 "."은 결과 dict의 단계를 나눈다 (예: "stdout.bytes_per_s").
+
+# 시간 히스토그램 구간 상한 (ms). 마지막 구간은 그 이상
+TIME_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 250, 500, 1000)
+
+
+class Histogram:
+    """고정 구간 히스토그램. add()는 구간 카운트만 올린다"""
+
+    def __init__(self, bounds=TIME_BUCKETS_MS):
+        self.bounds = tuple(bounds)
+        self.reset()
+
+    def reset(self):
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.total = 0.0
+        self.max = 0.0
+        self.count = 0
+
+    def add(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.count += 1
+        if value > self.max:
+            self.max = value
+
+    def to_dict(self):
+        buckets = {f"<={bound}": count for bound, count in zip(self.bounds, self.counts)}
+        buckets[f">{self.bounds[-1]}"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total / self.count, 3) if self.count else 0,
+            "max_ms": round(self.max, 3),
+            "buckets": buckets,
+        }
+
+
+def per_second(value, previous, elapsed):
+    # 통계 reset 등으로 누적값이 줄었으면 0부터 다시 센다
+    delta = value - previous if value >= previous else value
+    return round(delta / elapsed, 2) if elapsed > 0 else 0.0
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.gauges = {}
+        self.rates = {}
+        self.ratios = {}
+        self.histograms = {}
+        self.last_values = {}
+        self.last_time = time.monotonic()
+        self.snapshots = 0
+
+    def gauge(self, name, fn):
+        self.gauges[name] = fn
+
+    def rate(self, name, fn):
+        self.rates[name] = fn
+        self.last_values[name] = self.sample(fn)
+
+    def ratio(self, name, fn):
+        self.ratios[name] = fn
+        self.last_values[name] = self.sample(fn)
+
+    def histogram(self, name, histogram):
+        self.histograms[name] = histogram
+        return histogram
+
+    def sample(self, fn):
+        try:
+            return fn()
+        except Exception:
+            return None
+
+    def snapshot(self):
+        """등록된 값을 모아 dict로 반환 (rate/ratio/histogram은 직전 스냅숏 이후 구간)"""
+        now = time.monotonic()
+        elapsed = now - self.last_time
+        self.last_time = now
+        self.snapshots += 1
+        data = {"interval_s": round(elapsed, 3)}
+        for name, fn in self.gauges.items():
+            put(data, name, self.sample(fn))
+        for name, fn in self.rates.items():
+            value = self.sample(fn)
+            previous = self.last_values.get(name)
+            self.last_values[name] = value
+            if isinstance(value, dict):
+                previous = previous if isinstance(previous, dict) else {}
+                put(data, name, {key: per_second(count, previous.get(key, 0), elapsed) for key, count in value.items()})
+            elif value is not None:
+                put(data, name, per_second(value, previous or 0, elapsed))
+        for name, fn in self.ratios.items():
+            value = self.sample(fn)
+            previous = self.last_values.get(name) or (0, 0)
+            self.last_values[name] = value
+            if value is None:
+                continue
+            hits, lookups = value[0] - previous[0], value[1] - previous[1]
+            put(data, name, round(hits / lookups, 3) if lookups > 0 else None)
+        for name, histogram in self.histograms.items():
+            put(data, name, histogram.to_dict())
+            histogram.reset()
+        return data
+
+
+def put(data, name, value):
+    *groups, key = name.split(".")
+    for group in groups:
+        data = data.setdefault(group, {})
+    data[key] = value
+
+
+# =========================
+# 프로세스 자원 사용량
+# =========================
+def read_proc_status():
+    """Linux /proc/self/status의 (RSS bytes, 스레드 수)"""
+    rss = threads = None
+    with open("/proc/self/status", "r") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                rss = int(line.split()[1]) * 1024
+            elif line.startswith("Threads:"):
+                threads = int(line.split()[1])
+    return rss, threads
+
+
+def read_windows_memory(peak=False):
+    """Windows 작업 집합 크기 (bytes). peak이면 최대 작업 집합 크기"""
+    import ctypes
+    from ctypes import wintypes
+
+    class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD),
+            ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t),
+        ]
+
+    counters = PROCESS_MEMORY_COUNTERS()
+    counters.cb = ctypes.sizeof(counters)
+    kernel32 = ctypes.windll.kernel32
+    if not kernel32.K32GetProcessMemoryInfo(kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb):
+        return None
+    return counters.PeakWorkingSetSize if peak else counters.WorkingSetSize
+
+
+def read_windows_threads():
+    """Windows 현재 프로세스의 스레드 수 (Toolhelp 스냅숏에서 소유 PID가 같은 스레드를 센다)"""
+    import ctypes
+    from ctypes import wintypes
+
+    class THREADENTRY32(ctypes.Structure):
+        _fields_ = [
+            ("dwSize", wintypes.DWORD),
+            ("cntUsage", wintypes.DWORD),
+            ("th32ThreadID", wintypes.DWORD),
+            ("th32OwnerProcessID", wintypes.DWORD),
+            ("tpBasePri", wintypes.LONG),
+            ("tpDeltaPri", wintypes.LONG),
+            ("dwFlags", wintypes.DWORD),
+        ]
+
+    TH32CS_SNAPTHREAD = 0x00000004
+    kernel32 = ctypes.windll.kernel32
+    kernel32.CreateToolhelp32Snapshot.restype = wintypes.HANDLE
+    snapshot = kernel32.CreateToolhelp32Snapshot(TH32CS_SNAPTHREAD, 0)
+    if not snapshot or snapshot == wintypes.HANDLE(-1).value:
+        return None
+    try:
+        pid = kernel32.GetCurrentProcessId()
+        entry = THREADENTRY32()
+        entry.dwSize = ctypes.sizeof(entry)
+        count = 0
+        ok = kernel32.Thread32First(snapshot, ctypes.byref(entry))
+        while ok:
+            if entry.th32OwnerProcessID == pid:
+                count += 1
+            ok = kernel32.Thread32Next(snapshot, ctypes.byref(entry))
+        return count or None
+    finally:
+        kernel32.CloseHandle(snapshot)
+
+
+def process_usage():
+    """(RSS bytes, OS 스레드 수). 알 수 없으면 None"""
+    try:
+        if sys.platform == "win32":
+            rss = read_windows_memory()
+            try:
+                threads = read_windows_threads()
+            except Exception:
+                threads = None
+            return rss, threads
+        if os.path.exists("/proc/self/status"):
+            return read_proc_status()
+    except Exception:
+        pass
+    return None, None
+
+
+def peak_rss():
+    """프로세스 최대 RSS (bytes, Linux VmHWM / Windows PeakWorkingSetSize). 알 수 없으면 None"""
+    try:
+        if sys.platform == "win32":
+            return read_windows_memory(peak=True)
+        if os.path.exists("/proc/self/status"):
+            with open("/proc/self/status", "r") as f:
+                for line in f:
+                    if line.startswith("VmHWM:"):
+                        return int(line.split()[1]) * 1024
+    except Exception:
+        pass
+    return None
+
+
+def process_metrics():
+    rss, threads = process_usage()
+    peak = peak_rss()
+    return {
+        "rss_mb": round(rss / (1024 * 1024), 1) if rss is not None else None,
+        "peak_rss_mb": round(peak / (1024 * 1024), 1) if peak is not None else None,
+        "threads": threads,
+        "python_threads": threading.active_count(),
+        # OS 스레드 수를 읽지 못한 플랫폼/오류는 null만 보내지 않고 표시
+        "threads_supported": threads is not None,
+    }
+
+
+# =========================
+# GUI 이벤트 루프 지연 측정
+# =========================
+class LoopLagMonitor(QObject):
+    """interval마다 타이머를 걸어 실제 호출 간격이 interval보다 늦어진 만큼을 기록"""
+
+    def __init__(self, interval_ms=250, parent=None):
+        super().__init__(parent)
+        self.interval_ms = interval_ms
+        self.histogram = Histogram()
+        self.last = None
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self.on_timeout)
+
+    def start(self):
+        if self.interval_ms <= 0:
+            return
+        self.last = time.perf_counter()
+        self.timer.start()
+
+    def on_timeout(self):
+        now = time.perf_counter()
+        lag = (now - self.last) * 1000 - self.interval_ms
+        self.last = now
+        self.histogram.add(lag if lag > 0 else 0.0)
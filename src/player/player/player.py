@@ -1,9 +1,30 @@
-import os, io, sys, json, time, threading, vlc, win32process, win32con
+import os, io, sys, json, time, threading
 from PySide6.QtWidgets import QApplication, QMainWindow, QLabel, QVBoxLayout, QWidget, QGraphicsOpacityEffect
-from PySide6.QtCore import QTimer, Qt, QThread, Signal
-from PySide6.QtGui import QPixmap, QIcon
-from PySide6.QtSvgWidgets import QSvgWidget
-from PySide6.QtSvg import QSvgRenderer
+from PySide6.QtCore import QTimer, Qt
+from PySide6.QtGui import QIcon
+try:
+    import win32process, win32con
+except ImportError:
+    # Windows 외 환경 (헤드리스 벤치마크 등)
+    win32process = win32con = None
+from stdio import stdinRead, stdoutWriter, framing_capabilities
+from telemetry import PlayerTelemetry, FIELDS as TELEMETRY_FIELDS
+from events import VlcEventPump
+from image_cache import ImageCache, FAST, SMOOTH
+from logo import Logo
+from media_cache import MediaCache, to_mrl
+from slot_pool import SlotPool
+from playlist import Playlist, PlaylistPatchError
+from vlc_backend import vlc, BACKEND as VLC_BACKEND
+from quality import PlaybackQuality
+from audio_devices import AudioDeviceService
+from sync_start import StartScheduler, wall_ms
+from playlist_scheduler import PlaylistScheduler
+from transitions import TransitionEngine, TransitionOverlay, TransitionSide
+from shared_state import SharedState, default_path as shared_state_path, state_code
+from checkpoint import Checkpoint, default_path as checkpoint_path, load as load_checkpoint
+from metrics import MetricsRegistry, LoopLagMonitor, process_metrics
+from commands import CommandDispatcher, CommandCoalescer, CommandError, Arg, LATEST, IDEMPOTENT, to_int
 
 # 표준 입출력 인코딩 설정
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
@@ -34,56 +55,94 @@ sys.stdin = io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8')
 #
 # =====================
 
-# =========================
-# 표준 입출력 관련 클래스
-# =========================
-class stdinRead(QThread):
-    message_received = Signal(str)
-    def __init__(self):
-        super().__init__()
-        self.running = True
-        self.receive_udp_data = ""
+# 기동 단계 시간 측정 기준 (모듈 import 완료 시점)
+PROCESS_START = time.perf_counter()
 
-    def run(self):
-        while self.running:
-            try:
-                if self.running == False:
-                    break
-                data = sys.stdin.readline()
-                if data:
-                    self.receive_udp_data = data.strip()
-                    self.message_received.emit(self.receive_udp_data)
-            except Exception as e:
-                self.print_json("error", {"message": f"Error reading stdin: {e}"})
-                break
 
-    def stop(self):
-        self.running = False
+def media_paths_of(tracks):
+    """트랙 목록 중 비디오/오디오 경로"""
+    return [track.get("path") for track in tracks if track and not track.get("is_image", True) and track.get("path")]
+
+
+def output_path(path, output):
+    """추가 출력 창의 상태 파일 경로 (player_state.bin → player_state_1.bin). 첫 번째 출력은 그대로"""
+    if not output:
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}_{output}{ext}"
+
 
 # =========================
 # Player 메인 클래스
 # =========================
 class Player(QMainWindow):
-    def __init__(self, pstatus=None, app_path=None):
+    def __init__(self, pstatus=None, app_path=None, host=None, output=0):
         """
-        Player 클래스 초기화
-        - 윈도우 설정, 프로세스 우선순위, stdin 리더, 아이콘, 상태값, 위젯, 플레이어, 오디오 디바이스 등 초기화
+        Player 클래스 초기화 (단계별 기동)
+        1. 윈도우, 프로세스 우선순위, stdin 리더, 아이콘, 상태값, 위젯, 배경/로고 → 첫 프레임
+        2. 첫 프레임 이후: VLC 인스턴스/플레이어 초기화, 대기 중인 명령 처리 (start_vlc_stage)
+        3. 그 다음: 오디오 디바이스 조회 및 설정 (start_audio_stage)
+
+        video wall (pstatus.outputs): 첫 번째 출력 창(host)이 추가 출력 창을 만든다.
+        추가 출력 창은 host의 stdout/stdin, 이미지/미디어 캐시, libVLC 인스턴스, 오디오 장치 조회를 공유하고
+        슬롯, 로고, 배경, 플레이리스트는 창마다 따로 가진다. 명령은 output 필드로 구분한다.
         """
         super().__init__()
-        self.setWindowTitle("Media Player")
+        # 첫 번째 출력 창이면 None
+        self.host = host
+        self.output = output
+        self.app_path = app_path
+        # 추가 출력 창 (output 번호 → Player, 첫 번째 출력 창만 가짐)
+        self.outputs = {}
+        # 기동 단계별 시간 (ms, PROCESS_START 기준). window_open 메시지로 전송
+        self.startup_timings = {}
+        # 추가 출력 창은 window_open 없이 host의 VLC 초기화 단계에서 시작
+        self.window_open_sent = host is not None
+        self.mark_phase("qt_init")
+        # stdout 출력 전용 스레드 (print는 큐에 넣기만 함)
+        if host is None:
+            self.writer = stdoutWriter()
+            self.writer.start()
+        else:
+            self.writer = host.writer
+        self.setWindowTitle("Media Player" if host is None else f"Media Player [{output}]")
         self.setGeometry(100, 100, 800, 600)
 
         # Set process priority
-        try:
-            win32process.SetPriorityClass(win32process.GetCurrentProcess(), win32con.REALTIME_PRIORITY_CLASS)
-            self.print("info", "Process priority set to REALTIME")
-        except Exception as e:
-            self.print("error", f"Failed to set process priority: {e}")
-
-        # Initialize stdin reader for receiving commands
-        self.stdin_reader = stdinRead()
-        self.stdin_reader.message_received.connect(self.handle_stdin_message)
-        self.stdin_reader.start()
+        if host is None:
+            try:
+                if win32process is None:
+                    raise RuntimeError("pywin32 is not available")
+                win32process.SetPriorityClass(win32process.GetCurrentProcess(), win32con.REALTIME_PRIORITY_CLASS)
+                self.print("info", "Process priority set to REALTIME")
+            except Exception as e:
+                self.print("error", f"Failed to set process priority: {e}")
+
+        # 명령 스펙은 기동 시 한 번만 등록
+        self.commands = CommandDispatcher()
+        self.register_commands()
+        # 같은 프레임에 들어온 명령 합치기, next/previous 연속 입력 debounce
+        self.coalescer = CommandCoalescer()
+        self.coalesce_scheduled = False
+        self.pending_steps = 0
+        self.step_timer = QTimer(self)
+        self.step_timer.setSingleShot(True)
+        self.step_timer.setInterval(int((pstatus or {}).get("commands", {}).get("stepDebounceMs", 150)))
+        self.step_timer.timeout.connect(self.flush_steps)
+
+        # Initialize stdin reader for receiving commands (추가 출력 창은 host가 output별로 전달)
+        self.stdin_reader = None
+        # VLC 초기화 전에 들어온 명령 대기열
+        self.vlc_ready = False
+        self.pending_commands = []
+        self.startup_queued = 0
+        self.stdin_batches_handled = 0
+        if host is None:
+            self.stdin_reader = stdinRead()
+            self.stdin_reader.batch_received.connect(self.handle_stdin_batch)
+            self.stdin_reader.decode_error.connect(lambda message: self.print("error", message))
+            self.stdin_reader.start()
+        self.mark_phase("stdin_ready")
 
         # Set window icon
         icon_path = os.path.join(app_path, "src", "icon.ico")
@@ -96,7 +155,9 @@ class Player(QMainWindow):
         # Initialize variables from pstatus
         self.pstatus = pstatus or {}
         self.playlist_mode = bool(self.pstatus.get("playlistMode", False))
-        self.tracks = []
+        # 트랙 목록 (self.tracks는 self.playlist.tracks와 같은 리스트)
+        self.playlist = Playlist()
+        self.tracks = self.playlist.tracks
         self.track_index = int(self.pstatus.get("playlistTrackIndex", 0))
         self.next_track_index = 0
         self.active_player_id = 0 
@@ -106,20 +167,188 @@ class Player(QMainWindow):
         self.logo_file = self.pstatus.get("logo", {}).get("file", "")
         self.logo_show = bool(self.pstatus.get("logo", {}).get("show", True))
         self.logo_size = int(self.pstatus.get("logo", {}).get("size", 0))
-        self.logo_width = 0
-        self.logo_height = 0
-        self.logo_svg = self.logo_file.lower().endswith(".svg")
         self.background_color = self.pstatus.get("background", "#000000")
         self.fullscreen = bool(self.pstatus.get("fullscreen", False))
+        self.repeat = self.pstatus.get("repeat", "none")
         self.audio_devices = []
+        # 출력 창을 띄울 화면 (QApplication.screens() 인덱스, None이면 기본 위치)
+        self.screen_index = self.pstatus.get("screen")
         
+        # 플레이어 슬롯 풀 (size개 슬롯, 다음 lookahead개 트랙을 미리 로드)
+        pool = self.pstatus.get("playerPool", {})
+        self.pool_size = max(2, int(pool.get("size", 2)))
+        self.lookahead = min(max(1, int(pool.get("lookahead", 1))), self.pool_size - 1)
+        self.slot_pool = SlotPool(self.pool_size)
+
+        vlc_config = self.pstatus.get("vlc", {})
+        self.shared_instance = bool(vlc_config.get("sharedInstance", True))
+        self.lazy_players = bool(vlc_config.get("lazyPlayers", True))
         self.instances = []
         self.players = []
-        self.current_files = [{}, {}]
+        self.players_created = 0
+        self.audio_device_id = self.pstatus.get("device", {}).get("audiodevice", "default")
+        # 오디오 디바이스 목록 캐시/주기 조회 (조회는 워커 스레드, 추가 출력 창은 host의 조회 결과 공유)
+        if host is None:
+            self.audio_service = AudioDeviceService(
+                lambda: next((player for player in self.players if player is not None), None),
+                self.audio_device_id,
+                poll_ms=int(self.pstatus.get("audioDevices", {}).get("pollMs", 5000)),
+                parent=self,
+            )
+            self.audio_service.changed.connect(self.on_audio_devices_changed)
+            self.audio_service.available.connect(self.on_audio_device_available)
+            self.audio_service.missing.connect(
+                lambda device_id: self.print("warn", f"Configured audio device is not available: {device_id}")
+            )
+            self.audio_service.error.connect(lambda message: self.print("error", {"message": message}))
+        else:
+            self.audio_service = host.audio_service
+        self.current_files = [{} for _ in range(self.pool_size)]
+        self.current_mrls = [None] * self.pool_size
+
+        # player_data 텔레메트리 (시간은 주기 전송, 상태 변화는 즉시 전송)
+        telemetry = self.pstatus.get("telemetry", {})
+        self.telemetry = PlayerTelemetry(
+            lambda data: self.print("player_data", data),
+            time_hz=telemetry.get("timeHz", 4),
+            keyframe_interval=telemetry.get("keyframeInterval", 5),
+            parent=self,
+        )
+        # 재생 품질 (libVLC 미디어 통계 샘플링, 트랙 종료 시 quality_report)
+        quality = self.pstatus.get("quality", {})
+        self.quality = PlaybackQuality(
+            self.print,
+            interval_ms=int(quality.get("intervalMs", 1000)),
+            drop_rate_percent=float(quality.get("dropRatePercent", 1.0)),
+            lost_audio_buffers=int(quality.get("lostAudioBuffers", 5)),
+            min_frames=int(quality.get("minFrames", 10)),
+            parent=self,
+        )
+        # play_at/next_at 예약 시작
+        self.sync_start = StartScheduler(
+            self.print, spin_ms=int(self.pstatus.get("syncStart", {}).get("spinMs", 4)), parent=self,
+        )
+        # 플레이리스트 자동 진행 (Node 왕복 없이 deadline에 다음 트랙 시작)
+        playlist_scheduler = self.pstatus.get("playlistScheduler", {})
+        self.scheduler_enabled = bool(playlist_scheduler.get("enabled", True))
+        self.playlist_scheduler = PlaylistScheduler(
+            self.sync_start,
+            self.print,
+            target=self.auto_next_track,
+            prepare=self.prepare_auto_track,
+            start=self.start_auto_track,
+            expire=lambda slot: self.on_end_reached(slot, None),
+            preroll_ms=int(playlist_scheduler.get("prerollMs", 300)),
+            parent=self,
+        )
+        # 이미지 디코딩 캐시 (다음 트랙 이미지 미리 디코딩, 추가 출력 창은 host의 캐시 공유)
+        image_cache = self.pstatus.get("imageCache", {})
+        self.image_prefetch = int(image_cache.get("prefetch", 2))
+        if host is None:
+            self.image_cache = ImageCache(
+                max_bytes=int(image_cache.get("maxMB", 512)) * 1024 * 1024,
+                scaled_max_bytes=int(image_cache.get("scaledMB", 128)) * 1024 * 1024,
+                workers=int(image_cache.get("workers", 2)),
+                scaled_decode=bool(image_cache.get("scaledDecode", True)),
+                margin=float(image_cache.get("decodeMargin", 1.25)),
+                parent=self,
+            )
+        else:
+            self.image_cache = host.image_cache
+        self.image_cache.scaled_ready.connect(self.on_image_scaled)
+        self.image_cache.image_ready.connect(self.on_image_redecoded)
+        # 창이 보이기 전 미리 디코딩하는 이미지는 화면 크기 기준으로 축소 디코딩
+        self.place_on_screen()
+        screen = self.screen().size() if self.screen() is not None else None
+        if screen is not None:
+            self.image_cache.set_output(
+                screen.width() * self.devicePixelRatioF(), screen.height() * self.devicePixelRatioF(), self.output,
+            )
+        # 리사이즈가 멈춘 뒤 한 번만 고품질 재배치
+        self.relayout_timer = QTimer(self)
+        self.relayout_timer.setSingleShot(True)
+        self.relayout_timer.setInterval(int(image_cache.get("relayoutDelay", 150)))
+        self.relayout_timer.timeout.connect(self.relayout_images)
+        # vlc.Media 재사용 및 preparse 메타데이터 인덱스 (추가 출력 창은 host의 캐시 공유)
+        if host is None:
+            self.media_cache = MediaCache(parent=self)
+            self.media_cache.error.connect(lambda message: self.print("error", message))
+            self.media_cache.load()
+        else:
+            self.media_cache = host.media_cache
+        self.media_cache.metadata_ready.connect(self.on_media_metadata)
+        # VLC 이벤트 스레드 → GUI 스레드 이벤트 펌프
+        self.event_pump = VlcEventPump(on_error=lambda message: self.print("error", message), parent=self)
+        # 주기 metrics 메시지 (intervalMs 0이면 요청할 때만)
+        metrics = self.pstatus.get("metrics", {})
+        self.metrics = MetricsRegistry()
+        self.loop_lag = LoopLagMonitor(int(metrics.get("lagProbeMs", 250)), parent=self)
+        self.metrics_timer = QTimer(self)
+        self.metrics_timer.setInterval(int(metrics.get("intervalMs", 5000)))
+        self.metrics_timer.timeout.connect(self.report_metrics)
         
         # Create widgets
-        self.player_widgets = [QLabel(self) for _ in range(2)]
-        self.logo_widget = QLabel(self)
+        self.player_widgets = [QLabel(self) for _ in range(self.pool_size)]
+        # 로고 위젯은 하나만 만들고 계속 재사용
+        self.logo = Logo(self, self.logo_file, self.logo_size, self.logo_show)
+        self.logo.error.connect(lambda message: self.print("error", message))
+        self.logo.updated.connect(
+            lambda file, size, visible: self.print("debug", f"Logo updated: file={file}, size={size}, visible={visible}")
+        )
+        self.logo_widget = self.logo.widget
+        # 화면 전환 (이미지 합성 오버레이 + 비디오 밝기/볼륨 페이드)
+        transition = self.pstatus.get("transition", {})
+        self.transitions = TransitionEngine(
+            self.print,
+            TransitionOverlay(self),
+            mode=transition.get("mode", "cut"),
+            duration_ms=int(transition.get("durationMs", 500)),
+            frame_ms=int(transition.get("frameMs", 16)),
+            budget_ms=float(transition.get("budgetMs", 34)),
+            budget_misses=int(transition.get("budgetMisses", 3)),
+            parent=self,
+        )
+        self.preload_deferred = False
+        # 공유 메모리 상태 블록 (stdout 파싱 없이 읽는 현재 상태)
+        shared_state = self.pstatus.get("sharedState", {})
+        self.shared_state = None
+        if shared_state.get("enabled", True):
+            try:
+                self.shared_state = SharedState(
+                    output_path(shared_state.get("path") or shared_state_path(), self.output),
+                    self.pool_size,
+                    self.collect_shared_state,
+                    interval_ms=int(shared_state.get("intervalMs", 33)),
+                    parent=self,
+                )
+            except OSError as e:
+                self.print("error", f"Failed to open shared state block: {e}")
+        # 재생 상태 체크포인트 (VP_RESUME=1 또는 checkpoint.resume이면 기동 시 이어서 재생)
+        checkpoint = self.pstatus.get("checkpoint", {})
+        self.checkpoint = None
+        self.resume_state = None
+        # 재개한 비디오 슬롯의 이동할 위치 (playing 이벤트에서 적용)
+        self.resume_seek = {}
+        if checkpoint.get("enabled", True):
+            path = output_path(checkpoint.get("path") or checkpoint_path(), self.output)
+            if os.environ.get("VP_RESUME") == "1" or checkpoint.get("resume", False):
+                try:
+                    self.resume_state = load_checkpoint(path)
+                except (OSError, ValueError) as e:
+                    self.print("error", f"Failed to load checkpoint: {e}")
+            try:
+                self.checkpoint = Checkpoint(
+                    path,
+                    self.collect_checkpoint,
+                    lambda: self.tracks,
+                    interval_ms=int(checkpoint.get("intervalMs", 2000)),
+                    min_gap_ms=int(checkpoint.get("minGapMs", 250)),
+                    parent=self,
+                )
+                self.checkpoint.error.connect(lambda message: self.print("error", message))
+            except OSError as e:
+                self.print("error", f"Failed to create checkpoint directory: {e}")
+        self.register_metrics()
         self.set_background_color(self.background_color)
         for player in self.player_widgets:
             player.setGeometry(0, 0, self.width(), self.height())
@@ -129,103 +358,490 @@ class Player(QMainWindow):
 
         self.update_active_player_id(self.active_player_id)
         
-        self.init_players()
-        self.init_players_events()
-        
         # fullscreen mode
         self.set_fullscreen(self.fullscreen)
-
-        # audio device management
-        self.get_audio_devices()
-        # set audio device 확인 필요
         self.set_audio_device_result = False
-        self.set_audio_device_with_retry(self.pstatus.get("device", {}).get("audiodevice", "default"))
         
         self.image_timer_instance = QTimer(self)  # QTimer 객체 생성
         self.image_timer_instance.timeout.connect(lambda: self.on_end_reached(self.active_player_id, None))
-        self.print("window_open", { "value": True })
-        
+        self.mark_phase("window_init")
+        if host is None:
+            self.create_outputs()
+        # window_open은 첫 프레임이 그려진 뒤 전송 (그려지지 않는 환경을 위해 1초 후 강제 전송)
+        QTimer.singleShot(1000, self.send_window_open)
+
+    def create_outputs(self):
+        """추가 출력 창 생성 (pstatus.outputs[i] → output i + 1, 없는 설정은 첫 번째 출력 값을 이어 받음)"""
+        for number, config in enumerate(self.pstatus.get("outputs") or [], start=1):
+            if not isinstance(config, dict):
+                self.print("error", f"Invalid output config: {number}")
+                continue
+            # screen을 지정하지 않으면 output 번호의 화면
+            pstatus = {**self.pstatus, "outputs": [], "screen": number, **config}
+            self.outputs[number] = Player(pstatus, self.app_path, host=self, output=number)
+        self.mark_phase("outputs_init")
+
+    def place_on_screen(self):
+        """screen_index 화면으로 창 이동 (전체화면은 창이 있는 화면에 적용됨)"""
+        if self.screen_index is None:
+            return
+        screens = QApplication.screens()
+        try:
+            screen = screens[int(self.screen_index)]
+        except (IndexError, TypeError, ValueError):
+            self.print("warn", f"Screen {self.screen_index} is not available ({len(screens)} screens)")
+            return
+        self.setGeometry(screen.availableGeometry())
+
+    def mark_phase(self, name):
+        """기동 단계 완료 시각 기록 (ms)"""
+        self.startup_timings[name] = round((time.perf_counter() - PROCESS_START) * 1000, 1)
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self.window_open_sent:
+            self.mark_phase("first_frame")
+            self.send_window_open()
+
+    def send_window_open(self):
+        if self.window_open_sent:
+            return
+        self.window_open_sent = True
+        self.print("window_open", {
+            "value": True,
+            "framing": framing_capabilities(),
+            "timings": dict(self.startup_timings),
+        })
+        # 첫 프레임이 나간 다음 이벤트 루프에서 VLC 초기화
+        QTimer.singleShot(0, self.start_vlc_stage)
+
+    def start_vlc_stage(self):
+        """기동 2단계: VLC 초기화 후 대기 중인 명령 처리"""
+        self.init_players_events()
+        self.init_players()
+        self.mark_phase("vlc_init")
+        self.vlc_ready = True
+        # 대기 중인 명령보다 먼저 재개 (Node가 보낸 명령이 최종 상태가 되도록)
+        self.resume_from_checkpoint()
+        if self.checkpoint is not None:
+            self.checkpoint.start()
+        pending, self.pending_commands = self.pending_commands, []
+        for spec, args, received in pending:
+            self.dispatch_command(spec, args, received)
+        self.mark_phase("command_ready")
+        # 추가 출력 창은 host의 libVLC 인스턴스가 준비된 뒤 초기화
+        for window in self.outputs.values():
+            window.start_vlc_stage()
+        QTimer.singleShot(0, self.start_audio_stage)
+
+    def start_audio_stage(self):
+        """기동 3단계: 오디오 디바이스 조회 시작 (설정된 장치는 플레이어 생성 시 적용, 다시 나타나면 재적용)"""
+        if self.host is None:
+            # 장치 조회, 이벤트 루프 지연, 프로세스 메트릭은 프로세스에 하나
+            self.audio_service.start()
+            self.mark_phase("audio_ready")
+            self.loop_lag.start()
+            if self.metrics_timer.interval() > 0:
+                self.metrics_timer.start()
+        self.print("startup", {
+            "timings": dict(self.startup_timings),
+            "queued_commands": self.startup_queued,
+            "vlc": {
+                "backend": VLC_BACKEND,
+                "shared_instance": self.shared_instance,
+                "instances": sum(1 for instance in self.instances if instance is not None),
+                "players": self.players_created,
+            },
+            "shared_state": self.shared_state.info() if self.shared_state is not None else None,
+            "outputs": sorted(self.outputs),
+        })
+
     # =========================
     # 명령 처리 및 유틸 함수
     # =========================
     # 명령 처리 함수
-    def handle_stdin_message(self, data):
-        """표준입력으로 들어오는 명령 처리"""
-        try:
-            data = json.loads(data)
-        except json.JSONDecodeError:
-            self.print("error", "Invalid JSON received from stdin")
-            return
-        command = data.get("command")
-        if not isinstance(command, str):
-            self.print("error", f"Invalid command type: {type(command)}. Expected a string.")
-            return
-        # 짧은 시간 내 중복 메시지 필터링
-        current_time = time.time()
-        if not hasattr(self, 'last_command_time'):
-            self.last_command_time = {}
-        last_time = self.last_command_time.get(command, 0)
-        if current_time - last_time < 0.1:  # 0.5초 이내 중복 메시지 무시
-            self.print("debug", f"Skipping duplicate command within short interval: {command}")
-            return
-        self.last_command_time[command] = current_time
-        # 명령어에 따라 적절한 함수 호출
-        dispatch = {
-            # logo
-            "show_logo": lambda data: self.set_logo_visibility(data.get("show", True)),
-            "logo_file": lambda data: self.set_logo_file(data.get("file", "")),
-            "logo_size": lambda data: self.set_logo_size(int(data.get("size", 0))),
-            # player
-            "set_media": lambda data: self.set_media(data.get("file", {}), int(data.get("idx", 0))),
-            "playid": lambda data: self.play_id(data.get("file", {})),
-            "play": lambda data: self.play(int(data.get("idx", 0))),
-            "pause": lambda data: self.pause(int(data.get("idx", 0))),
-            "stop": lambda data: self.stop(int(data.get("idx", 0))),
-            "stop_all": lambda data: self.stop_all(),
-            # audio devices
-            "set_audio_device": lambda data: self.set_audio_device(data.get("device_id", "")),
-            "get_audio_devices": lambda data: self.get_audio_devices(),
-            # playlist
-            "playlist_mode": lambda data: self.set_playlist_mode(bool(data.get("value", False))),
-            "playlist_play": lambda data: self.playlist_play(int(data.get("idx", 0))),
-            "set_tracks": lambda data: self.set_tracks(data.get("tracks", [])),
-            "image_time": lambda data: self.set_image_time(int(data.get("time", 0))),
-            "set_track_index": lambda data: self.update_track_index(int(data.get("index", 0))),
-            "next": lambda data: self.next(),
-            "previous": lambda data: self.previous(),
-            "set_time": lambda data: self.set_time(int(data.get("time", 0)), int(data.get("idx", 0))),
-            # etc
-            "set_fullscreen": lambda data: self.set_fullscreen(data.get("value", False)),
-            "background_color": lambda data: self.set_background_color(data.get("color", "#000000")),
-        }
-        func = dispatch.get(command)
-        if func:
+    def handle_stdin_batch(self, commands, received=None):
+        """stdin 리더가 한 번에 디코딩한 명령 묶음 처리 (received: 수신 시각)"""
+        self.stdin_batches_handled += 1
+        for data in commands:
+            self.handle_command(data, received)
+
+    def register_commands(self):
+        """명령 스펙 등록 (인자 키, 타입, 기본값, 합치기 정책)"""
+        register = self.commands.register
+        # logo
+        register("show_logo", self.set_logo_visibility, Arg("show", bool, True), needs_vlc=False, coalesce=LATEST)
+        register("logo_file", self.set_logo_file, Arg("file", str, ""), needs_vlc=False, coalesce=LATEST)
+        register("logo_size", self.set_logo_size, Arg("size", int, 0), needs_vlc=False, coalesce=LATEST)
+        # player
+        register("set_media", self.set_media, Arg("file", dict, {}), Arg("idx", int, 0), coalesce=IDEMPOTENT)
+        register("playid", self.play_id, Arg("file", dict, {}), coalesce=IDEMPOTENT)
+        register("play", self.play, Arg("idx", int, 0), coalesce=IDEMPOTENT)
+        # VLC pause()는 토글이므로 합치지 않음
+        register("pause", self.pause, Arg("idx", int, 0))
+        register("stop", self.stop, Arg("idx", int, 0), coalesce=IDEMPOTENT)
+        register("stop_all", self.stop_all, coalesce=IDEMPOTENT)
+        register("set_time", self.set_time, Arg("time", int, 0), Arg("idx", int, 0), coalesce=LATEST, key=("idx",))
+        register(
+            "set_volume", self.set_volume, Arg("volume", int), Arg("idx", int, None, nullable=True),
+            coalesce=LATEST, key=("idx",),
+        )
+        # audio devices
+        register("set_audio_device", self.set_audio_device, Arg("device_id", str, ""), coalesce=LATEST)
+        register("get_audio_devices", self.get_audio_devices, coalesce=IDEMPOTENT)
+        # playlist
+        register("playlist_mode", self.set_playlist_mode, Arg("value", bool, False), coalesce=IDEMPOTENT)
+        register("playlist_play", self.playlist_play, Arg("idx", int, 0), coalesce=IDEMPOTENT)
+        # 버전이 있으면 버전만 비교해서 합침 (긴 트랙 목록 전체 비교를 피함)
+        register(
+            "set_tracks", self.set_tracks, Arg("tracks", list, []), Arg("version", int, None, nullable=True),
+            coalesce=IDEMPOTENT, key=("version",),
+        )
+        # 버전이 있는 패치는 하나라도 빠지면 안 됨
+        register(
+            "patch_tracks", self.patch_tracks,
+            Arg("ops", list), Arg("base_version", int), Arg("version", int, None, nullable=True),
+        )
+        register("image_time", self.set_image_time, Arg("time", int, 0), needs_vlc=False, coalesce=LATEST)
+        register(
+            "set_transition", self.set_transition,
+            Arg("mode", str, None, nullable=True), Arg("duration_ms", int, None, nullable=True),
+            needs_vlc=False, coalesce=LATEST,
+        )
+        register(
+            "set_repeat", self.set_repeat, Arg("mode", str, "none"), needs_vlc=False, coalesce=LATEST,
+        )
+        register("set_track_index", self.update_track_index, Arg("index", int, 0), coalesce=IDEMPOTENT)
+        # 연속 입력은 step_track에서 debounce (합쳐도 이동 횟수는 유지)
+        register("next", lambda: self.step_track(1))
+        register("previous", lambda: self.step_track(-1))
+        # 예약 시작 (여러 PC 동시 시작). 예약은 도착 순서대로 모두 처리
+        register(
+            "play_at", self.play_at,
+            Arg("at", float), Arg("file", dict, None, nullable=True), Arg("track", int, None, nullable=True),
+            Arg("offset", float, 0.0), Arg("id", str, ""),
+        )
+        register("next_at", self.next_at, Arg("at", float), Arg("offset", float, 0.0), Arg("id", str, ""))
+        register("clock_sync", self.clock_sync, Arg("t0", float), Arg("id", str, ""), needs_vlc=False)
+        register(
+            "telemetry", lambda hz, keyframe: self.telemetry.configure(hz, keyframe),
+            Arg("hz", float, None, nullable=True), Arg("keyframe", float, None, nullable=True),
+            needs_vlc=False, coalesce=LATEST,
+        )
+        register("stats", self.report_stats, Arg("reset", bool, False), needs_vlc=False, coalesce=IDEMPOTENT)
+        register("metrics", self.report_metrics, needs_vlc=False, coalesce=IDEMPOTENT)
+        # etc
+        register("set_fullscreen", self.set_fullscreen, Arg("value", bool, False), needs_vlc=False, coalesce=LATEST)
+        register(
+            "background_color", self.set_background_color, Arg("color", str, "#000000"),
+            needs_vlc=False, coalesce=LATEST,
+        )
+
+    def handle_command(self, data, received=None):
+        """디코딩된 명령 처리: 스펙 검증 → 같은 프레임 명령 합치기 → 다음 이벤트 루프 턴에 실행"""
+        if received is None:
+            received = time.perf_counter()
+        if not isinstance(data, dict):
+            self.print("command_error", { "command": None, "arg": None, "message": "Command must be an object." })
+            return
+        output = data.get("output")
+        if self.host is None and output is not None:
+            # 추가 출력 창 명령 (0 또는 없으면 이 창). Node는 JSON 키에서 온 "1" 같은 문자열도 보낸다
             try:
-                if command == "set_track_index":
-                    pass
-                func(data)
-            except Exception as e:
-                self.print("error", f"Error executing command '{command}': {e}")
+                output = to_int(output)
+            except ValueError:
+                self.print("command_error", {
+                    "command": data.get("command"), "arg": "output", "message": f"Invalid output: {output!r}",
+                })
+                return
+        if self.host is None and output:
+            window = self.outputs.get(output)
+            if window is None:
+                self.print("command_error", {
+                    "command": data.get("command"), "arg": "output", "message": f"Unknown output: {output}",
+                })
+                return
+            window.handle_command(data, received)
+            return
+        try:
+            spec, args = self.commands.parse(data)
+        except CommandError as e:
+            self.print("command_error", { "command": e.command, "arg": e.arg, "message": str(e) })
+            return
+        self.coalescer.add(spec, args, received)
+        if not self.coalesce_scheduled:
+            self.coalesce_scheduled = True
+            QTimer.singleShot(0, self.flush_commands)
+
+    def flush_commands(self):
+        """합쳐진 명령 실행 (VLC 준비 전이면 VLC가 필요한 명령은 대기열에 보관)"""
+        self.coalesce_scheduled = False
+        for spec, args, received in self.coalescer.drain():
+            # 대기 중인 명령이 있으면 순서 유지를 위해 모두 보관
+            if not self.vlc_ready and (self.pending_commands or spec.needs_vlc):
+                self.pending_commands.append((spec, args, received))
+                self.startup_queued += 1
+                continue
+            self.dispatch_command(spec, args, received)
+
+    def step_track(self, step):
+        """next/previous. 첫 입력은 바로 처리하고, debounce 시간 안의 추가 입력은 모아서 한 번에 이동"""
+        if self.step_timer.isActive():
+            self.pending_steps += step
+            self.coalescer.count_merge("next" if step > 0 else "previous")
+        elif step > 0:
+            self.next()
         else:
-            self.print("error", f"Unknown command: {command}")
-            
-        
+            self.previous()
+        self.step_timer.start()
+
+    def flush_steps(self):
+        """debounce 동안 모인 next/previous를 합친 만큼 이동"""
+        steps, self.pending_steps = self.pending_steps, 0
+        if steps == 0:
+            return
+        if not self.playlist_mode or not self.tracks:
+            self.print("error", "Next/previous track can only be used in playlist mode.")
+            return
+        self.print("debug", f"Debounced track step: {steps}")
+        # 한 칸만 남으면 단일 입력과 같게 처리 (previous는 5초 이상 재생 중이면 처음으로)
+        if steps == 1:
+            self.next()
+            return
+        if steps == -1:
+            self.previous()
+            return
+        # 전체 반복일 때만 목록 끝을 넘어 돌아가고, 그 외에는 처음/마지막 트랙에서 멈춘다
+        target = self.track_index + steps
+        if self.repeat == "all":
+            target %= len(self.tracks)
+        else:
+            target = min(max(target, 0), len(self.tracks) - 1)
+        if target == self.track_index:
+            return
+        if self.image_timer_instance.isActive():
+            self.image_timer_instance.stop()
+        self.play_track(target)
+
+    def dispatch_command(self, spec, args, received=None):
+        """검증된 명령 실행"""
+        try:
+            self.commands.execute(spec, args, received)
+        except Exception as e:
+            self.print("error", f"Error executing command '{spec.name}': {e}")
+
+    def report_stats(self, reset=False):
+        """내부 처리 통계 출력"""
+        self.print("stats", {
+            "event_pump": self.event_pump.stats(reset),
+            "stdout": self.writer.stats(),
+            "image_cache": self.image_cache.stats(),
+            "logo": self.logo.stats(),
+            "media_cache": self.media_cache.stats(),
+            "playlist": self.playlist.stats(),
+            "quality": self.quality.stats(),
+            "audio_devices": self.audio_service.stats(),
+            "sync_start": self.sync_start.stats(),
+            "playlist_scheduler": self.playlist_scheduler.stats(),
+            "transitions": self.transitions.stats(),
+            "shared_state": self.shared_state.stats() if self.shared_state is not None else None,
+            "checkpoint": self.checkpoint.stats() if self.checkpoint is not None else None,
+            "commands": self.commands.stats(reset),
+            "coalesce": self.coalescer.stats(reset),
+        })
+
+    def collect_shared_state(self):
+        """공유 상태 블록 값 수집 (telemetry 캐시 값만 읽고 VLC getter는 호출하지 않음)"""
+        values = (
+            self.active_player_id,
+            int(self.playlist_mode),
+            int(self.isFullScreen()),
+            self.track_index,
+            len(self.tracks),
+            self.playlist.version if self.playlist.version is not None else -1,
+            self.commands.executed,
+            self.playlist_scheduler.advanced,
+            self.transitions.transitions + self.transitions.cuts,
+            self.writer.written,
+            sum(self.event_pump.posted_counts().values()),
+        )
+        slots = []
+        for idx in range(self.pool_size):
+            data = self.telemetry.snapshot(idx)
+            file = self.current_files[idx]
+            slots.append((
+                int(data.get("time") or 0),
+                int(data.get("duration") or 0),
+                float(data.get("position") or 0),
+                float(data.get("rate") or 0),
+                int(data.get("volume") or 0),
+                state_code(data.get("state")),
+                int(bool(data.get("is_playing"))),
+                int(bool(file.get("is_image", False))),
+                str(file.get("uuid", "")).encode("utf-8")[:64],
+            ))
+        return values, slots
+
+    def collect_checkpoint(self):
+        """체크포인트 상태 수집 (트랙 목록은 Checkpoint가 버전별로 따로 직렬화)"""
+        idx = self.active_player_id
+        file = self.current_files[idx]
+        media = None
+        if file.get("path"):
+            if file.get("is_image", True):
+                playing = getattr(self.player_widgets[idx], 'original_image', None) is not None
+                # 이미지는 자동 진행 기준 표시 경과 시간
+                current = self.playlist_scheduler.current
+                position = 0
+                if current is not None and current.slot == idx:
+                    position = int((time.monotonic() - current.ideal_start) * 1000)
+            else:
+                data = self.telemetry.snapshot(idx)
+                playing = bool(data.get("is_playing"))
+                position = int(data.get("time") or 0)
+            media = {"file": dict(file), "position_ms": max(0, position), "playing": playing}
+        return {
+            "playlist": {
+                "version": self.playlist.version,
+                "count": len(self.tracks),
+                "mode": self.playlist_mode,
+                "track_index": self.track_index,
+                "repeat": self.repeat,
+            },
+            "active_slot": idx,
+            "media": media,
+            "image_time": self.image_time,
+            "logo": {"file": self.logo_file, "size": self.logo_size, "show": self.logo_show},
+            "background": self.background_color,
+        }
+
+    def checkpoint_changed(self):
+        """트랙/슬롯/로고/배경 변경: 체크포인트를 곧 저장"""
+        if getattr(self, "checkpoint", None) is not None:
+            self.checkpoint.request()
+
+    def resume_from_checkpoint(self):
+        """체크포인트의 설정/트랙 목록을 복원하고 저장된 위치부터 이어서 재생"""
+        saved, self.resume_state = self.resume_state, None
+        if saved is None:
+            return
+        started = time.monotonic()
+        state = saved.get("state", {})
+        playlist = state.get("playlist", {})
+        try:
+            self.image_time = int(state.get("image_time", self.image_time))
+            self.repeat = playlist.get("repeat", self.repeat)
+            self.playlist_mode = bool(playlist.get("mode", self.playlist_mode))
+            self.set_background_color(state.get("background", self.background_color))
+            logo = state.get("logo", {})
+            self.update_logo(logo.get("file", self.logo_file), int(logo.get("size", self.logo_size)), bool(logo.get("show", self.logo_show)))
+            tracks = saved.get("tracks") or []
+            if tracks:
+                self.playlist.set(tracks, playlist.get("version"))
+                self.tracks = self.playlist.tracks
+                self.track_index = min(max(0, int(playlist.get("track_index", 0))), len(self.tracks) - 1)
+            media = state.get("media")
+            resumed = {"track_index": None, "idx": None, "position_ms": 0}
+            if media and media.get("playing"):
+                file = media.get("file", {})
+                position = int(media.get("position_ms") or 0)
+                index = self.resume_track_index(playlist.get("track_index"), file)
+                if self.playlist_mode and index is not None:
+                    self.play_track(index)
+                else:
+                    self.play_id(file)
+                idx = self.active_player_id
+                if file.get("is_image", True):
+                    self.playlist_scheduler.skip(position / 1000)
+                elif position > 0:
+                    self.resume_seek[idx] = position
+                resumed = {"track_index": index, "idx": idx, "position_ms": position}
+            self.print("resumed", {
+                **resumed,
+                "age_ms": int(wall_ms() - saved.get("saved_at", wall_ms())),
+                "playlist_version": self.playlist.version,
+                "tracks": len(self.tracks),
+                "elapsed_ms": round((time.monotonic() - started) * 1000, 1),
+            })
+        except Exception as e:
+            self.print("error", f"Failed to resume from checkpoint: {e}")
+
+    def resume_track_index(self, index, file):
+        """체크포인트의 트랙 인덱스 (uuid가 다르면 uuid로 찾음). 없으면 None"""
+        uuid = file.get("uuid")
+        if isinstance(index, int) and 0 <= index < len(self.tracks):
+            if not uuid or self.tracks[index].get("uuid") == uuid:
+                return index
+        for position, track in enumerate(self.tracks):
+            if uuid and track.get("uuid") == uuid:
+                return position
+        return None
+
+    def register_metrics(self):
+        """metrics 메시지 항목 등록 (스냅숏 때만 읽는 누적 카운터와 히스토그램)"""
+        metrics = self.metrics
+        metrics.histogram("loop.lag_ms", self.loop_lag.histogram)
+        if self.stdin_reader is not None:
+            metrics.gauge("stdin.depth", lambda: self.stdin_reader.batches - self.stdin_batches_handled)
+            metrics.rate("stdin.bytes_per_s", lambda: self.stdin_reader.bytes_read)
+            metrics.rate("stdin.commands_per_s", lambda: self.stdin_reader.commands)
+        metrics.gauge("stdout.depth", self.writer.depth)
+        metrics.rate("stdout.messages_per_s", lambda: self.writer.written)
+        metrics.rate("stdout.bytes_per_s", lambda: self.writer.bytes)
+        metrics.rate("commands.executed_per_s", lambda: self.commands.executed)
+        metrics.gauge("commands.pending", lambda: len(self.pending_commands))
+        metrics.ratio("image_cache.hit_rate", lambda: (self.image_cache.hits, self.image_cache.hits + self.image_cache.misses))
+        metrics.ratio(
+            "image_cache.scaled_hit_rate",
+            lambda: (self.image_cache.scaled_hits, self.image_cache.scaled_hits + self.image_cache.scaled_misses),
+        )
+        metrics.gauge("image_cache.mb", lambda: round(self.image_cache.images.total_bytes / (1024 * 1024), 1))
+        metrics.gauge("image_cache.saved_mb", lambda: round(self.image_cache.bytes_saved / (1024 * 1024), 1))
+        metrics.gauge("image_cache.decode_peak_mb", lambda: round(self.image_cache.peak_bytes_max / (1024 * 1024), 1))
+        metrics.histogram("image_cache.decode_ms", self.image_cache.decode_ms)
+        metrics.histogram("image_cache.scale_ms", self.image_cache.scale_ms)
+        metrics.histogram("transition.frame_ms", self.transitions.frame_ms)
+        metrics.histogram("playlist.gap_ms", self.playlist_scheduler.gap_ms)
+        metrics.rate("vlc.events_per_s", self.event_pump.posted_counts)
+        metrics.gauge("vlc.event_queue", self.event_pump.depth)
+        metrics.gauge("process", process_metrics)
+
+    def report_metrics(self):
+        """메트릭 스냅숏 출력 (주기 타이머 또는 metrics 명령)"""
+        self.print("metrics", self.metrics.snapshot())
+
     def print(self, type, data):
-        """json 포맷으로 로그 출력"""
-        print(json.dumps({"type": type, "data": data}, ensure_ascii=False, separators=(",", ":")), flush=True)
+        """json 포맷으로 로그 출력 (stdout 출력 스레드로 전달, 추가 출력 창은 output 번호를 붙임)"""
+        self.writer.put(type, data, self.output if self.host is not None else None)
         
     def resizeEvent(self, event):
         """윈도우 리사이즈 시 위젯 크기 조정"""
         super().resizeEvent(event)
         self.set_all_player_geometry()
+        # 창이 커지면 축소 디코딩한 이미지는 relayout_images에서 다시 디코딩
+        self.image_cache.set_output(
+            self.width() * self.devicePixelRatioF(), self.height() * self.devicePixelRatioF(), self.output,
+        )
+        # 리사이즈 중에는 빠른 변환만 하고, 크기가 멈추면 고품질 변환을 한 번 한다
         for idx in range(len(self.player_widgets)):
-            self.apply_image_layout(idx)
+            self.apply_image_layout(idx, fast=True)
+        self.relayout_timer.start()
         self.apply_logo_layout()
 
     def closeEvent(self, event):
-        """창 닫기 시 프로세스 종료"""
+        """창 닫기 시 프로세스 종료 (추가 출력 창은 따로 닫히지 않음)"""
+        if self.host is not None:
+            event.ignore()
+            return
         self.print("info", "Closing player window, terminating process.")
         self.stdin_reader.stop()
+        self.media_cache.save()
+        for window in [self, *self.outputs.values()]:
+            if window.shared_state is not None:
+                window.shared_state.close()
+            if window.checkpoint is not None:
+                window.checkpoint.flush()
+        self.writer.close()
         sys.exit(0)
         
     def update_image_size(self):
@@ -247,22 +863,63 @@ class Player(QMainWindow):
 
     def apply_logo_layout(self):
         """로고 위젯의 크기, 위치, 가시성 일괄 적용"""
-        if not hasattr(self, 'logo_widget') or not self.logo_widget:
+        if not hasattr(self, 'logo'):
             return
-        logo_x = (self.width() - self.logo_width) // 2
-        logo_y = (self.height() - self.logo_height) // 2
-        self.logo_widget.setGeometry(logo_x, logo_y, self.logo_width, self.logo_height)
+        self.logo.layout()
 
-    def apply_image_layout(self, idx):
-        """이미지 위젯의 크기, 정렬 일괄 적용"""
+    def apply_image_layout(self, idx, fast=False):
+        """이미지 위젯의 크기, 정렬 일괄 적용 (숨김 위젯은 보일 때까지 미룸)"""
         widget = self.player_widgets[idx]
-        if hasattr(widget, 'original_pixmap') and widget.original_pixmap:
-            pixmap = widget.original_pixmap
-            scaled_pixmap = pixmap.scaled(
-                widget.width(), widget.height(), Qt.KeepAspectRatio, Qt.SmoothTransformation
-            )
-            widget.setPixmap(scaled_pixmap)
-            widget.setAlignment(Qt.AlignCenter)
+        image = getattr(widget, 'original_image', None)
+        if image is None:
+            return
+        width, height = widget.width(), widget.height()
+        if not widget.isVisible():
+            # 숨김 위젯은 축소하지 않고 보일 때 적용
+            widget.layout_dirty = True
+            return
+        pixmap = self.image_cache.scaled_pixmap(widget.image_key, image, width, height, SMOOTH, create=not fast)
+        if pixmap is None:
+            pixmap = self.image_cache.scaled_pixmap(widget.image_key, image, width, height, FAST)
+        if pixmap is None:
+            return
+        widget.setPixmap(pixmap)
+        widget.setAlignment(Qt.AlignCenter)
+        widget.layout_dirty = False
+
+    def relayout_images(self):
+        """리사이즈가 멈춘 뒤 보이는 이미지 위젯의 고품질 축소를 워커에 요청"""
+        for idx, widget in enumerate(self.player_widgets):
+            image = getattr(widget, 'original_image', None)
+            if image is None:
+                continue
+            path = self.current_files[idx].get("path")
+            if path and not self.image_cache.fits(image):
+                # 창보다 작게 디코딩된 이미지: 워커에서 다시 디코딩 후 축소 (on_image_redecoded)
+                self.image_cache.prefetch([path])
+                continue
+            if widget.isVisible():
+                self.image_cache.scale_async(widget.image_key, image, widget.width(), widget.height())
+
+    def on_image_redecoded(self, key):
+        """더 큰 크기로 다시 디코딩 완료: 해당 이미지를 보여주는 위젯의 원본 교체 후 다시 축소"""
+        image = self.image_cache.images.get(key)
+        if image is None:
+            return
+        for idx, widget in enumerate(self.player_widgets):
+            if getattr(widget, 'image_key', None) != key:
+                continue
+            widget.original_image = image
+            if widget.isVisible():
+                self.apply_image_layout(idx, fast=True)
+            self.image_cache.scale_async(key, image, widget.width(), widget.height())
+
+    def on_image_scaled(self, key, width, height):
+        """고품질 축소 완료: 해당 이미지/크기를 보여주는 위젯에 적용"""
+        for idx, widget in enumerate(self.player_widgets):
+            if getattr(widget, 'image_key', None) == key and widget.width() == width and widget.height() == height:
+                if widget.isVisible():
+                    self.apply_image_layout(idx)
 
     # =========================
     # 로고 관련 함수 (중복 제거)
@@ -273,74 +930,16 @@ class Player(QMainWindow):
     def update_logo(self, file_path=None, size=None, visible=None):
         """
         로고 파일, 사이즈, 표시 여부를 한 번에 업데이트하는 통합 함수
+        - 파일/크기가 바뀐 경우에만 다시 렌더링하고, 그 외에는 기존 위젯만 갱신
         """
         if file_path is not None:
             self.logo_file = file_path
-            self.logo_svg = self.logo_file.lower().endswith(".svg")
         if size is not None:
             self.logo_size = size
         if visible is not None:
             self.logo_show = visible
-
-        # 기존 위젯 정리
-        if hasattr(self, 'logo_widget') and self.logo_widget:
-            self.logo_widget.setVisible(False)
-            self.logo_widget.deleteLater()
-            self.logo_widget = None
-
-        if not self.logo_show:
-            return
-        # 위젯 생성 및 이미지 적용
-        if self.logo_svg:
-            try:
-                self.logo_widget = QSvgWidget(self.logo_file, self)
-                svg_renderer = QSvgRenderer(self.logo_file)
-                if svg_renderer.isValid():
-                    original_width = svg_renderer.defaultSize().width()
-                    original_height = svg_renderer.defaultSize().height()
-                    if self.logo_size > 0:
-                        self.logo_width = self.logo_size
-                        self.logo_height = int(original_height * (self.logo_size / original_width))
-                    else:
-                        self.logo_width = original_width
-                        self.logo_height = original_height
-                else:
-                    self.print("error", "Failed to load SVG logo file.")
-                    return
-            except Exception as e:
-                self.print("error", f"Failed to initialize SVG logo widget: {e}")
-                return
-        else:
-            try:
-                pixmap = QPixmap(self.logo_file)
-                if not pixmap.isNull():
-                    self.logo_widget = QLabel(self)
-                    original_width = pixmap.width()
-                    original_height = pixmap.height()
-                    if self.logo_size > 0:
-                        self.logo_width = self.logo_size
-                        self.logo_height = int(original_height * (self.logo_size / original_width))
-                    else:
-                        self.logo_width = original_width
-                        self.logo_height = original_height
-                    self.logo_widget.setPixmap(
-                        pixmap.scaled(
-                            self.logo_width,
-                            self.logo_height,
-                            Qt.KeepAspectRatio,
-                            Qt.SmoothTransformation,
-                        )
-                    )
-                else:
-                    self.print("error", "Pixmap is null. Failed to load image.")
-                    return
-            except Exception as e:
-                self.print("error", f"Failed to initialize Pixmap logo widget: {e}")
-                return
-        self.logo_widget.setVisible(self.logo_show)
-        self.logo_widget.raise_()
-        self.apply_logo_layout()
-        self.print("debug", f"Logo updated: file={self.logo_file}, size={self.logo_size}, visible={self.logo_show}")
+        self.logo.update(self.logo_file, self.logo_size, self.logo_show)
+        self.checkpoint_changed()
 
     # 기존 개별 함수들은 update_logo로 대체
     def set_logo_file(self, file_path):
@@ -356,56 +955,56 @@ class Player(QMainWindow):
         try:
             self.stop(idx)
             widget = self.player_widgets[idx]
-            if not hasattr(widget, 'original_pixmap') or not isinstance(widget.original_pixmap, QPixmap):
-                pixmap = QPixmap(image_path)
-                if pixmap.isNull():
+            if getattr(widget, 'original_image', None) is None:
+                key, image = self.image_cache.get(image_path)
+                if image is None:
                     self.print("error", f"Failed to load image: {image_path}")
                     return
-                widget.original_pixmap = pixmap
-            else:
-                pixmap = widget.original_pixmap
+                widget.original_image = image
+                widget.image_key = key
             self.print('media_changed', { "idx": idx, "uuid": file.get("uuid", ""), "path": image_path })
-            self.apply_image_layout(idx)
             if not self.playlist_mode:
                 widget.setVisible(True)
-            self.print("player_data", {
-                "id": idx,
-                "event": "display_image",
-                "media": image_path,
-                "state": "displaying_image",
-                "time": 0,
-                "duration": 0,
-                "position": 0,
-                "is_playing": 1,
-            })
+            self.apply_image_layout(idx)
+            if not widget.isVisible():
+                # 미리 로드한 이미지는 전환 전에 워커에서 고품질 축소해 둔다
+                self.image_cache.scale_async(widget.image_key, widget.original_image, widget.width(), widget.height())
+            self.telemetry.update(
+                idx, "display_image", immediate=True,
+                media=image_path, state="displaying_image", time=0, duration=0, position=0, is_playing=1,
+            )
         except Exception as e:
             self.print("error", f"Error displaying image: {e}")
 
     def stop_image(self, idx=None):
-        if self.image_timer_instance.isActive():
-            self.image_timer_instance.stop()
         idx = self.active_player_id if idx is None else idx
+        # 미리 로드 중인 다른 슬롯의 정지가 현재 이미지 타이머를 멈추지 않도록 함
+        if idx == self.active_player_id and self.image_timer_instance.isActive():
+            self.image_timer_instance.stop()
         widget = self.player_widgets[idx]
         widget.clear()
         widget.setVisible(False)
-        if hasattr(widget, 'original_pixmap'):
-            del widget.original_pixmap
-        self.print("player_data", {
-            "id": idx,
-            "event": "stop_image",
-            "media": "",
-            "state": "stopped_image",
-            "time": 0,
-            "duration": 0,
-            "position": 0,
-            "is_playing": 0,
-        })
+        widget.original_image = None
+        widget.image_key = None
+        widget.layout_dirty = False
+        self.telemetry.update(
+            idx, "stop_image", immediate=True,
+            media="", state="stopped_image", time=0, duration=0, position=0, is_playing=0,
+        )
         
     def set_image_time(self, time):
         """이미지 표시 시간 설정"""
         self.image_time = time
         self.print("set_image_time", {"value" : self.image_time})
 
+    def image_show_time(self, file):
+        """이미지 표시 시간 (초). 파일에 없으면 image_time"""
+        show_time = file.get("time")
+        if show_time is None or show_time <= 0:
+            self.print("debug", f"Invalid show time for image, using default of {self.image_time} seconds.")
+            show_time = self.image_time
+        return show_time
+
     def image_timer(self):
         """이미지 재생 타이머 설정"""
         timer = self.image_timer_instance
@@ -431,10 +1030,7 @@ class Player(QMainWindow):
             self.print("debug", "Current file is not an image, skipping image timer setup.")
             return
 
-        show_time = current_file.get("time")
-        if show_time is None or show_time <= 0:
-            self.print("debug", "Invalid show time for image, using default of 5 seconds.")
-            show_time = self.image_time
+        show_time = self.image_show_time(current_file)
         timer.start(show_time * 1000)
         self.print("debug", f"Image timer started for {show_time} seconds.")
 
@@ -447,67 +1043,101 @@ class Player(QMainWindow):
         self.setStyleSheet(f"background-color: {self.background_color};")  # 메인 윈도우 배경색 변경
         for widget in self.player_widgets:
             widget.setStyleSheet(f"background-color: {self.background_color};")
+        self.transitions.overlay.set_background(self.background_color)
+        self.checkpoint_changed()
 
     def set_fullscreen(self, value):
-        """전체화면 모드 설정"""
+        """전체화면 모드 설정 (VLC 플레이어는 생성할 때 ensure_player에서 적용)"""
+        self.fullscreen = value
         if value:
             self.showFullScreen()
         else:
             self.showNormal()
-        for player in self.players:
+        for idx, player in enumerate(self.players):
+            if player is None:
+                continue
             player.set_fullscreen(value)
+            self.telemetry.refresh(idx, ("fullscreen",))
         self.print("set_fullscreen", { "value": value })
         
-    def fade_transition(self, idx):
-        """플레이어 전환 및 로고 표시/숨김"""
-        from_id = 1 if idx == 0 else 0  # 현재 동작 중인 위젯의 인덱스
-        from_widget = self.player_widgets[from_id]  # 현재 동작 중인 위젯
+    def fade_transition(self, idx, mode=None):
+        """플레이어 전환 및 로고 표시/숨김 (mode: cut/crossfade/fade, None이면 transition.mode)"""
         to_widget = self.player_widgets[idx]
         to_file = self.current_files[idx] if self.current_files and len(self.current_files) > idx else {}
         mimetype = to_file.get("mimetype", "")
+        is_audio = mimetype.startswith("audio/")
+        # 진행 중인 전환은 끝 상태로 정리한 뒤 현재 화면 기준으로 시작
+        self.transitions.interrupt()
+
+        # 화면에 보이거나 재생 중인 다른 슬롯 (미리 로드만 된 숨김 슬롯은 유지)
+        from_ids = [
+            from_id for from_id, from_widget in enumerate(self.player_widgets)
+            if from_id != idx and (from_widget.isVisible() or self.is_playing(from_id))
+        ]
+        visible_ids = [from_id for from_id in from_ids if self.player_widgets[from_id].isVisible()]
+        source = self.transition_side(visible_ids[-1]) if visible_ids else TransitionSide(None)
+        target = TransitionSide(idx) if is_audio else self.transition_side(idx, visible=True)
+
+        def swap():
+            # 미디어 타입에 따라 로고 표시/숨김
+            if is_audio:
+                for player_widget in self.player_widgets:
+                    player_widget.setVisible(False)
+                self.update_logo()
+                self.print("debug", f"fade_transition: Audio file detected (mimetype: {mimetype}). Logo will be shown.")
+            else:
+                self.print("debug", f"fade_transition: Non-audio file (mimetype: {mimetype}). Logo will be hidden.")
+                for from_id in from_ids:
+                    self.player_widgets[from_id].setVisible(False)
+                to_widget.setVisible(True)
+                if getattr(to_widget, 'layout_dirty', False):
+                    self.apply_image_layout(idx)
+                to_widget.raise_()
+
+        def done():
+            # 이전 슬롯 정지 (전환이 끝난 뒤)
+            for from_id in from_ids:
+                if from_id != self.active_player_id:
+                    self.stop(from_id)
+            if self.preload_deferred:
+                QTimer.singleShot(0, self.resume_preload)
+
+        self.update_active_player_id(idx)
+        self.transitions.start(source, target, swap, done, mode=mode)
+
+    def transition_side(self, idx, visible=False):
+        """슬롯의 전환 대상 내용 (visible이면 숨김 상태여도 보일 내용 기준)"""
+        widget = self.player_widgets[idx]
+        if not (visible or widget.isVisible()):
+            return TransitionSide(idx)
+        if self.current_files[idx].get("is_image", True):
+            if getattr(widget, 'original_image', None) is None:
+                return TransitionSide(idx)
+            return TransitionSide(idx, "image", widget=widget)
+        player = self.players[idx]
+        return TransitionSide(idx, "video" if player is not None else None, widget=widget, player=player)
+
+    def set_transition(self, mode=None, duration_ms=None):
+        """기본 화면 전환 방식/길이 설정"""
+        try:
+            value = self.transitions.configure(mode, duration_ms)
+        except ValueError as e:
+            self.print("error", str(e))
+            return
+        self.print("set_transition", value)
 
-        if hasattr(from_widget, 'original_pixmap'):
-            self.stop_image(from_id)  # Stop displaying image if it exists
-        if self.players[from_id].is_playing():
-            self.players[from_id].stop()
-        # 미디어 타입에 따라 로고 표시/숨김
-        if mimetype.startswith("audio/"):
-            self.stop(from_id)
-            for player_widget in self.player_widgets:
-                player_widget.setVisible(False)
-            self.update_logo()
-            self.print("debug", f"fade_transition: Audio file detected (mimetype: {mimetype}). Logo will be shown.")
-        else:
-            self.print("debug", f"fade_transition: Non-audio file (mimetype: {mimetype}). Logo will be hidden.")
-            from_widget.setVisible(False)
-            to_widget.setVisible(True)  # Ensure the target widget is visible before fading in
-            to_widget.raise_()  # Bring the target widget to the front
-            
-        self.update_active_player_id(idx)  # Update the active player ID
-        
-            
     # =========================
     # 오디오 디바이스 관련 함수
     # =========================
-    def set_audio_device_with_retry(self, device_id, retry_interval=2, max_retries=3):
-        """오디오 디바이스 설정(재시도 포함)"""
-        def retry_logic():
-            retries = 0
-            while retries < max_retries:
-                self.set_audio_device(device_id)
-                if self.set_audio_device_result:
-                    self.print("debug", f"Audio device successfully set to: {device_id}")
-                    return
-                self.print("warn", f"Retrying to set audio device: {device_id} (Attempt {retries + 1}/{max_retries})")
-                retries += 1
-                time.sleep(retry_interval)
-            self.print("error", f"Failed to set audio device after {max_retries} attempts.")
-        threading.Thread(target=retry_logic).start()
-
     def set_audio_device(self, device_id):
         """오디오 디바이스 설정"""
+        self.audio_device_id = device_id
+        if self.host is None:
+            self.audio_service.configure(device_id)
         try:
             for player in self.players:
+                if player is None:
+                    continue
                 result = player.audio_output_device_set(None, device_id if device_id else None)
                 if result is not None and result != 0:
                     self.print("error", f"Failed to set audio device: {device_id}. VLC returned: {result}")
@@ -520,86 +1150,158 @@ class Player(QMainWindow):
             self.set_audio_device_result = False
 
     def get_audio_devices(self):
-        """오디오 디바이스 목록 반환"""
-        try:
-            devices = []
-            player = self.players[0] if self.players else vlc.MediaPlayer()
-            if not player:
-                self.print("error", "No player available to get audio devices.")
-                return []
-            dev_list = player.audio_output_device_enum()
-            if dev_list:
-                dev = dev_list
-                while dev:
-                    dev_info = dev.contents
-                    devices.append({
-                        "deviceid": dev_info.device.decode() if dev_info.device else "default",
-                        "name": dev_info.description.decode() if dev_info.description else "기본 장치"
-                    })
-                    dev = dev_info.next
-            self.print("audiodevices", {"devices": devices})
-            return devices
-        except Exception as e:
-            self.print("error", {"message": f"Error getting audio devices: {e}"})
+        """캐시된 오디오 디바이스 목록을 바로 전송하고 백그라운드로 다시 조회"""
+        devices = self.audio_service.cached()
+        if devices is None:
+            self.audio_service.refresh(emit=True)
             return []
+        self.print("audiodevices", {"devices": devices})
+        self.audio_service.refresh()
+        return devices
+
+    def on_audio_devices_changed(self, devices, added, removed):
+        self.print("audiodevices", {"devices": devices, "added": added, "removed": removed})
+
+    def on_audio_device_available(self, device_id):
+        """설정된 장치가 다시 연결됨: 모든 플레이어에 다시 적용"""
+        self.print("info", f"Audio device available again, re-applying: {device_id}")
+        self.set_audio_device(device_id)
+        for window in self.outputs.values():
+            if window.audio_device_id == device_id:
+                window.set_audio_device(device_id)
 
     # =========================
     # 플레이어 초기화 및 이벤트
     # =========================
     def init_players(self):
-        """VLC 플레이어 인스턴스 및 위젯 초기화"""
+        """VLC 인스턴스 및 플레이어 초기화
+
+        vlc.sharedInstance: libVLC 인스턴스 하나를 모든 플레이어가 공유 (플러그인/디코더 모듈 로드 1회)
+        vlc.lazyPlayers: 활성 슬롯 플레이어만 만들고 나머지 슬롯은 처음 사용할 때 생성
+        """
         self.print("info", f"Initializing VLC players...")
-        vlc_args = [
+        self.vlc_args = [
             "--no-video-title-show",
             "--avcodec-hw=any",
             "--no-drop-late-frames",
             "--no-skip-frames"
         ]
-        self.instances = [vlc.Instance(*vlc_args) for _ in range(2)]
-        self.players = [instance.media_player_new() for instance in self.instances]
-        for idx, player in enumerate(self.players):
+        if self.shared_instance and self.host is not None and self.host.shared_instance:
+            # 추가 출력 창은 host의 인스턴스 공유 (플러그인/디코더 모듈 로드 1회)
+            self.instances = [self.host.instances[0]]
+        elif self.shared_instance:
+            self.instances = [vlc.Instance(*self.vlc_args)]
+        else:
+            self.instances = [None] * self.pool_size
+        self.players = [None] * self.pool_size
+        for idx in ([self.active_player_id] if self.lazy_players else range(self.pool_size)):
+            self.ensure_player(idx)
+
+    def ensure_player(self, idx):
+        """슬롯의 VLC 플레이어 반환 (없으면 생성)"""
+        player = self.players[idx]
+        if player is not None:
+            return player
+        if self.shared_instance:
+            instance = self.instances[0]
+        else:
+            if self.instances[idx] is None:
+                self.instances[idx] = vlc.Instance(*self.vlc_args)
+            instance = self.instances[idx]
+        player = instance.media_player_new()
+        if sys.platform == "win32":
             player.set_hwnd(int(self.player_widgets[idx].winId()))
-            player.audio_output_device_set(None, self.pstatus.get("device", {}).get("audiodevice", "default"))
-            player.audio_set_volume(100)
+        else:
+            player.set_xwindow(int(self.player_widgets[idx].winId()))
+        player.audio_output_device_set(None, self.audio_device_id)
+        player.audio_set_volume(100)
+        player.set_fullscreen(self.fullscreen)
+        self.players[idx] = player
+        self.players_created += 1
+        self.attach_player_events(idx, player)
+        self.telemetry.attach(idx, player)
+        return player
+
+    def is_playing(self, idx):
+        player = self.players[idx]
+        return player is not None and bool(player.is_playing())
+
+    def preparse_instance(self):
+        """preparse에 사용할 libVLC 인스턴스"""
+        return next((instance for instance in self.instances if instance is not None), None)
 
     def init_players_events(self):
-        """VLC 플레이어 이벤트 핸들러 등록"""
+        """VLC 플레이어 이벤트 핸들러 등록 (콜백은 이벤트 펌프에 넣기만 하고 GUI 스레드에서 처리)"""
         try:
-            def make_handler(func, *args):
-                def handler(event):
-                    try:
-                        func(*args, event)
-                    except Exception as e:
-                        print(f"Error in handler: {e}")
-                return handler
-            for idx, player in enumerate(self.players):
-                em = player.event_manager()
-                em.event_detach(vlc.EventType.MediaPlayerEndReached)
-                em.event_attach(
-                    vlc.EventType.MediaPlayerEndReached,
-                    make_handler(self.on_end_reached, idx)
-                )
-                em.event_attach(
-                    vlc.EventType.MediaPlayerEncounteredError,
-                    lambda event, id=idx: self.print("error", f"Player {id} encountered an error.")
-                )
-                for event_type in [
-                    vlc.EventType.MediaPlayerTimeChanged,
-                    vlc.EventType.MediaPlayerPlaying,
-                    vlc.EventType.MediaPlayerPaused,
-                    vlc.EventType.MediaPlayerStopped,
-                ]:
-                    em.event_attach(
-                        event_type,
-                        make_handler(self.update_player_data, idx)
-                    )
+            pump = self.event_pump
+            pump.register("end_reached", self.on_end_reached)
+            pump.register("error", lambda id, _: self.print("error", f"Player {id} encountered an error."))
+            # 텔레메트리: 시간/길이는 이벤트 값 사용, 정적 필드는 관련 이벤트에서만 갱신
+            pump.register("time_changed", self.on_time_changed, dedupe=True)
+            pump.register("length_changed", self.telemetry.on_length_changed, dedupe=True)
+            pump.register("playing", self.on_playing)
+            pump.register("paused", self.on_paused)
+            pump.register("stopped", self.on_stopped)
+            pump.register("media_changed", self.on_media_changed)
+            pump.register("volume_changed", lambda id, name: self.telemetry.refresh(id, ("volume",), event=name), dedupe=True)
         except Exception as e:
             self.print("error", f"Error initializing player events: {e}")
+
+    def on_playing(self, idx, event):
+        self.telemetry.on_state_changed(idx, event, 1)
+        self.quality.start(idx, self.players[idx], self.current_files[idx])
+        self.sync_start.on_playing(idx)
+        position = self.resume_seek.pop(idx, None)
+        if position is not None and self.players[idx] is not None:
+            # 체크포인트 재개: 저장된 위치로 이동
+            self.players[idx].set_time(position)
+
+    def on_time_changed(self, idx, new_time):
+        self.telemetry.on_time_changed(idx, new_time)
+        player = self.players[idx]
+        if self.playlist_scheduler.current is not None and player is not None:
+            self.playlist_scheduler.on_time(idx, new_time, player.get_length())
+
+    def on_paused(self, idx, event):
+        self.telemetry.on_state_changed(idx, event, 0)
+        self.playlist_scheduler.on_paused(idx)
+
+    def on_stopped(self, idx, event):
+        self.telemetry.on_state_changed(idx, event, 0)
+        self.quality.finish(idx, "stopped")
+
+    def on_media_changed(self, idx, event):
+        self.quality.finish(idx, "media_changed")
+        self.telemetry.refresh(idx, ("media", "duration"), event=event)
+
+    def attach_player_events(self, idx, player):
+        """플레이어의 VLC 이벤트를 이벤트 펌프에 연결"""
+        try:
+            pump = self.event_pump
+            event_name = lambda event: str(event.type)
+            em = player.event_manager()
+            em.event_detach(vlc.EventType.MediaPlayerEndReached)
+            for event_type, kind, extract in [
+                (vlc.EventType.MediaPlayerEndReached, "end_reached", event_name),
+                (vlc.EventType.MediaPlayerEncounteredError, "error", None),
+                (vlc.EventType.MediaPlayerTimeChanged, "time_changed", lambda event: event.u.new_time),
+                (vlc.EventType.MediaPlayerLengthChanged, "length_changed", lambda event: event.u.new_length),
+                (vlc.EventType.MediaPlayerPlaying, "playing", event_name),
+                (vlc.EventType.MediaPlayerPaused, "paused", event_name),
+                (vlc.EventType.MediaPlayerStopped, "stopped", event_name),
+                (vlc.EventType.MediaPlayerMediaChanged, "media_changed", event_name),
+                (vlc.EventType.MediaPlayerAudioVolume, "volume_changed", event_name),
+            ]:
+                pump.attach(em, event_type, idx, kind, extract)
+        except Exception as e:
+            self.print("error", f"Error attaching events for player {idx}: {e}")
         
     def update_active_player_id(self, idx):
         """활성 플레이어 인덱스 갱신"""
         self.active_player_id = idx
+        self.slot_pool.touch(idx)
         self.print("active_player_id", { "value": self.active_player_id })
+        self.checkpoint_changed()
         
     # =========================
     # 미디어/플레이어 제어
@@ -618,6 +1320,8 @@ class Player(QMainWindow):
             self.print("error", "Invalid media path provided.")
             return
 
+        # 전환 중인 슬롯이면 전환을 먼저 끝낸다
+        self.transitions.release(idx)
         # Update the current file for the player
         self.current_files[idx] = file
 
@@ -626,16 +1330,28 @@ class Player(QMainWindow):
                 # Efficiently display image
                 self.display_image(file, idx)
             else:
-                # Only set media if it's different from current
-                current_media = self.players[idx].get_media()
-                if not current_media or current_media.get_mrl() != media_path:
-                    media = self.players[idx].get_instance().media_new(media_path)
-                    self.players[idx].set_media(media)
-                self.print('media_changed', { "idx": idx, "uuid": file.get("uuid", ""), "path": media_path })
+                # Only set media if it's different from current (MRL 기준 비교)
+                mrl = to_mrl(media_path)
+                if self.current_mrls[idx] != mrl:
+                    player = self.ensure_player(idx)
+                    media = self.media_cache.media_for(player.get_instance(), media_path)
+                    player.set_media(media)
+                    self.current_mrls[idx] = mrl
+                message = { "idx": idx, "uuid": file.get("uuid", ""), "path": media_path }
+                metadata = self.media_cache.metadata(media_path)
+                if metadata:
+                    message["metadata"] = metadata
+                self.print('media_changed', message)
                 self.update_player_data(idx, None)
         except Exception as e:
             self.print("error", f"Error setting media: {e}")
             
+    def on_media_metadata(self, path, metadata):
+        """media_changed 이후에 끝난 preparse 결과를 그 미디어가 로드된 슬롯에 알림"""
+        for idx, file in enumerate(self.current_files):
+            if not file.get("is_image", True) and file.get("path") == path:
+                self.print("media_metadata", { "idx": idx, "uuid": file.get("uuid", ""), "path": path, "metadata": metadata })
+
     def play(self, idx=0):
         """플레이어 재생"""
         if self.active_player_id != idx:
@@ -647,7 +1363,7 @@ class Player(QMainWindow):
             return
         else:
             # 미디어 재생
-            self.players[idx].play()
+            self.ensure_player(idx).play()
 
         # 해당 플레이어의 위젯이 숨김 상태면 활성화 하기
         if not self.player_widgets[idx].isVisible():
@@ -656,6 +1372,7 @@ class Player(QMainWindow):
 
     def play_id(self, file):
         """특정 파일 재생"""
+        self.playlist_scheduler.disarm("play_id")
         idx = self.active_player_id
 
         # Determine next available player index if current is busy
@@ -663,12 +1380,12 @@ class Player(QMainWindow):
             self.print("error", "Player or widget list is not properly initialized.")
             return
 
-        if idx not in [0, 1]:
+        if idx < 0 or idx >= len(self.players):
             self.print("error", f"Invalid player index: {idx}")
             return
 
-        if self.players[idx].is_playing() or (self.player_widgets[idx].isVisible() and self.player_widgets[idx].pixmap()):
-            idx = 1 if idx == 0 else 0
+        if self.is_playing(idx) or (self.player_widgets[idx].isVisible() and self.player_widgets[idx].pixmap()):
+            idx = self.slot_pool.recycle(exclude={idx})
 
         if idx < 0 or idx >= len(self.players):
             self.print("error", f"play_id: idx {idx} out of range for players list.")
@@ -676,19 +1393,25 @@ class Player(QMainWindow):
 
         # set Media file for the player
         self.set_media(file, idx)
+        self.slot_pool.assign(idx, None)
         self.update_active_player_id(idx)
 
         try:
             if file.get("is_image") == False:
-                self.players[idx].play()
+                self.ensure_player(idx).play()
             self.fade_transition(idx)
         except Exception as e:
             self.print("error", f"Error playing file: {e}")
 
-    def on_end_reached(self, idx, event):
-        """재생 종료 이벤트 처리"""
+    def on_end_reached(self, idx, event=None):
+        """재생 종료 이벤트 처리 (event: 이벤트 이름, 이미지 타이머는 None)"""
         try:
+            if event is not None:
+                self.quality.finish(idx, "end_reached")
             self.update_player_data(idx, event)
+            if event is not None and self.playlist_scheduler.on_end_reached(idx):
+                # 플레이어 안에서 다음 트랙으로 넘어감 (Node의 next 왕복 없음)
+                return
             self.print('end_reached', {
                 "playlist_track_index": self.track_index,
                 "active_player_id": self.active_player_id,
@@ -702,44 +1425,36 @@ class Player(QMainWindow):
         if idx < 0 or idx >= len(self.players):
             self.print("error", f"Invalid player index: {idx}")
             return
-        self.players[self.active_player_id].pause()
+        player = self.players[self.active_player_id]
+        if player is not None:
+            player.pause()
             
     def stop(self, idx=None):
         """플레이어 정지"""
         if idx is None:
             idx = self.active_player_id
+        if idx == self.active_player_id:
+            self.playlist_scheduler.disarm("stop")
+        self.transitions.release(idx)
         if self.current_files[idx].get("is_image", True):
             self.stop_image(idx)
-        else:
+        elif self.players[idx] is not None:
             self.players[idx].stop()
         self.player_widgets[idx].setVisible(False)
         self.player_widgets[idx].lower()
 
     def stop_all(self):
         """모든 플레이어 정지"""
+        self.playlist_scheduler.disarm("stop_all")
+        self.sync_start.cancel("stop_all")
         for idx in range(len(self.player_widgets)):
             self.stop(idx)
         self.update_logo()
                     
-    def update_player_data(self, id, event):
-        """플레이어 상태 정보 갱신"""
+    def update_player_data(self, id, event=None):
+        """플레이어 상태 정보 전체 갱신 (즉시 전송, event: 이벤트 이름)"""
         try:
-            player = self.players[id]
-            media = player.get_media()
-            data = {
-                "id": id,
-                "event": str(event.type if event else "None"),
-                "media": media.get_mrl() if media else "No media",
-                "state": str(player.get_state()),
-                "time": player.get_time(),
-                "duration": player.get_length(),
-                "position": player.get_position(),
-                "volume": player.audio_get_volume(),
-                "rate": player.get_rate(),
-                "is_playing": player.is_playing(),
-                "fullscreen": player.get_fullscreen(),
-            }
-            self.print("player_data", data)
+            self.telemetry.refresh(id, TELEMETRY_FIELDS, event=event or "None", immediate=True)
         except Exception as e:
             self.print("error", f"Error updating player data: {e}")
 
@@ -752,10 +1467,21 @@ class Player(QMainWindow):
             return
 
         try:
-            self.players[idx].set_time(time)
+            self.ensure_player(idx).set_time(time)
         except Exception as e:
             self.print("error", f"Error setting time for player {idx}: {e}")
 
+    def set_volume(self, volume, idx=None):
+        """플레이어 볼륨 설정 (0~200)"""
+        idx = self.active_player_id if idx is None else idx
+        if idx < 0 or idx >= len(self.players):
+            self.print("error", f"Invalid player index: {idx}")
+            return
+        try:
+            self.ensure_player(idx).audio_set_volume(max(0, min(200, volume)))
+        except Exception as e:
+            self.print("error", f"Error setting volume for player {idx}: {e}")
+
     # =========================
     # 플레이리스트/트랙 관리
     # =========================
@@ -763,15 +1489,91 @@ class Player(QMainWindow):
         """플레이리스트 모드 설정"""
         self.print("debug", f"Setting playlist mode to: {value}")
         self.playlist_mode = value
+        if not value:
+            self.playlist_scheduler.disarm("playlist_mode")
+
+    def set_repeat(self, mode):
+        """반복 모드 (none/all/repeat_one). 자동 진행의 다음 트랙 선택에 사용"""
+        self.repeat = mode
+        self.playlist_scheduler.retarget("repeat")
+        self.print("debug", f"Repeat mode set to: {mode}")
         
-    def set_tracks(self, tracks):
-        """트랙 리스트 설정"""
+    def set_tracks(self, tracks, version=None):
+        """트랙 리스트 설정 (전체 동기화)"""
         if not isinstance(tracks, list):
             self.print("error", "Invalid tracks format, expected a list.")
             return
 
-        self.tracks = tracks
-            
+        current_uuid = self.current_track_uuid()
+        self.playlist.set(tracks, version)
+        self.tracks = self.playlist.tracks
+        self.on_tracks_changed(current_uuid)
+
+    def patch_tracks(self, ops, base_version, version):
+        """트랙 리스트 부분 수정 (uuid 기준 insert/remove/move/update)"""
+        if not isinstance(ops, list):
+            self.print("error", "Invalid playlist patch, expected a list of ops.")
+            return
+        if base_version != self.playlist.version:
+            self.request_playlist_resync(f"version mismatch (player {self.playlist.version}, patch base {base_version})")
+            return
+        current_uuid = self.current_track_uuid()
+        try:
+            changes = self.playlist.apply(ops)
+        except (PlaylistPatchError, TypeError, ValueError) as e:
+            # 패치는 되돌려졌지만 Node와 목록이 달라졌으므로 전체 재동기화
+            self.request_playlist_resync(f"patch failed: {e}")
+            return
+        self.playlist.version = version if version is not None else base_version + 1
+        self.on_tracks_changed(current_uuid, patched=True, changes=changes)
+
+    def request_playlist_resync(self, reason):
+        self.playlist.resyncs += 1
+        self.print("playlist_resync", { "version": self.playlist.version, "reason": reason })
+
+    def current_track_uuid(self):
+        if 0 <= self.track_index < len(self.tracks) and isinstance(self.tracks[self.track_index], dict):
+            return self.tracks[self.track_index].get("uuid")
+        return None
+
+    def on_tracks_changed(self, current_uuid, patched=False, changes=None):
+        """트랙 목록 변경 후 현재 트랙 인덱스/슬롯 매핑 갱신. 다음 트랙이 바뀐 경우에만 다시 로드
+        changes: 패치의 (추가된 트랙, 빠진 트랙). None이면 전체 교체"""
+        index = self.playlist.index_of(current_uuid)
+        if index is None and patched and current_uuid and self.tracks:
+            # 재생 중인 트랙이 삭제됨: 그 자리에 온 트랙이 다음 트랙이 되도록 한 칸 앞을 현재 위치로
+            index = (self.track_index - 1) % len(self.tracks)
+        elif index is None:
+            index = min(self.track_index, max(len(self.tracks) - 1, 0))
+        if index != self.track_index:
+            self.track_index = index
+            self.print("track_index", { "value": self.track_index })
+
+        # 슬롯에 로드된 파일을 uuid로 찾아 새 인덱스로 기록 (경로가 바뀐 트랙은 매핑 해제)
+        # 경로가 같으면 다시 로드하지 않고 트랙 정보(이미지 표시 시간 등)만 새 값으로 교체
+        def track_of_slot(slot, old_index):
+            file = self.current_files[slot]
+            new_index = self.playlist.index_of(file.get("uuid"))
+            if new_index is None or self.tracks[new_index].get("path") != file.get("path"):
+                return None
+            self.current_files[slot] = self.tracks[new_index]
+            return new_index
+        self.slot_pool.remap(track_of_slot)
+
+        # 플레이리스트의 비디오/오디오만 vlc.Media 유지 및 백그라운드 preparse (패치는 바뀐 트랙만)
+        if changes is None:
+            media_paths = media_paths_of(self.tracks)
+            self.media_cache.retain(media_paths, self.output)
+        else:
+            media_paths = media_paths_of(changes[0])
+            self.media_cache.update(media_paths, media_paths_of(changes[1]), self.output)
+        if self.preparse_instance() and media_paths:
+            self.media_cache.preparse(self.preparse_instance(), media_paths)
+        self.print("tracks_version", { "version": self.playlist.version, "count": len(self.tracks) })
+        if self.playlist_mode and self.tracks and self.vlc_ready:
+            self.next_file_load()
+        self.playlist_scheduler.retarget("tracks_changed")
+
     def update_track_index(self, idx):
         """트랙 인덱스 갱신"""
         if idx < 0 or idx >= len(self.tracks):
@@ -779,6 +1581,8 @@ class Player(QMainWindow):
             return
         self.track_index = idx
         self.print("track_index", { "value": self.track_index })
+        self.prefetch_images()
+        self.checkpoint_changed()
 
     def playlist_play(self, idx = 0):
         """플레이리스트 재생"""
@@ -786,17 +1590,142 @@ class Player(QMainWindow):
             if idx < 0 or idx >= len(self.tracks):
                 self.print("error", f"Invalid playlist index: {idx}")
                 return
-            self.update_track_index(idx)
-        if not self.tracks or self.track_index >= len(self.tracks):
+        else:
+            idx = self.track_index
+        if not self.tracks or idx >= len(self.tracks):
             self.print("error", "Playlist is empty or index out of range.")
             return
-
-        file = self.tracks[self.track_index]
-        self.play_id(file)
+        self.play_track(idx)
+
+    def track_slot(self, track_index):
+        """트랙이 준비된 슬롯 반환. lookahead 창 밖의 트랙은 가장 오래된 슬롯에 바로 로드"""
+        file = self.tracks[track_index]
+        slot = self.slot_pool.find(track_index, exclude={self.active_player_id})
+        if slot is None or not self.slot_ready(slot, file):
+            if slot is None:
+                slot = self.slot_pool.recycle(exclude={self.active_player_id})
+            self.set_media(file, slot)
+            self.slot_pool.assign(slot, track_index)
+            self.print("debug", f"Track {track_index} loaded on demand into slot {slot}")
+        return slot
+
+    def play_track(self, track_index):
+        """플레이리스트 트랙 재생. 미리 로드된 슬롯이 있으면 바로 전환"""
+        # 자동 진행용으로 준비 중이던 슬롯을 먼저 풀어 둔다
+        self.playlist_scheduler.cancel_pending("manual")
+        slot = self.track_slot(track_index)
+        try:
+            if not self.current_files[slot].get("is_image"):
+                self.ensure_player(slot).play()
+            self.fade_transition(slot)
+        except Exception as e:
+            self.print("error", f"Error playing track {track_index}: {e}")
+        self.update_track_index(track_index)
         # set next track load next player
         self.next_file_load()
-        self.image_timer()
-            
+        self.arm_track(slot, track_index)
+
+    def play_at(self, at, file=None, track=None, offset=0.0, id=""):
+        """at(보낸 쪽 시계 epoch ms, offset 보정)에 파일 또는 플레이리스트 트랙 재생 시작"""
+        deadline = self.sync_start.deadline(at, offset)
+        if track is not None:
+            if not self.tracks or track < 0 or track >= len(self.tracks):
+                self.print("error", f"play_at: invalid track index: {track}")
+                return
+            if self.image_timer_instance.isActive():
+                self.image_timer_instance.stop()
+            slot = self.track_slot(track)
+            on_start = lambda: self.start_scheduled_track(slot, track)
+        elif file:
+            slot = self.slot_pool.recycle(exclude={self.active_player_id})
+            self.set_media(file, slot)
+            self.slot_pool.assign(slot, None)
+            # 단일 파일 모드의 이미지는 set_media에서 바로 보이므로 시작 시각까지 숨긴다
+            widget = self.player_widgets[slot]
+            if widget.isVisible() and slot != self.active_player_id:
+                widget.setVisible(False)
+                widget.layout_dirty = True
+            on_start = lambda: self.start_scheduled_file(slot)
+        else:
+            self.print("error", "play_at requires a file or a track index.")
+            return
+        player = None if self.current_files[slot].get("is_image", True) else self.ensure_player(slot)
+        self.sync_start.schedule(id, slot, at, deadline, player=player, on_start=on_start)
+
+    def next_at(self, at, offset=0.0, id=""):
+        """at에 플레이리스트 다음 트랙 재생 시작"""
+        if not self.playlist_mode or not self.tracks:
+            self.print("error", "next_at can only be used in playlist mode.")
+            return
+        self.play_at(at, track=self.next_track_index % len(self.tracks), offset=offset, id=id)
+
+    def start_scheduled_track(self, slot, track_index):
+        """예약된 플레이리스트 트랙 전환 (deadline 시점, 시작 오차가 의미 있도록 cut)"""
+        self.fade_transition(slot, mode="cut")
+        self.update_track_index(track_index)
+        self.next_file_load()
+        self.arm_track(slot, track_index)
+
+    def start_scheduled_file(self, slot):
+        """예약된 단일 파일 전환 (deadline 시점)"""
+        self.playlist_scheduler.disarm("play_at")
+        self.fade_transition(slot, mode="cut")
+
+    def arm_track(self, slot, track_index, chained=False):
+        """현재 트랙의 종료 시각 관리 시작 (자동 진행이 꺼져 있으면 기존 이미지 타이머)"""
+        if not self.scheduler_enabled or not self.playlist_mode:
+            self.image_timer()
+            return
+        if self.image_timer_instance.isActive():
+            self.image_timer_instance.stop()
+        file = self.current_files[slot]
+        if file.get("is_image", True):
+            self.playlist_scheduler.arm(track_index, slot, "image", self.image_show_time(file), chained)
+        else:
+            player = self.players[slot]
+            length = player.get_length() if player is not None else 0
+            self.playlist_scheduler.arm(track_index, slot, "video", length / 1000 if length > 0 else None, chained)
+
+    def auto_next_track(self):
+        """
+        자동 진행의 다음 트랙 (반복 모드 적용). 없으면 None (Node가 end_reached로 처리)
+        player가 아는 모드(none/all/repeat_one)만 처리하고 single 등 나머지는 Node에 맡긴다
+        """
+        if not self.playlist_mode or not self.tracks:
+            return None
+        if self.repeat == "repeat_one":
+            return min(self.track_index, len(self.tracks) - 1)
+        if self.repeat not in ("none", "all"):
+            return None
+        if self.track_index + 1 < len(self.tracks):
+            return self.track_index + 1
+        return 0 if self.repeat == "all" else None
+
+    def prepare_auto_track(self, track_index):
+        """자동 진행 대상 트랙을 현재 슬롯이 아닌 슬롯에 준비"""
+        slot = self.track_slot(track_index)
+        player = None if self.current_files[slot].get("is_image", True) else self.ensure_player(slot)
+        return slot, player
+
+    def start_auto_track(self, slot, track_index):
+        """자동 진행 전환 (deadline 시점)"""
+        self.fade_transition(slot)
+        self.update_track_index(track_index)
+        self.next_file_load()
+        self.arm_track(slot, track_index, chained=True)
+
+    def clock_sync(self, t0, id=""):
+        """시계 오프셋 핸드셰이크: t0(보낸 쪽 전송 시각)에 이 PC 시계(t1)를 붙여 응답"""
+        self.print("clock_sync", { "id": id, "t0": t0, "t1": wall_ms() })
+
+    def slot_ready(self, slot, file):
+        """슬롯에 해당 파일이 재생 가능한 상태로 로드되어 있는지"""
+        if self.current_files[slot].get("path") != file.get("path"):
+            return False
+        if file.get("is_image", True):
+            return getattr(self.player_widgets[slot], 'original_image', None) is not None
+        return self.current_mrls[slot] == to_mrl(file.get("path", ""))
+
     def next(self):
         """다음 트랙 재생"""
         if not self.playlist_mode:
@@ -807,14 +1736,10 @@ class Player(QMainWindow):
             self.image_timer_instance.stop()
             self.print("debug", "Existing image timer stopped.")
 
-        if not self.current_files[self.next_player_index].get("is_image"):
-            self.players[self.next_player_index].play()
-
-        self.fade_transition(self.next_player_index)
-        self.track_index = self.next_track_index  # Update track_index for image playback
-        self.update_track_index(self.track_index)
-        self.next_file_load()
-        self.image_timer()
+        if not self.tracks:
+            self.print("error", "Playlist is empty.")
+            return
+        self.play_track(self.next_track_index % len(self.tracks))
 
     def previous(self):
         """이전 트랙 재생"""
@@ -822,7 +1747,7 @@ class Player(QMainWindow):
             self.print("error", "Previous track can only be used in playlist mode.")
             return
 
-        if self.players[self.active_player_id].get_time() > 5000:
+        if self.players[self.active_player_id] is not None and self.players[self.active_player_id].get_time() > 5000:
             self.players[self.active_player_id].set_time(0)
             return
 
@@ -830,16 +1755,21 @@ class Player(QMainWindow):
             self.image_timer_instance.stop()
             self.print("debug", "Existing image timer stopped.")
 
+        if not self.tracks:
+            self.print("error", "Playlist is empty.")
+            return
         # Calculate previous track index
-        self.track_index -= 1
-        if self.track_index < 0:
-            self.track_index = len(self.tracks) - 1
+        previous_index = self.track_index - 1
+        if previous_index < 0:
+            previous_index = len(self.tracks) - 1
 
-        self.playlist_play(self.track_index)
+        self.play_track(previous_index)
 
     def next_file_load(self, idx=None):
-        """다음 파일 미리 로드"""
+        """다음 파일 미리 로드: 다음 lookahead개 트랙을 슬롯에 준비"""
         self.print("warn", f"Current track index: {self.track_index}, Next track index: {self.next_track_index}")
+        if not self.tracks:
+            return
 
         if idx is not None:
             self.next_track_index = idx
@@ -849,8 +1779,56 @@ class Player(QMainWindow):
         if self.next_track_index >= len(self.tracks):
             self.next_track_index = 0
 
-        self.next_player_index = 1 if self.active_player_id == 0 else 0
-        self.set_media(self.tracks[self.next_track_index], self.next_player_index)
+        self.prefetch_images()
+        self.preparse_upcoming()
+        # 전환 중인(페이드 아웃 중인) 슬롯은 전환이 끝난 뒤 로드 (resume_preload)
+        busy = self.transitions.busy_slots()
+        keep = {self.active_player_id}
+        self.preload_deferred = False
+        for offset in range(min(self.lookahead, len(self.tracks))):
+            track_index = (self.next_track_index + offset) % len(self.tracks)
+            file = self.tracks[track_index]
+            slot = self.slot_pool.find(track_index, exclude=keep)
+            if slot is None or not self.slot_ready(slot, file):
+                if slot is None:
+                    slot = self.slot_pool.recycle(exclude=keep | busy)
+                if slot is None:
+                    self.preload_deferred = bool(busy)
+                    break
+                self.set_media(file, slot)
+                self.slot_pool.assign(slot, track_index)
+            keep.add(slot)
+        next_slot = self.slot_pool.find(self.next_track_index, exclude={self.active_player_id})
+        if next_slot is not None:
+            self.next_player_index = next_slot
+
+    def resume_preload(self):
+        """전환이 끝나 비워진 슬롯에 미룬 다음 트랙 로드"""
+        if not self.preload_deferred or not self.playlist_mode or not self.tracks:
+            return
+        self.next_file_load(self.next_track_index)
+
+    def preparse_upcoming(self, count=3):
+        """다음 트랙들의 미디어를 우선 preparse"""
+        if not self.tracks or not self.preparse_instance():
+            return
+        paths = []
+        for offset in range(1, min(count, len(self.tracks)) + 1):
+            track = self.tracks[(self.track_index + offset) % len(self.tracks)]
+            if not track.get("is_image", True) and track.get("path"):
+                paths.append(track["path"])
+        self.media_cache.preparse(self.preparse_instance(), paths, priority=True)
+
+    def prefetch_images(self):
+        """현재 트랙 이후 image_prefetch개 트랙 중 이미지를 미리 디코딩"""
+        if not self.tracks or self.image_prefetch <= 0:
+            return
+        paths = []
+        for offset in range(1, min(self.image_prefetch, len(self.tracks)) + 1):
+            track = self.tracks[(self.track_index + offset) % len(self.tracks)]
+            if track.get("is_image") and track.get("path"):
+                paths.append(track["path"])
+        self.image_cache.prefetch(paths)
 
 if __name__ == "__main__":
     vp_pstatus_json = os.environ.get("VP_PSTATUS")
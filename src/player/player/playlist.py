@@ -0,0 +1,158 @@
+# =========================
+# 플레이리스트 트랙 목록 및 패치
+# =========================
+#
+# Node는 편집할 때마다 전체 트랙 목록(set_tracks)을 보내는 대신
+# uuid 기준 패치(patch_tracks)를 버전 번호와 함께 보낸다.
+# - insert : {"op": "insert", "index": 3, "track": {...}}   (index 생략 시 끝에 추가)
+# - remove : {"op": "remove", "uuid": "..."}
+# - move   : {"op": "move", "uuid": "...", "index": 0}
+# - update : {"op": "update", "uuid": "...", "fields": {"time": 10}}
+# uuid → index 맵은 위치가 밀려난 구간만 다시 계산한다 (move는 두 위치 사이, update는 그 위치만).
+# base_version이 현재 버전과 다르면 패치를 적용하지 않고 전체 재동기화를 요청한다.
+# op 하나라도 실패하면 패치 전체를 되돌린다 (일부만 적용된 목록이 남지 않도록).
+
+
+OPS = ("insert", "remove", "move", "update")
+
+
+class PlaylistPatchError(ValueError):
+    pass
+
+
+class Playlist:
+    def __init__(self):
+        self.tracks = []
+        self.version = 0
+        self.uuid_index = {}
+        self.patches = 0
+        self.ops = 0
+        self.resyncs = 0
+
+    def set(self, tracks, version=None):
+        """전체 트랙 목록 교체"""
+        self.tracks = tracks
+        self.version = self.version + 1 if version is None else version
+        self.uuid_index = {}
+        self.reindex(0)
+
+    def reindex(self, start, end=None):
+        """start..end 위치 트랙의 uuid → index 갱신 (중복 uuid는 앞쪽 위치)"""
+        end = len(self.tracks) if end is None else min(end, len(self.tracks))
+        for index in range(start, end):
+            uuid = uuid_of(self.tracks[index])
+            if not uuid:
+                continue
+            current = self.uuid_index.get(uuid)
+            # 비어 있거나, 뒤쪽 위치이거나, 밀려나서 다른 트랙을 가리키는 값이면 교체
+            if current is None or current > index or uuid_of(self.tracks[current]) != uuid:
+                self.uuid_index[uuid] = index
+
+    def forget(self, index):
+        """index 위치 트랙의 uuid → index 제거 (트랙을 빼거나 교체하기 전)"""
+        uuid = uuid_of(self.tracks[index])
+        if uuid and self.uuid_index.get(uuid) == index:
+            del self.uuid_index[uuid]
+
+    def index_of(self, uuid):
+        return self.uuid_index.get(uuid) if uuid else None
+
+    def apply(self, ops):
+        """
+        패치 적용 후 (추가된 트랙 목록, 빠진 트랙 목록) 반환. 적용할 수 없는 op가 있으면 PlaylistPatchError
+        중간 op가 실패하면 앞서 적용한 op를 되돌려 패치 전 상태로 남긴다
+        """
+        added, removed, journal = [], [], []
+        try:
+            for op in ops:
+                self.apply_op(op, added, removed, journal)
+        except Exception:
+            for undo in reversed(journal):
+                undo()
+            raise
+        self.ops += len(ops)
+        self.patches += 1
+        return added, removed
+
+    def apply_op(self, op, added, removed, journal):
+        """op 하나 적용. 바뀐 위치의 uuid → index를 바로 다시 계산 (이후 op가 uuid로 찾을 수 있도록)
+        update는 이전 트랙이 빠지고 새 트랙이 추가된 것으로 기록한다. journal에 되돌리는 함수를 쌓는다"""
+        kind = op.get("op")
+        if kind not in OPS:
+            raise PlaylistPatchError(f"Unknown playlist op: {kind}")
+        if kind == "insert":
+            track = op.get("track")
+            if not isinstance(track, dict):
+                raise PlaylistPatchError("insert requires a track object")
+            index = op.get("index")
+            index = len(self.tracks) if index is None else int(index)
+            if index < 0 or index > len(self.tracks):
+                raise PlaylistPatchError(f"insert index out of range: {index}")
+            self.insert_at(index, track)
+            journal.append(lambda: self.pop_at(index))
+            added.append(track)
+            return
+        index = self.require(op.get("uuid"))
+        if kind == "remove":
+            track = self.pop_at(index)
+            journal.append(lambda: self.insert_at(index, track))
+            removed.append(track)
+            return
+        if kind == "move":
+            to_index = int(op.get("index", -1))
+            if to_index < 0 or to_index >= len(self.tracks):
+                raise PlaylistPatchError(f"move index out of range: {to_index}")
+            self.move(index, to_index)
+            journal.append(lambda: self.move(to_index, index))
+            return
+        if kind == "update":
+            fields = op.get("fields")
+            if not isinstance(fields, dict):
+                raise PlaylistPatchError("update requires a fields object")
+            # 트랙 dict는 교체 (슬롯에 로드된 이전 트랙 정보와 비교할 수 있도록)
+            previous = self.replace_at(index, {**self.tracks[index], **fields})
+            journal.append(lambda: self.replace_at(index, previous))
+            removed.append(previous)
+            added.append(self.tracks[index])
+
+    # ---------- 위치 변경 (밀려난 구간만 다시 계산) ----------
+    def insert_at(self, index, track):
+        self.tracks.insert(index, track)
+        self.reindex(index)
+
+    def pop_at(self, index):
+        self.forget(index)
+        track = self.tracks.pop(index)
+        self.reindex(index)
+        return track
+
+    def move(self, index, to_index):
+        self.forget(index)
+        self.tracks.insert(to_index, self.tracks.pop(index))
+        self.reindex(min(index, to_index), max(index, to_index) + 1)
+
+    def replace_at(self, index, track):
+        previous = self.tracks[index]
+        self.forget(index)
+        self.tracks[index] = track
+        self.reindex(index, index + 1)
+        return previous
+
+    def require(self, uuid):
+        index = self.index_of(uuid)
+        if index is None:
+            raise PlaylistPatchError(f"Track not found: {uuid}")
+        return index
+
+    def stats(self):
+        return {
+            "version": self.version,
+            "tracks": len(self.tracks),
+            "patches": self.patches,
+            "ops": self.ops,
+            "resyncs": self.resyncs,
+        }
+
+
+def uuid_of(track):
+    return track.get("uuid") if isinstance(track, dict) else None
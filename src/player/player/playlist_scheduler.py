@@ -0,0 +1,256 @@
+import time
+from PySide6.QtCore import QObject, QTimer, Qt
+from metrics import Histogram
+
+# =========================
+# 플레이리스트 자동 진행 (deadline 기준)
+# =========================
+#
+# Node 왕복(end_reached → next) 없이 플레이어 안에서 다음 트랙으로 넘어간다.
+# - 현재 트랙의 끝 시각(deadline)을 monotonic 시계로 관리
+#   이미지: 이전 트랙의 예정 종료 시각 + 표시 시간 (매 트랙 타이머를 다시 시작하지 않아 누적 오차 없음)
+#   비디오: time_changed 이벤트마다 (길이 - 현재 시간)으로 다시 계산
+# - deadline - preroll_ms에 다음 트랙을 준비하고, deadline에 StartScheduler로 전환 (sync_start.py와 같은 pre-roll)
+# - 다음 트랙은 target()이 정한다 (반복 모드 none/all/repeat_one은 플레이어가 적용)
+#   다음 트랙이 없으면 이미지는 deadline에 expire(slot), 비디오는 VLC end_reached를 그대로 Node로 보낸다
+# - 전환마다 advance_report 전송
+#   gap_ms   : 이전 트랙 종료(deadline) → 다음 트랙 표시 (비디오는 playing 이벤트)
+#   drift_ms : 실제 시작 - 예정 시작 (수동 재생 이후 이어진 예정 시각 누적 기준)
+
+
+class ArmedTrack:
+    """현재 트랙의 예정 시각"""
+
+    def __init__(self, track, slot, kind, ideal_start, duration_s=None):
+        self.track = track
+        self.slot = slot
+        self.kind = kind
+        self.ideal_start = ideal_start
+        self.ideal_end = ideal_start + duration_s if duration_s else None
+        # 예상 종료 시각 (이미지는 예정 종료 시각과 같음)
+        self.end = self.ideal_end if kind == "image" else None
+        self.paused = False
+
+
+class PlaylistScheduler(QObject):
+    def __init__(self, starter, emit, target, prepare, start, expire, preroll_ms=300, parent=None):
+        super().__init__(parent)
+        # StartScheduler (pre-roll 및 deadline 전환)
+        self.starter = starter
+        self.emit = emit
+        # target() → 다음 트랙 인덱스 또는 None
+        self.target = target
+        # prepare(track) → (슬롯, VLC 플레이어 또는 None)
+        self.prepare = prepare
+        # start(slot, track): deadline 시점 화면 전환
+        self.start = start
+        # expire(slot): 다음 트랙이 없는 이미지의 표시 시간 종료
+        self.expire = expire
+        self.preroll_ms = preroll_ms
+        self.current = None
+        # 준비 중인 다음 트랙 / 전환 후 보고를 기다리는 트랙
+        self.pending = None
+        self.reporting = None
+        self.expiring = False
+        # 방금 넘어간 슬롯 (뒤늦게 도착한 end_reached 무시)
+        self.retired = set()
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.timeout.connect(self.on_timer)
+        self.gap_ms = Histogram()
+        self.advanced = 0
+        self.late = 0
+        self.cancelled = 0
+        self.forced = 0
+        self.last = None
+
+    def arm(self, track, slot, kind, duration_s=None, chained=False):
+        """트랙 시작. chained면 이전 트랙의 예정 종료 시각을 예정 시작 시각으로 이어 받는다"""
+        previous = self.current
+        ideal_start = time.monotonic()
+        if chained and previous is not None and previous.ideal_end is not None:
+            ideal_start = previous.ideal_end
+        else:
+            self.cancel_pending("replaced")
+        self.retired.discard(slot)
+        self.current = ArmedTrack(track, slot, kind, ideal_start, duration_s)
+        self.expiring = False
+        self.reschedule()
+
+    def skip(self, elapsed_s):
+        """현재 트랙이 이미 elapsed_s초 진행된 것으로 예정 시각을 당김 (체크포인트 재개)"""
+        current = self.current
+        if current is None or elapsed_s <= 0:
+            return
+        current.ideal_start -= elapsed_s
+        if current.ideal_end is not None:
+            current.ideal_end -= elapsed_s
+        if current.end is not None:
+            current.end -= elapsed_s
+        self.reschedule()
+
+    def disarm(self, reason):
+        """자동 진행 중지 (정지, 플레이리스트 모드 해제 등)"""
+        self.cancel_pending(reason)
+        self.timer.stop()
+        self.current = None
+        self.expiring = False
+
+    def cancel_pending(self, reason):
+        if self.pending is None:
+            return
+        pending, self.pending = self.pending, None
+        self.cancelled += 1
+        if self.starter.pending is not None and self.starter.pending.id == pending["id"]:
+            self.starter.cancel(reason)
+
+    def retarget(self, reason):
+        """다음 트랙 선택 조건이 바뀜 (반복 모드, 트랙 목록): 준비한 트랙을 버리고 다시 준비"""
+        if self.pending is None:
+            return
+        self.cancel_pending(reason)
+        self.reschedule()
+
+    def reschedule(self):
+        current = self.current
+        if current is None or current.end is None or current.paused:
+            self.timer.stop()
+            return
+        now = time.monotonic()
+        if self.pending is not None:
+            if current.end - now > 2 * self.preroll_ms / 1000:
+                # 뒤로 탐색해 종료가 멀어짐: 준비한 다음 트랙은 나중에 다시 준비
+                self.cancel_pending("seek")
+            else:
+                self.starter.retime(current.end)
+                return
+        fire_at = current.end if self.expiring else current.end - self.preroll_ms / 1000
+        self.timer.start(max(0, int((fire_at - now) * 1000)))
+
+    def on_time(self, idx, time_ms, length_ms):
+        """현재 비디오의 time_changed (GUI 스레드): 예상 종료 시각 갱신"""
+        current = self.current
+        if current is None or current.slot != idx or current.kind != "video" or not length_ms:
+            return
+        now = time.monotonic()
+        current.end = now + max(0, length_ms - time_ms) / 1000
+        if current.ideal_end is None:
+            current.ideal_end = current.ideal_start + length_ms / 1000
+        current.paused = False
+        self.reschedule()
+
+    def on_paused(self, idx):
+        """현재 비디오 일시정지: 예정 전환 보류 (재생이 이어지면 time_changed로 다시 계산)"""
+        current = self.current
+        if current is None or current.slot != idx or current.kind != "video":
+            return
+        current.paused = True
+        self.cancel_pending("paused")
+        self.timer.stop()
+
+    def on_timer(self):
+        current = self.current
+        if current is None or self.pending is not None:
+            return
+        if self.expiring:
+            self.expiring = False
+            self.current = None
+            self.expire(current.slot)
+            return
+        if self.starter.pending is not None:
+            # play_at/next_at 예약이 우선
+            return
+        track = self.target()
+        if track is None:
+            if current.kind == "image":
+                self.expiring = True
+                self.reschedule()
+            return
+        slot, player = self.prepare(track)
+        if slot is None or slot == current.slot:
+            return
+        id = f"auto-{track}-{self.advanced + 1}"
+        self.pending = {"id": id, "from_track": current.track, "to_track": track, "slot": slot, "reason": "deadline"}
+        self.starter.schedule(
+            id, slot, None, current.end, player=player,
+            on_start=lambda: self.on_start(slot, track), on_report=self.on_report,
+        )
+
+    def on_end_reached(self, idx):
+        """VLC end_reached. 자동 진행이 처리하면 True (Node로 보내지 않음)"""
+        if idx in self.retired:
+            self.retired.discard(idx)
+            return True
+        current = self.current
+        if current is None or current.slot != idx:
+            return False
+        # 예상보다 먼저 끝남: 바로 전환
+        current.end = time.monotonic()
+        if self.pending is None:
+            self.on_timer()
+        if self.pending is None:
+            return False
+        self.forced += 1
+        self.pending["reason"] = "end_reached"
+        self.starter.retime(current.end)
+        return True
+
+    def on_start(self, slot, track):
+        """deadline 시점 (StartScheduler.start_now 안에서 호출)"""
+        previous = self.current
+        pending = self.reporting = self.pending
+        self.pending = None
+        if pending is not None and previous is not None:
+            pending["deadline"] = previous.end
+            pending["ideal"] = previous.ideal_end if previous.ideal_end is not None else previous.end
+            self.retired.add(previous.slot)
+        self.start(slot, track)
+
+    def on_report(self, report):
+        """StartScheduler 보고 → advance_report"""
+        if "cancelled" in report:
+            # play_at 예약 등으로 StartScheduler에서 취소됨
+            if self.pending is not None and report["id"] == self.pending["id"]:
+                self.pending = None
+                self.cancelled += 1
+            return
+        pending = self.reporting
+        if pending is None or report.get("id") != pending["id"]:
+            return
+        self.reporting = None
+        self.advanced += 1
+        if report["late"]:
+            self.late += 1
+        gap_ms = report["playing_error_ms"] if report["playing_error_ms"] is not None else report["start_error_ms"]
+        self.gap_ms.add(max(0.0, gap_ms))
+        deadline, ideal = pending.get("deadline"), pending.get("ideal")
+        drift_ms = report["start_error_ms"]
+        if deadline is not None and ideal is not None:
+            drift_ms += (deadline - ideal) * 1000
+        self.last = {
+            "from_track": pending["from_track"],
+            "to_track": pending["to_track"],
+            "idx": pending["slot"],
+            "reason": pending["reason"],
+            "preroll_ms": report["preroll_ms"],
+            "start_error_ms": report["start_error_ms"],
+            "gap_ms": gap_ms,
+            "drift_ms": round(drift_ms, 3),
+            "late": report["late"],
+        }
+        self.emit("advance_report", self.last)
+
+    def stats(self):
+        current = self.current
+        return {
+            "armed": current is not None,
+            "track": current.track if current is not None else None,
+            "remaining_ms": round((current.end - time.monotonic()) * 1000, 1) if current is not None and current.end is not None else None,
+            "pending": self.pending is not None,
+            "advanced": self.advanced,
+            "late": self.late,
+            "forced": self.forced,
+            "cancelled": self.cancelled,
+            "last": self.last,
+        }
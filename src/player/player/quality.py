@@ -0,0 +1,217 @@
+import time
+from PySide6.QtCore import QObject, QTimer
+from vlc_backend import vlc
+
+# =========================
+# 재생 품질 텔레메트리
+# =========================
+#
+# 재생 중인 플레이어의 libVLC 미디어 통계(Media.get_stats)를 낮은 주기로 읽어
+# 트랙별 영상 프레임 손실률, 오디오 버퍼 손실, 입력/디먹스 비트레이트, 디코딩 fps를 계산한다.
+# (--no-drop-late-frames/--no-skip-frames는 늦은 프레임을 숨길 뿐이므로 손실은 통계로만 알 수 있다)
+# - 트랙이 끝나면(end_reached/stopped/media_changed) quality_report 한 번
+# - 샘플 구간의 손실률/오디오 손실/디먹스 오류가 기준을 넘으면 트랙당 항목별로 quality_warning 한 번
+# libVLC 통계는 입력을 연 뒤부터의 누적값이므로 트랙 시작 시 읽은 값을 기준으로 차이만 사용한다.
+
+# 샘플 값 순서 (MediaStats 필드)
+STAT_FIELDS = (
+    "i_decoded_video", "i_displayed_pictures", "i_lost_pictures",
+    "i_decoded_audio", "i_played_abuffers", "i_lost_abuffers",
+    "i_read_bytes", "i_demux_read_bytes", "i_demux_corrupted", "i_demux_discontinuity",
+)
+DECODED, DISPLAYED, LOST, AUDIO, PLAYED_AUDIO, LOST_AUDIO, READ_BYTES, DEMUX_BYTES, CORRUPTED, DISCONTINUITY = range(len(STAT_FIELDS))
+
+
+def read_stats(media, stats):
+    """통계를 읽어 STAT_FIELDS 순서의 튜플로 반환. 읽을 수 없으면 None"""
+    try:
+        if not media.get_stats(stats):
+            return None
+    except Exception:
+        return None
+    return tuple(getattr(stats, field) for field in STAT_FIELDS)
+
+
+def media_id(media):
+    """같은 미디어인지 비교할 값. python-vlc의 get_media()는 호출마다 새 wrapper를 만들므로 native 포인터(없으면 MRL)"""
+    pointer = getattr(getattr(media, "_as_parameter_", None), "value", None)
+    return pointer if pointer is not None else media.get_mrl()
+
+
+def kbps(byte_count, seconds):
+    return round(byte_count * 8 / 1000 / seconds, 1) if seconds > 0 else 0.0
+
+
+class TrackQuality:
+    """재생 중인 트랙 하나의 통계 상태"""
+
+    def __init__(self, player, media, file):
+        self.player = player
+        self.media = media
+        self.media_id = media_id(media)
+        self.uuid = file.get("uuid")
+        self.path = file.get("path")
+        self.stats = vlc.MediaStats()
+        self.base = None
+        self.last = None
+        self.last_time = None
+        self.playing_s = 0.0
+        self.samples = 0
+        self.max_drop_rate = 0.0
+        self.warnings = []
+
+    def totals(self):
+        if self.base is None or self.last is None:
+            return None
+        return tuple(last - base for last, base in zip(self.last, self.base))
+
+
+class PlaybackQuality(QObject):
+    def __init__(self, emit, interval_ms=1000, drop_rate_percent=1.0, lost_audio_buffers=5, min_frames=10, parent=None):
+        super().__init__(parent)
+        self.emit = emit
+        self.drop_rate = drop_rate_percent / 100
+        self.lost_audio_buffers = lost_audio_buffers
+        self.min_frames = min_frames
+        self.tracks = {}
+        self.reports = 0
+        self.warnings = 0
+        self.samples = 0
+        self.unsupported = 0
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self.sample_all)
+
+    def start(self, idx, player, file):
+        """재생 시작 (playing 이벤트). 같은 미디어를 이어서 재생(일시정지 해제)하면 그대로 둔다"""
+        if self.timer.interval() <= 0 or player is None:
+            return
+        media = player.get_media()
+        if media is None:
+            return
+        track = self.tracks.get(idx)
+        if track is not None and track.media_id == media_id(media):
+            track.last_time = time.monotonic()
+            return
+        if track is not None:
+            self.finish(idx, "media_changed")
+        track = self.tracks[idx] = TrackQuality(player, media, file)
+        track.base = read_stats(media, track.stats)
+        track.last = track.base
+        track.last_time = time.monotonic()
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def sample_all(self):
+        for idx in list(self.tracks):
+            self.sample(idx)
+
+    def sample(self, idx, final=False):
+        """통계 한 번 읽기. final이면 재생 상태와 관계없이 마지막 값을 읽는다"""
+        track = self.tracks[idx]
+        now = time.monotonic()
+        try:
+            playing = final or bool(track.player.is_playing())
+        except Exception:
+            playing = False
+        if not playing:
+            # 일시정지 구간은 재생 시간에서 뺀다
+            track.last_time = now
+            return
+        values = read_stats(track.media, track.stats)
+        if values is None:
+            self.unsupported += 1
+            track.last_time = now
+            return
+        self.samples += 1
+        track.samples += 1
+        if track.base is None:
+            # 입력이 열리기 전이라 시작 시 통계가 없었던 경우
+            track.base = track.last = values
+            track.last_time = now
+            return
+        elapsed = now - track.last_time
+        if final:
+            # 마지막 주기 샘플 이후 재생 시간은 한 주기를 넘을 수 없다
+            elapsed = min(elapsed, self.timer.interval() / 1000)
+        delta = tuple(value - last for value, last in zip(values, track.last))
+        track.playing_s += elapsed
+        track.last = values
+        track.last_time = now
+        self.check(idx, track, delta)
+
+    def check(self, idx, track, delta):
+        """샘플 구간 값이 기준을 넘으면 경고 (트랙당 항목별 한 번)"""
+        if delta[DECODED] >= self.min_frames:
+            drop_rate = delta[LOST] / delta[DECODED]
+            track.max_drop_rate = max(track.max_drop_rate, drop_rate)
+            if drop_rate > self.drop_rate:
+                self.warn(idx, track, "drop_rate", round(drop_rate, 4), self.drop_rate)
+        if self.lost_audio_buffers > 0 and delta[LOST_AUDIO] > self.lost_audio_buffers:
+            self.warn(idx, track, "lost_audio_buffers", delta[LOST_AUDIO], self.lost_audio_buffers)
+        if delta[CORRUPTED] > 0:
+            self.warn(idx, track, "demux_corrupted", delta[CORRUPTED], 0)
+
+    def warn(self, idx, track, metric, value, threshold):
+        if metric in track.warnings:
+            return
+        track.warnings.append(metric)
+        self.warnings += 1
+        self.emit("quality_warning", {
+            "idx": idx,
+            "uuid": track.uuid,
+            "path": track.path,
+            "metric": metric,
+            "value": value,
+            "threshold": threshold,
+        })
+
+    def finish(self, idx, reason):
+        """트랙 종료: 마지막 샘플 후 quality_report 전송"""
+        track = self.tracks.get(idx)
+        if track is None:
+            return
+        self.sample(idx, final=True)
+        del self.tracks[idx]
+        if not self.tracks:
+            self.timer.stop()
+        totals = track.totals()
+        if totals is None:
+            return
+        self.reports += 1
+        seconds = track.playing_s
+        self.emit("quality_report", {
+            "idx": idx,
+            "uuid": track.uuid,
+            "path": track.path,
+            "reason": reason,
+            "seconds": round(seconds, 2),
+            "video": {
+                "decoded": totals[DECODED],
+                "displayed": totals[DISPLAYED],
+                "lost": totals[LOST],
+                "drop_rate": round(totals[LOST] / totals[DECODED], 4) if totals[DECODED] else 0,
+                "max_drop_rate": round(track.max_drop_rate, 4),
+                "decode_fps": round(totals[DECODED] / seconds, 2) if seconds > 0 else 0,
+                "display_fps": round(totals[DISPLAYED] / seconds, 2) if seconds > 0 else 0,
+            },
+            "audio": {
+                "decoded": totals[AUDIO],
+                "played": totals[PLAYED_AUDIO],
+                "lost": totals[LOST_AUDIO],
+            },
+            "input_kbps": kbps(totals[READ_BYTES], seconds),
+            "demux_kbps": kbps(totals[DEMUX_BYTES], seconds),
+            "demux_corrupted": totals[CORRUPTED],
+            "demux_discontinuity": totals[DISCONTINUITY],
+            "warnings": list(track.warnings),
+        })
+
+    def stats(self):
+        return {
+            "active": len(self.tracks),
+            "samples": self.samples,
+            "reports": self.reports,
+            "warnings": self.warnings,
+            "unsupported": self.unsupported,
+        }
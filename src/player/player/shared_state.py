@@ -0,0 +1,133 @@
+import os, mmap, struct, tempfile, time
+from PySide6.QtCore import QObject, QTimer
+
+# =========================
+# 공유 메모리 상태 블록
+# =========================
+#
+# 플레이어 상태를 고정 레이아웃 파일(mmap)에 제자리 갱신한다.
+# 상태를 보는 쪽(Node, 웹 UI 폴링, 외부 도구)은 stdout JSON을 파싱하지 않고 원하는 주기로 파일을 읽으면 된다.
+# stdout은 개별 이벤트(media_changed, end_reached 등)에만 쓴다.
+#
+# 레이아웃 (little-endian, VERSION 1)
+#   HEADER 32 bytes : magic "VPST", version u16, slot 수 u16, seq u64, updated_ms u64(epoch), pid u32
+#   GLOBAL 56 bytes : active i16, playlist_mode u8, fullscreen u8, track_index i32, track_count u32,
+#                     playlist_version i32, commands u64, advanced u64, transitions u64, messages u64, vlc_events u64
+#   SLOT 104 bytes × slot 수 : time_ms i64, duration_ms i64, position f64, rate f32, volume i16,
+#                     state u8(STATES 인덱스), is_playing u8, is_image u8, uuid 64 bytes(utf-8, 0 채움)
+#
+# seqlock: 쓰기 전에 seq를 홀수로, 다 쓴 뒤 짝수로 올린다 (쓰는 쪽은 GUI 스레드 하나뿐).
+# 읽는 쪽은 seq → 블록 → seq 순서로 읽고, 두 seq가 같은 짝수일 때만 사용한다 (다르면 다시 읽기).
+# interval_ms마다 수집해서 바뀐 경우에만 쓰고, 바뀐 게 없어도 1초마다 updated_ms를 갱신한다 (생존 확인용).
+
+MAGIC = b"VPST"
+VERSION = 1
+HEADER = struct.Struct("<4sHHQQI4x")
+GLOBAL = struct.Struct("<hBBiIiQQQQQ")
+SLOT = struct.Struct("<qqdfhBBB7x64s")
+SEQ = struct.Struct("<Q")
+SEQ_OFFSET = 8
+HEARTBEAT_S = 1.0
+
+# libVLC State 이름 + 이미지 슬롯 상태 (telemetry state 값)
+STATES = (
+    "NothingSpecial", "Opening", "Buffering", "Playing", "Paused", "Stopped", "Ended", "Error",
+    "displaying_image", "stopped_image",
+)
+STATE_CODES = {name: code for code, name in enumerate(STATES)}
+
+
+def default_path():
+    """VP_CACHE_DIR(없으면 임시 폴더)/player_state.bin"""
+    cache_dir = os.environ.get("VP_CACHE_DIR") or os.path.join(tempfile.gettempdir(), "vp_app")
+    return os.path.join(cache_dir, "player_state.bin")
+
+
+def block_size(slots):
+    return HEADER.size + GLOBAL.size + SLOT.size * slots
+
+
+def state_code(state):
+    """telemetry state 문자열("State.Playing", "displaying_image" 등) → STATES 인덱스"""
+    if not state:
+        return 0
+    return STATE_CODES.get(str(state).rsplit(".", 1)[-1], 0)
+
+
+class SharedState(QObject):
+    def __init__(self, path, slots, collect, interval_ms=33, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.slots = slots
+        # collect() → (GLOBAL 값 tuple, SLOT 값 tuple 목록)
+        self.collect = collect
+        self.size = block_size(slots)
+        self.seq = 0
+        self.body = None
+        self.last_write = 0.0
+        self.writes = 0
+        self.skipped = 0
+        self.write_us_max = 0.0
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.file = open(path, "w+b")
+        self.file.truncate(self.size)
+        self.map = mmap.mmap(self.file.fileno(), self.size)
+        HEADER.pack_into(self.map, 0, MAGIC, VERSION, slots, self.seq, 0, os.getpid())
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.publish)
+        if interval_ms > 0:
+            self.timer.start(interval_ms)
+
+    def info(self):
+        """읽는 쪽에 알릴 블록 정보 (startup 메시지)"""
+        return {"path": self.path, "version": VERSION, "size": self.size, "slots": self.slots}
+
+    def publish(self, force=False):
+        """상태 수집 후 바뀌었거나 heartbeat 주기가 지났으면 seqlock으로 제자리 갱신"""
+        if self.map is None:
+            return
+        started = time.perf_counter()
+        values, slots = self.collect()
+        body = bytearray(GLOBAL.size + SLOT.size * self.slots)
+        GLOBAL.pack_into(body, 0, *values)
+        for idx, slot in enumerate(slots[:self.slots]):
+            SLOT.pack_into(body, GLOBAL.size + SLOT.size * idx, *slot)
+        now = time.monotonic()
+        if not force and body == self.body and now - self.last_write < HEARTBEAT_S:
+            self.skipped += 1
+            return
+        self.body = body
+        self.last_write = now
+        self.seq += 1
+        SEQ.pack_into(self.map, SEQ_OFFSET, self.seq)
+        self.map[HEADER.size:] = body
+        struct.pack_into("<Q", self.map, SEQ_OFFSET + SEQ.size, int(time.time() * 1000))
+        self.seq += 1
+        SEQ.pack_into(self.map, SEQ_OFFSET, self.seq)
+        self.writes += 1
+        self.write_us_max = max(self.write_us_max, (time.perf_counter() - started) * 1e6)
+
+    def close(self):
+        """마지막 상태를 쓰고 닫음 (pid 0으로 종료 표시)"""
+        if self.map is None:
+            return
+        self.timer.stop()
+        try:
+            struct.pack_into("<I", self.map, SEQ_OFFSET + SEQ.size * 2, 0)
+            self.publish(force=True)
+            self.map.flush()
+            self.map.close()
+            self.file.close()
+        except (OSError, ValueError):
+            pass
+        self.map = None
+
+    def stats(self):
+        return {
+            "path": self.path,
+            "size": self.size,
+            "seq": self.seq,
+            "writes": self.writes,
+            "skipped": self.skipped,
+            "write_us_max": round(self.write_us_max, 1),
+        }
@@ -0,0 +1,65 @@
+# =========================
+# 플레이어 슬롯 풀
+# =========================
+#
+# 플레이어/위젯 슬롯 N개에 어떤 플레이리스트 트랙이 로드되어 있는지 관리한다.
+# - find()   : 트랙이 이미 로드된 슬롯 (O(1))
+# - recycle(): 새 트랙을 로드할 슬롯. 빈 슬롯 → 가장 오래 사용하지 않은 슬롯 순
+# 현재 재생 중인 슬롯과 lookahead 창에 들어간 슬롯은 exclude로 보호한다.
+
+
+class SlotPool:
+    def __init__(self, size):
+        self.size = size
+        self.tracks = [None] * size
+        self.used = [0] * size
+        self.clock = 0
+        self.index = {}
+
+    def touch(self, slot):
+        """슬롯 사용 시각 갱신 (LRU)"""
+        self.clock += 1
+        self.used[slot] = self.clock
+
+    def assign(self, slot, track_index):
+        """슬롯에 트랙 인덱스 기록 (track_index가 None이면 플레이리스트 밖의 파일)"""
+        previous = self.tracks[slot]
+        if previous is not None and self.index.get(previous) == slot:
+            del self.index[previous]
+        self.tracks[slot] = track_index
+        if track_index is not None:
+            old_slot = self.index.get(track_index)
+            if old_slot is not None and old_slot != slot:
+                self.tracks[old_slot] = None
+            self.index[track_index] = slot
+        self.touch(slot)
+
+    def find(self, track_index, exclude=()):
+        """트랙이 로드된 슬롯. 없거나 exclude에 포함되면 None"""
+        slot = self.index.get(track_index)
+        if slot is None or slot in exclude:
+            return None
+        return slot
+
+    def recycle(self, exclude=()):
+        """새로 로드할 슬롯 선택: 빈 슬롯 우선, 없으면 가장 오래 사용하지 않은 슬롯"""
+        candidates = [slot for slot in range(self.size) if slot not in exclude]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda slot: (self.tracks[slot] is not None, self.used[slot]))
+
+    def remap(self, track_of_slot):
+        """트랙 목록이 바뀐 뒤 슬롯별 트랙 인덱스 다시 기록 (track_of_slot(slot, old_index) → 새 인덱스 또는 None)"""
+        self.tracks = [
+            track_of_slot(slot, track_index) if track_index is not None else None
+            for slot, track_index in enumerate(self.tracks)
+        ]
+        self.index = {}
+        for slot, track_index in enumerate(self.tracks):
+            if track_index is not None and track_index not in self.index:
+                self.index[track_index] = slot
+
+    def reset(self):
+        """트랙 매핑 초기화 (트랙 목록이 바뀐 경우)"""
+        self.tracks = [None] * self.size
+        self.index = {}
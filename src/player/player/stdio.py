@@ -0,0 +1,296 @@
+import os, sys, json, time, struct, threading
+from collections import deque
+from PySide6.QtCore import QThread, Signal
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# =========================
+# stdin 프레이밍 프로토콜
+# =========================
+#
+# 두 가지 형식을 같은 스트림에서 동시에 받는다.
+# - line  : 기존 방식. JSON 객체 한 줄 + "\n"
+# - frame : FRAME_MAGIC(1) + 인코딩(1) + 길이(4, big-endian) + payload
+#           payload는 명령 객체 하나 또는 명령 객체 배열(batch)
+#
+# FRAME_MAGIC(0x1E, record separator)은 JSON 텍스트의 첫 바이트가 될 수 없으므로
+# 바이트 하나만 보고 형식을 구분할 수 있다.
+FRAME_MAGIC = 0x1E
+FRAME_HEADER = struct.Struct(">BBI")
+ENCODING_JSON = ord("j")
+ENCODING_MSGPACK = ord("m")
+MAX_FRAME_SIZE = 64 * 1024 * 1024
+READ_CHUNK_SIZE = 64 * 1024
+
+
+def supported_encodings():
+    """사용 가능한 frame 인코딩 목록"""
+    encodings = ["json"]
+    if msgpack is not None:
+        encodings.append("msgpack")
+    return encodings
+
+
+def framing_capabilities():
+    """Node에 알릴 stdin 프레이밍 지원 정보"""
+    return {"modes": ["line", "frame"], "encodings": supported_encodings()}
+
+
+class FrameDecoder:
+    """stdin 바이트 스트림을 명령(dict) 목록으로 디코딩"""
+
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def feed(self, chunk):
+        """읽은 바이트를 추가하고 완성된 명령 목록과 에러 목록을 반환"""
+        self.buffer.extend(chunk)
+        commands = []
+        errors = []
+        while self.buffer:
+            if self.buffer[0] == FRAME_MAGIC:
+                if len(self.buffer) < FRAME_HEADER.size:
+                    break
+                _, encoding, length = FRAME_HEADER.unpack_from(self.buffer)
+                if length > MAX_FRAME_SIZE:
+                    errors.append(f"Frame too large: {length} bytes")
+                    self.buffer.clear()
+                    break
+                end = FRAME_HEADER.size + length
+                if len(self.buffer) < end:
+                    break
+                payload = bytes(self.buffer[FRAME_HEADER.size:end])
+                del self.buffer[:end]
+                self._decode_frame(encoding, payload, commands, errors)
+            else:
+                end = self.buffer.find(b"\n")
+                if end < 0:
+                    break
+                line = bytes(self.buffer[:end]).strip()
+                del self.buffer[:end + 1]
+                if line:
+                    self._decode_line(line, commands, errors)
+        return commands, errors
+
+    def _decode_line(self, line, commands, errors):
+        try:
+            self._append(json.loads(line.decode("utf-8")), commands, errors)
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            errors.append("Invalid JSON received from stdin")
+
+    def _decode_frame(self, encoding, payload, commands, errors):
+        try:
+            if encoding == ENCODING_JSON:
+                message = json.loads(payload.decode("utf-8"))
+            elif encoding == ENCODING_MSGPACK and msgpack is not None:
+                message = msgpack.unpackb(payload, raw=False)
+            else:
+                errors.append(f"Unsupported frame encoding: {encoding}")
+                return
+        except Exception as e:
+            errors.append(f"Invalid frame payload: {e}")
+            return
+        self._append(message, commands, errors)
+
+    def _append(self, message, commands, errors):
+        messages = message if isinstance(message, list) else [message]
+        for item in messages:
+            if isinstance(item, dict):
+                commands.append(item)
+            else:
+                errors.append(f"Invalid command payload: {type(item).__name__}")
+
+
+# =========================
+# 표준 입출력 관련 클래스
+# =========================
+class stdinRead(QThread):
+    """stdin을 읽어 디코딩된 명령을 읽기 단위(batch)로 GUI 스레드에 전달 (수신 시각 포함)"""
+    batch_received = Signal(list, float)
+    decode_error = Signal(str)
+
+    def __init__(self):
+        super().__init__()
+        self.running = True
+        self.decoder = FrameDecoder()
+        # 리더 스레드에서만 증가하는 누적 카운터 (메트릭용)
+        self.bytes_read = 0
+        self.batches = 0
+        self.commands = 0
+
+    def run(self):
+        fd = sys.stdin.buffer.fileno()
+        while self.running:
+            try:
+                # 파이프에 도착해 있는 만큼 한 번에 읽는다
+                chunk = os.read(fd, READ_CHUNK_SIZE)
+            except Exception as e:
+                self.decode_error.emit(f"Error reading stdin: {e}")
+                break
+            if not chunk:
+                break
+            received = time.perf_counter()
+            self.bytes_read += len(chunk)
+            commands, errors = self.decoder.feed(chunk)
+            for error in errors:
+                self.decode_error.emit(error)
+            if commands:
+                self.batches += 1
+                self.commands += len(commands)
+                self.batch_received.emit(commands, received)
+
+    def stop(self):
+        self.running = False
+
+
+# =========================
+# stdout 비동기 출력
+# =========================
+#
+# Player.print는 메시지를 큐에 넣기만 하고, 직렬화/쓰기/flush는 전용 스레드가 한다.
+# 파이프가 막혀도 GUI 스레드나 VLC 스레드는 기다리지 않는다.
+# 큐가 가득 찼을 때의 정책 (메시지 type 기준):
+# - keep     : 버리지 않음 (KEEP_TYPES: end_reached, media_changed, error 등 상태/응답 메시지)
+# - latest   : 아직 쓰이지 않은 같은 type 메시지를 최신 값으로 교체 (LATEST_TYPES: track_index 등 현재 값)
+# - drop     : 버림 (그 외 모든 type: debug/info/warn, quality_warning 등)
+# player_data는 큐 상태와 관계없이 항상 아직 쓰이지 않은 같은 슬롯 메시지에 합친다.
+# 합치거나 교체한 메시지는 큐 끝으로 옮긴다 (사이에 들어간 media_changed 등보다 새 상태가 먼저 나가지 않도록).
+# 쓰기에 실패해 출력 스레드가 끝나면 그 뒤 메시지는 받지 않는다 (큐가 계속 쌓이지 않도록).
+# output이 있으면 봉투에 "output" 필드를 붙인다 (video wall: 추가 출력 창의 메시지)
+KEEP_TYPES = {
+    "window_open", "startup", "resumed", "media_changed", "media_metadata", "end_reached", "stop", "error",
+    "command_error", "playlist_resync", "advance_report", "start_report", "quality_report", "transition",
+    "clock_sync", "set_image_time", "set_transition",
+}
+LATEST_TYPES = {"track_index", "active_player_id", "set_fullscreen", "tracks_version", "audiodevices", "metrics", "stats"}
+COLLAPSE_KEYS = {
+    "player_data": lambda data: data.get("id") if isinstance(data, dict) else None,
+}
+
+
+class stdoutWriter(threading.Thread):
+    def __init__(self, stream=None, max_queue=1024):
+        super().__init__(name="stdoutWriter", daemon=True)
+        self.stream = stream or sys.stdout
+        self.max_queue = max_queue
+        self.queue = deque()
+        # 합치기/교체 대상 (키 → 큐 안의 entry)
+        self.pending = {}
+        # 큐 끝으로 옮기고 남은 빈 entry 수 (type None, 쓰지 않음)
+        self.stale = 0
+        self.condition = threading.Condition()
+        self.running = True
+        self.failed = None
+        self.written = 0
+        self.bytes = 0
+        self.flushes = 0
+        self.collapsed = 0
+        self.dropped = {}
+        self.max_depth = 0
+
+    def depth(self):
+        return len(self.queue) - self.stale
+
+    def put(self, type, data, output=None):
+        """메시지 추가 (임의 스레드에서 호출 가능, 블로킹 없음)"""
+        with self.condition:
+            if not self.running:
+                return
+            full = self.depth() >= self.max_queue
+            collapse = COLLAPSE_KEYS.get(type)
+            key = None
+            if collapse is not None:
+                key = (type, output, collapse(data))
+            elif type in LATEST_TYPES:
+                key = (type, output)
+            entry = self.pending.get(key) if key is not None else None
+            if entry is not None and (collapse is not None or full):
+                if collapse is not None and isinstance(entry[1], dict) and isinstance(data, dict):
+                    entry[1].update(data)
+                    data = entry[1]
+                # 기존 위치는 비우고 큐 끝에 다시 넣음
+                entry[0] = None
+                self.stale += 1
+                self.collapsed += 1
+                entry = [type, data, output]
+                self.pending[key] = entry
+                self.queue.append(entry)
+                self.condition.notify()
+                return
+            if full and key is None and type not in KEEP_TYPES:
+                self.dropped[type] = self.dropped.get(type, 0) + 1
+                return
+            entry = [type, dict(data) if collapse is not None and isinstance(data, dict) else data, output]
+            if key is not None:
+                self.pending[key] = entry
+            self.queue.append(entry)
+            if self.depth() > self.max_depth:
+                self.max_depth = self.depth()
+            self.condition.notify()
+
+    def run(self):
+        while True:
+            with self.condition:
+                while self.running and not self.queue:
+                    self.condition.wait()
+                if not self.queue:
+                    return
+                batch = list(self.queue)
+                self.queue.clear()
+                self.pending.clear()
+                self.stale = 0
+            lines = []
+            for type, data, output in batch:
+                if type is None:
+                    continue
+                message = {"type": type, "data": data}
+                if output is not None:
+                    message["output"] = output
+                try:
+                    lines.append(json.dumps(message, ensure_ascii=False, separators=(",", ":")))
+                except (TypeError, ValueError) as e:
+                    lines.append(json.dumps({"type": "error", "data": f"Failed to serialize {type} message: {e}"}))
+            if not lines:
+                continue
+            text = "\n".join(lines) + "\n"
+            try:
+                # 여러 메시지를 한 번에 쓰고 flush도 한 번만
+                self.stream.write(text)
+                self.stream.flush()
+            except Exception as e:
+                # 출력이 끊김: 더 이상 받지 않고 쌓인 메시지도 버림
+                with self.condition:
+                    self.running = False
+                    self.failed = str(e)
+                    self.queue.clear()
+                    self.pending.clear()
+                    self.stale = 0
+                return
+            self.written += len(lines)
+            self.bytes += len(text)
+            self.flushes += 1
+
+    def close(self, timeout=1.0):
+        """남은 메시지를 쓰고 스레드 종료"""
+        with self.condition:
+            self.running = False
+            self.condition.notify()
+        if self.is_alive():
+            self.join(timeout)
+
+    def stats(self):
+        with self.condition:
+            depth = self.depth()
+        return {
+            "depth": depth,
+            "max_depth": self.max_depth,
+            "written": self.written,
+            "bytes": self.bytes,
+            "flushes": self.flushes,
+            "collapsed": self.collapsed,
+            "dropped": dict(self.dropped),
+            "failed": self.failed,
+        }
@@ -0,0 +1,194 @@
+import time
+from PySide6.QtCore import QObject, QTimer, Qt
+
+# =========================
+# 예약 시작 (play_at / next_at)
+# =========================
+#
+# 여러 대의 VP App이 같은 시각에 재생을 시작하도록 목표 시각(epoch ms)에 맞춰 슬롯을 전환한다.
+# 1. 명령을 받으면 목표 시각을 monotonic 기준 deadline으로 바꾼다.
+#    at은 보낸 쪽 시계 기준이고 offset(보낸 쪽 시계 - 이 PC 시계, ms)은 clock_sync 핸드셰이크로 구한다.
+# 2. 대상 슬롯을 미리 준비(pre-roll)한다.
+#    비디오: 음소거 후 play() → playing 이벤트에서 일시정지 + 0으로 이동 (첫 프레임 디코딩 완료)
+#    이미지: 숨김 위젯에 디코딩/축소까지 끝낸 상태
+# 3. deadline - spin_ms에 PreciseTimer로 깨어나 deadline까지 대기한 뒤 일시정지 해제 + 화면 전환.
+# 4. start_report로 시작 오차를 알린다.
+#    start_error_ms   : 전환 호출 시각 - deadline
+#    playing_error_ms : 일시정지 해제 후 playing 이벤트를 받은 시각 - deadline (비디오)
+# pre-roll이 deadline까지 끝나지 않으면 준비되는 즉시 시작하고 late로 표시한다.
+# 플레이리스트 자동 진행(playlist_scheduler.py)도 이 스케줄러로 다음 트랙을 시작하고 보고는 on_report로 받는다.
+
+
+def wall_ms():
+    return time.time() * 1000
+
+
+class ScheduledStart:
+    def __init__(self, id, slot, at, deadline, player=None, on_start=None, on_report=None):
+        self.id = id
+        self.slot = slot
+        self.at = at
+        self.deadline = deadline
+        # 비디오 슬롯의 VLC 플레이어 (이미지는 None)
+        self.player = player
+        self.on_start = on_start
+        # 보고 전달 함수 (None이면 start_report 메시지)
+        self.on_report = on_report
+        self.created = time.monotonic()
+        self.ready_at = None
+        self.started_at = None
+        self.due = False
+        self.report = None
+
+
+class StartScheduler(QObject):
+    def __init__(self, emit, spin_ms=4, report_timeout_ms=2000, parent=None):
+        super().__init__(parent)
+        self.emit = emit
+        self.spin_ms = spin_ms
+        self.report_timeout_ms = report_timeout_ms
+        self.pending = None
+        self.reporting = None
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.timeout.connect(self.on_due)
+        self.report_timer = QTimer(self)
+        self.report_timer.setSingleShot(True)
+        self.report_timer.timeout.connect(self.send_report)
+        self.scheduled = 0
+        self.started = 0
+        self.late = 0
+        self.cancelled = 0
+
+    @staticmethod
+    def deadline(at, offset=0.0):
+        """보낸 쪽 시계 기준 목표 시각(ms) → monotonic deadline(s)"""
+        return time.monotonic() + (at - offset - wall_ms()) / 1000
+
+    def schedule(self, id, slot, at, deadline, player=None, on_start=None, on_report=None):
+        """예약 등록 및 pre-roll 시작. on_start()는 deadline에 화면 전환을 한다"""
+        self.cancel("replaced")
+        start = self.pending = ScheduledStart(id, slot, at, deadline, player, on_start, on_report)
+        self.scheduled += 1
+        if player is None:
+            start.ready_at = time.monotonic()
+        elif player.is_playing():
+            # 이미 재생 중인 슬롯: 바로 멈추고 처음으로
+            player.audio_set_mute(True)
+            self.preroll_done(start)
+        else:
+            player.audio_set_mute(True)
+            player.play()
+        self.arm_timer(deadline)
+
+    def arm_timer(self, deadline):
+        delay_ms = (deadline - time.monotonic()) * 1000 - self.spin_ms
+        self.timer.start(max(0, int(delay_ms)))
+
+    def retime(self, deadline):
+        """대기 중인 예약의 deadline 변경 (pre-roll은 유지)"""
+        start = self.pending
+        if start is None or start.due:
+            return
+        start.deadline = deadline
+        self.arm_timer(deadline)
+
+    def on_playing(self, idx):
+        """playing 이벤트 (GUI 스레드)"""
+        start = self.pending
+        if start is not None and start.slot == idx and start.player is not None and start.ready_at is None:
+            self.preroll_done(start)
+            if start.due:
+                self.start_now(start)
+            return
+        report = self.reporting
+        if report is not None and report.slot == idx and report.report is not None:
+            report.report["playing_error_ms"] = round((time.monotonic() - report.deadline) * 1000, 3)
+            self.send_report()
+
+    def preroll_done(self, start):
+        """pre-roll 완료: 첫 프레임에서 멈춤"""
+        start.player.set_pause(1)
+        start.player.set_time(0)
+        start.ready_at = time.monotonic()
+
+    def on_due(self):
+        start = self.pending
+        if start is None:
+            return
+        start.due = True
+        if start.ready_at is None:
+            # pre-roll이 늦음: 준비되는 즉시 시작
+            return
+        # 남은 시간은 바쁜 대기 (spin_ms 이내)
+        while time.monotonic() < start.deadline:
+            pass
+        self.start_now(start)
+
+    def start_now(self, start):
+        self.pending = None
+        # 이전 예약의 보고가 playing 이벤트를 기다리는 중이면 먼저 보낸다
+        self.send_report()
+        if start.player is not None:
+            # 비디오는 일시정지 해제 후 playing 이벤트까지 기다렸다가 전송
+            self.reporting = start
+            start.player.set_pause(0)
+            start.player.audio_set_mute(False)
+        start.started_at = time.monotonic()
+        if start.on_start is not None:
+            start.on_start()
+        late = start.ready_at > start.deadline
+        self.started += 1
+        if late:
+            self.late += 1
+        start.report = {
+            "id": start.id,
+            "idx": start.slot,
+            "at": start.at,
+            "lead_ms": round((start.deadline - start.created) * 1000, 3),
+            "preroll_ms": round((start.ready_at - start.created) * 1000, 3),
+            "start_error_ms": round((start.started_at - start.deadline) * 1000, 3),
+            "playing_error_ms": None,
+            "late": late,
+        }
+        if start.player is not None:
+            self.report_timer.start(self.report_timeout_ms)
+        else:
+            self.deliver(start, start.report)
+
+    def send_report(self):
+        start = self.reporting
+        if start is None:
+            return
+        self.reporting = None
+        self.report_timer.stop()
+        self.deliver(start, start.report)
+
+    def deliver(self, start, report):
+        if start.on_report is not None:
+            start.on_report(report)
+        else:
+            self.emit("start_report", report)
+
+    def cancel(self, reason):
+        """대기 중인 예약 취소 (준비 중이던 비디오는 정지)"""
+        start = self.pending
+        if start is None:
+            return
+        self.pending = None
+        self.timer.stop()
+        self.cancelled += 1
+        if start.player is not None:
+            start.player.stop()
+            start.player.audio_set_mute(False)
+        self.deliver(start, {"id": start.id, "idx": start.slot, "at": start.at, "cancelled": reason})
+
+    def stats(self):
+        return {
+            "pending": self.pending is not None,
+            "scheduled": self.scheduled,
+            "started": self.started,
+            "late": self.late,
+            "cancelled": self.cancelled,
+        }
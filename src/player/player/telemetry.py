@@ -0,0 +1,149 @@
+import time, threading
+from PySide6.QtCore import QObject, QTimer, Signal
+
+# =========================
+# player_data 텔레메트리
+# =========================
+#
+# VLC 이벤트마다 전체 상태를 출력하지 않고,
+# - 시간/위치는 설정된 주기(time_hz)로 모아서
+# - 상태 변화(재생/일시정지/정지/종료)는 즉시
+# 변경된 필드만 player_data로 보낸다.
+# keyframe_interval 초마다 전체 필드(keyframe)를 보내 클라이언트가 다시 동기화할 수 있게 한다.
+#
+# 길이/MRL/볼륨/속도/전체화면 같은 정적 필드는 캐시해 두고 관련 이벤트에서만 다시 읽는다.
+
+FIELDS = ("media", "state", "time", "duration", "position", "volume", "rate", "is_playing", "fullscreen")
+
+
+class PlayerTelemetry(QObject):
+    flush_requested = Signal()
+
+    def __init__(self, emit, time_hz=4, keyframe_interval=5.0, parent=None):
+        super().__init__(parent)
+        self.emit = emit
+        self.lock = threading.Lock()
+        self.players = {}
+        self.current = {}
+        self.sent = {}
+        self.events = {}
+        self.dirty = set()
+        self.time_hz = 0
+        self.keyframe_interval = keyframe_interval
+        self.last_keyframe = time.monotonic()
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.flush)
+        self.flush_requested.connect(self.flush)
+        self.configure(time_hz=time_hz)
+
+    def configure(self, time_hz=None, keyframe_interval=None):
+        """틱 주기(Hz)와 keyframe 간격(초) 설정. time_hz <= 0 이면 변경 즉시 전송"""
+        if time_hz is not None:
+            self.time_hz = max(0.0, float(time_hz))
+            if self.time_hz > 0:
+                self.timer.start(max(1, int(1000 / self.time_hz)))
+            else:
+                self.timer.stop()
+        if keyframe_interval is not None:
+            self.keyframe_interval = max(0.0, float(keyframe_interval))
+
+    def attach(self, idx, player):
+        """플레이어 등록 및 정적 필드 초기 로드"""
+        self.players[idx] = player
+        with self.lock:
+            self.current.setdefault(idx, {})
+            self.sent.setdefault(idx, {})
+        self.refresh(idx, FIELDS)
+
+    def refresh(self, idx, fields, event=None, immediate=False):
+        """VLC getter로 지정한 필드만 다시 읽음"""
+        player = self.players.get(idx)
+        if player is None:
+            return
+        values = {}
+        for field in fields:
+            if field == "media":
+                media = player.get_media()
+                values["media"] = media.get_mrl() if media else "No media"
+            elif field == "state":
+                values["state"] = str(player.get_state())
+            elif field == "time":
+                values["time"] = player.get_time()
+            elif field == "duration":
+                values["duration"] = player.get_length()
+            elif field == "position":
+                values["position"] = player.get_position()
+            elif field == "volume":
+                values["volume"] = player.audio_get_volume()
+            elif field == "rate":
+                values["rate"] = player.get_rate()
+            elif field == "is_playing":
+                values["is_playing"] = player.is_playing()
+            elif field == "fullscreen":
+                values["fullscreen"] = player.get_fullscreen()
+        self.update(idx, event, immediate=immediate, **values)
+
+    def update(self, idx, event=None, immediate=False, **values):
+        """필드 값 갱신. 값이 바뀐 경우에만 다음 틱(또는 즉시)에 전송"""
+        with self.lock:
+            current = self.current.setdefault(idx, {})
+            changed = False
+            for key, value in values.items():
+                if current.get(key) != value:
+                    current[key] = value
+                    changed = True
+            if event is not None:
+                self.events[idx] = event
+            if changed or event is not None:
+                self.dirty.add(idx)
+        if immediate or self.time_hz <= 0:
+            self.flush_requested.emit()
+
+    def on_time_changed(self, idx, new_time):
+        """TimeChanged: 이벤트 값으로 시간/위치 갱신 (getter 호출 없음)"""
+        with self.lock:
+            duration = self.current.get(idx, {}).get("duration") or 0
+        position = (new_time / duration) if duration > 0 else 0
+        self.update(idx, "EventType.MediaPlayerTimeChanged", time=new_time, position=position)
+
+    def on_length_changed(self, idx, new_length):
+        self.update(idx, "EventType.MediaPlayerLengthChanged", duration=new_length)
+
+    def on_state_changed(self, idx, event, is_playing):
+        """재생/일시정지/정지/종료: 즉시 전송"""
+        self.refresh(idx, ("state", "duration", "rate"), event=event)
+        self.update(idx, event, immediate=True, is_playing=is_playing)
+
+    def snapshot(self, idx):
+        """현재 캐시된 전체 필드"""
+        with self.lock:
+            return dict(self.current.get(idx, {}))
+
+    def flush(self):
+        """변경된 필드 전송 및 주기적 keyframe 전송 (GUI 스레드)"""
+        now = time.monotonic()
+        keyframe = self.keyframe_interval > 0 and now - self.last_keyframe >= self.keyframe_interval
+        messages = []
+        with self.lock:
+            targets = list(self.current.keys()) if keyframe else list(self.dirty)
+            self.dirty.clear()
+            for idx in targets:
+                current = self.current.get(idx, {})
+                sent = self.sent.setdefault(idx, {})
+                if keyframe:
+                    delta = dict(current)
+                else:
+                    delta = {key: value for key, value in current.items() if sent.get(key) != value}
+                event = self.events.pop(idx, None)
+                if not delta and event is None:
+                    continue
+                sent.update(delta)
+                data = {"id": idx, "event": event or "None"}
+                data.update(delta)
+                if keyframe:
+                    data["keyframe"] = True
+                messages.append(data)
+        if keyframe:
+            self.last_keyframe = now
+        for data in messages:
+            self.emit(data)
@@ -0,0 +1,4 @@
+import os, sys
+
+# player 모듈은 패키지가 아니라 player.py와 같은 폴더에서 이름으로 import한다
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
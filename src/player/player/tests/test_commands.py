@@ -0,0 +1,124 @@
+import pytest
+from commands import Arg, CommandCoalescer, CommandDispatcher, CommandError, IDEMPOTENT, LATEST
+
+
+def noop(*args):
+    pass
+
+
+def dispatcher():
+    commands = CommandDispatcher()
+    commands.register("set_time", noop, Arg("time", int, 0), Arg("idx", int, 0), coalesce=LATEST, key=("idx",))
+    commands.register("play", noop, Arg("idx", int, 0), coalesce=IDEMPOTENT)
+    commands.register("pause", noop, Arg("idx", int, 0))
+    commands.register(
+        "set_tracks", noop, Arg("tracks", list, []), Arg("version", int, None, nullable=True),
+        coalesce=IDEMPOTENT, key=("version",),
+    )
+    return commands
+
+
+# =========================
+# Arg
+# =========================
+@pytest.mark.parametrize("kind, value, expected", [
+    (int, 3, 3), (int, 3.0, 3), (int, "-4", -4),
+    (float, "1.5", 1.5), (float, 2, 2.0),
+    (bool, "true", True), (bool, 0, False),
+    (str, "a", "a"),
+])
+def test_arg_converts(kind, value, expected):
+    assert Arg("x", kind).parse("cmd", {"x": value}) == expected
+
+
+@pytest.mark.parametrize("kind, value", [(int, True), (int, 1.5), (int, "x"), (float, None), (bool, 2), (str, 1), (list, {})])
+def test_arg_rejects(kind, value):
+    with pytest.raises(CommandError) as error:
+        Arg("x", kind).parse("cmd", {"x": value})
+    assert error.value.command == "cmd" and error.value.arg == "x"
+
+
+def test_arg_defaults_and_nullable():
+    assert Arg("x", int, None, nullable=True).parse("cmd", {"x": None}) is None
+    with pytest.raises(CommandError):
+        Arg("x", int).parse("cmd", {})
+    first = Arg("x", dict, {}).parse("cmd", {})
+    first["changed"] = True
+    assert Arg("x", dict, {}).parse("cmd", {}) == {}
+
+
+def test_dispatcher_counts_unknown_and_invalid():
+    commands = dispatcher()
+    with pytest.raises(CommandError):
+        commands.parse({"command": "nope"})
+    with pytest.raises(CommandError):
+        commands.parse({"command": "play", "idx": "x"})
+    with pytest.raises(CommandError):
+        commands.parse({"command": 1})
+    stats = commands.stats()
+    assert (stats["unknown"], stats["invalid"]) == (1, 2)
+    assert stats["commands"]["play"]["errors"] == 1
+
+
+# =========================
+# CommandCoalescer
+# =========================
+def add(coalescer, commands, **data):
+    spec, args = commands.parse(data)
+    coalescer.add(spec, args)
+
+
+def drained(coalescer):
+    return [(spec.name, args) for spec, args, _ in coalescer.drain()]
+
+
+def test_latest_keeps_last_per_key_at_its_arrival_position():
+    commands, coalescer = dispatcher(), CommandCoalescer()
+    add(coalescer, commands, command="set_time", time=1, idx=0)
+    add(coalescer, commands, command="set_time", time=1, idx=1)
+    add(coalescer, commands, command="pause")
+    add(coalescer, commands, command="set_time", time=9, idx=0)
+    assert drained(coalescer) == [("set_time", [1, 1]), ("pause", [0]), ("set_time", [9, 0])]
+    assert coalescer.stats()["merged_by_command"] == {"set_time": 1}
+
+
+def test_idempotent_merges_only_adjacent_duplicates():
+    commands, coalescer = dispatcher(), CommandCoalescer()
+    add(coalescer, commands, command="play", idx=0)
+    add(coalescer, commands, command="play", idx=0)
+    add(coalescer, commands, command="play", idx=1)
+    add(coalescer, commands, command="pause")
+    add(coalescer, commands, command="play", idx=1)
+    assert drained(coalescer) == [("play", [0]), ("play", [1]), ("pause", [0]), ("play", [1])]
+
+
+def test_none_policy_is_never_merged():
+    commands, coalescer = dispatcher(), CommandCoalescer()
+    add(coalescer, commands, command="pause")
+    add(coalescer, commands, command="pause")
+    assert len(drained(coalescer)) == 2
+
+
+def test_idempotent_key_compares_version_only():
+    commands, coalescer = dispatcher(), CommandCoalescer()
+    add(coalescer, commands, command="set_tracks", tracks=[{"uuid": "a"}], version=3)
+    add(coalescer, commands, command="set_tracks", tracks=[{"uuid": "a"}, {"uuid": "b"}], version=3)
+    add(coalescer, commands, command="set_tracks", tracks=[{"uuid": "a"}], version=4)
+    assert [args[1] for _, args in drained(coalescer)] == [3, 4]
+
+
+def test_idempotent_key_without_value_compares_all_args():
+    commands, coalescer = dispatcher(), CommandCoalescer()
+    add(coalescer, commands, command="set_tracks", tracks=[{"uuid": "a"}])
+    add(coalescer, commands, command="set_tracks", tracks=[{"uuid": "b"}])
+    add(coalescer, commands, command="set_tracks", tracks=[{"uuid": "b"}])
+    assert [args[0] for _, args in drained(coalescer)] == [[{"uuid": "a"}], [{"uuid": "b"}]]
+
+
+def test_drain_resets_frame():
+    commands, coalescer = dispatcher(), CommandCoalescer()
+    add(coalescer, commands, command="set_time", time=1, idx=0)
+    drained(coalescer)
+    add(coalescer, commands, command="set_time", time=2, idx=0)
+    assert drained(coalescer) == [("set_time", [2, 0])]
+    assert coalescer.stats()["frames"] == 2
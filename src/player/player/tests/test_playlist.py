@@ -0,0 +1,116 @@
+import random
+import pytest
+from playlist import Playlist, PlaylistPatchError
+
+
+def playlist(*uuids, version=1):
+    result = Playlist()
+    result.set([{"uuid": uuid} for uuid in uuids], version)
+    return result
+
+
+def uuids(playlist):
+    return [track["uuid"] for track in playlist.tracks]
+
+
+def full_index(tracks):
+    index = {}
+    for position, track in enumerate(tracks):
+        index.setdefault(track.get("uuid"), position)
+    return index
+
+
+def test_ops_and_changes():
+    p = playlist("a", "b", "c")
+    added, removed = p.apply([
+        {"op": "insert", "index": 1, "track": {"uuid": "x"}},
+        {"op": "remove", "uuid": "c"},
+        {"op": "move", "uuid": "a", "index": 2},
+        {"op": "update", "uuid": "b", "fields": {"time": 3}},
+    ])
+    assert uuids(p) == ["x", "b", "a"]
+    assert p.tracks[1] == {"uuid": "b", "time": 3}
+    assert added == [{"uuid": "x"}, {"uuid": "b", "time": 3}]
+    assert removed == [{"uuid": "c"}, {"uuid": "b"}]
+    assert p.uuid_index == {"x": 0, "b": 1, "a": 2}
+    assert (p.patches, p.ops) == (1, 4)
+
+
+def test_insert_without_index_appends():
+    p = playlist("a")
+    p.apply([{"op": "insert", "track": {"uuid": "b"}}])
+    assert uuids(p) == ["a", "b"]
+
+
+def test_update_can_change_uuid():
+    p = playlist("a", "b")
+    p.apply([{"op": "update", "uuid": "a", "fields": {"uuid": "z"}}])
+    assert p.uuid_index == {"z": 0, "b": 1}
+
+
+def test_duplicate_uuid_maps_to_first_position():
+    p = playlist("a", "b", "a")
+    assert p.index_of("a") == 0
+    p.apply([{"op": "insert", "index": 0, "track": {"uuid": "c"}}])
+    assert p.index_of("a") == 1
+
+
+@pytest.mark.parametrize("op, message", [
+    ({"op": "remove", "uuid": "nope"}, "Track not found: nope"),
+    ({"op": "insert", "index": 9, "track": {"uuid": "x"}}, "insert index out of range: 9"),
+    ({"op": "insert", "track": "x"}, "insert requires a track object"),
+    ({"op": "move", "uuid": "a", "index": 5}, "move index out of range: 5"),
+    ({"op": "update", "uuid": "a", "fields": 1}, "update requires a fields object"),
+    ({"op": "shuffle"}, "Unknown playlist op: shuffle"),
+])
+def test_invalid_op(op, message):
+    with pytest.raises(PlaylistPatchError, match=message):
+        playlist("a", "b").apply([op])
+
+
+def test_failed_op_rolls_back_whole_patch():
+    p = playlist("a", "b", "c")
+    before_tracks, before_index = [dict(track) for track in p.tracks], dict(p.uuid_index)
+    with pytest.raises(PlaylistPatchError):
+        p.apply([
+            {"op": "insert", "index": 0, "track": {"uuid": "x"}},
+            {"op": "move", "uuid": "c", "index": 0},
+            {"op": "update", "uuid": "a", "fields": {"uuid": "y"}},
+            {"op": "remove", "uuid": "b"},
+            {"op": "remove", "uuid": "missing"},
+        ])
+    assert p.tracks == before_tracks and p.uuid_index == before_index
+    assert (p.version, p.patches, p.ops) == (1, 0, 0)
+
+
+def test_non_integer_index_rolls_back():
+    p = playlist("a")
+    with pytest.raises(ValueError):
+        p.apply([{"op": "remove", "uuid": "a"}, {"op": "move", "uuid": "a", "index": "x"}])
+    assert uuids(p) == ["a"] and p.uuid_index == {"a": 0}
+
+
+def test_uuid_index_matches_full_rebuild_after_random_patches():
+    rng = random.Random(7)
+    p = playlist(*[f"u{i}" for i in range(12)])
+    serial = 100
+    for _ in range(300):
+        ops = []
+        for _ in range(rng.randint(1, 4)):
+            kind = rng.choice(["insert", "remove", "move", "update"])
+            uuid = f"u{rng.randint(0, serial)}"
+            if kind == "insert":
+                serial += 1
+                ops.append({"op": "insert", "index": rng.randint(0, len(p.tracks)), "track": {"uuid": f"u{serial}"}})
+            elif kind == "move":
+                ops.append({"op": "move", "uuid": uuid, "index": rng.randint(0, max(0, len(p.tracks) - 1))})
+            elif kind == "update":
+                ops.append({"op": "update", "uuid": uuid, "fields": {"time": 1}})
+            else:
+                ops.append({"op": "remove", "uuid": uuid})
+        before = list(p.tracks)
+        try:
+            p.apply(ops)
+        except PlaylistPatchError:
+            assert p.tracks == before
+        assert p.uuid_index == full_index(p.tracks)
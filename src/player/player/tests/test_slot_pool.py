@@ -0,0 +1,58 @@
+from slot_pool import SlotPool
+
+
+def test_recycle_prefers_empty_then_least_recently_used():
+    pool = SlotPool(3)
+    pool.assign(0, 10)
+    assert pool.recycle() == 1
+    pool.assign(1, 11)
+    pool.assign(2, 12)
+    assert pool.recycle() == 0
+    pool.touch(0)
+    assert pool.recycle() == 1
+
+
+def test_recycle_respects_exclude():
+    pool = SlotPool(2)
+    pool.assign(0, 1)
+    pool.assign(1, 2)
+    assert pool.recycle(exclude=(0,)) == 1
+    assert pool.recycle(exclude=(0, 1)) is None
+
+
+def test_find_and_exclude():
+    pool = SlotPool(2)
+    pool.assign(1, 5)
+    assert pool.find(5) == 1
+    assert pool.find(5, exclude=(1,)) is None
+    assert pool.find(6) is None
+
+
+def test_assign_moves_track_between_slots():
+    pool = SlotPool(2)
+    pool.assign(0, 5)
+    pool.assign(1, 5)
+    assert pool.tracks == [None, 5] and pool.find(5) == 1
+    pool.assign(1, None)
+    assert pool.find(5) is None and pool.index == {}
+
+
+def test_remap_follows_new_indices_and_drops_removed():
+    pool = SlotPool(3)
+    pool.assign(0, 0)
+    pool.assign(1, 1)
+    pool.assign(2, 2)
+    # 트랙 0 삭제: 1 → 0, 2 → 1
+    pool.remap(lambda slot, index: index - 1 if index > 0 else None)
+    assert pool.tracks == [None, 0, 1]
+    assert (pool.find(0), pool.find(1), pool.find(2)) == (1, 2, None)
+    assert pool.recycle() == 0
+
+
+def test_reset_keeps_lru_order():
+    pool = SlotPool(2)
+    pool.assign(0, 1)
+    pool.assign(1, 2)
+    pool.reset()
+    assert pool.tracks == [None, None] and pool.find(1) is None
+    assert pool.recycle() == 0
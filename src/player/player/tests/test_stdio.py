@@ -0,0 +1,134 @@
+import io, json
+from stdio import FrameDecoder, FRAME_HEADER, FRAME_MAGIC, ENCODING_JSON, MAX_FRAME_SIZE, stdoutWriter
+
+
+def frame(payload, encoding=ENCODING_JSON):
+    data = json.dumps(payload).encode("utf-8") if encoding == ENCODING_JSON else payload
+    return FRAME_HEADER.pack(FRAME_MAGIC, encoding, len(data)) + data
+
+
+# =========================
+# FrameDecoder
+# =========================
+def test_lines_and_frames_in_one_stream():
+    decoder = FrameDecoder()
+    stream = b'{"command": "play"}\n' + frame([{"command": "a"}, {"command": "b"}]) + b'{"command": "stop"}\n'
+    commands, errors = decoder.feed(stream)
+    assert [c["command"] for c in commands] == ["play", "a", "b", "stop"]
+    assert errors == []
+
+
+def test_partial_frame_waits_for_rest():
+    decoder = FrameDecoder()
+    data = frame({"command": "next"})
+    for i in range(len(data) - 1):
+        assert decoder.feed(data[i:i + 1]) == ([], [])
+    commands, errors = decoder.feed(data[-1:])
+    assert commands == [{"command": "next"}] and errors == []
+
+
+def test_partial_line_waits_for_newline():
+    decoder = FrameDecoder()
+    assert decoder.feed(b'{"command": ') == ([], [])
+    assert decoder.feed(b'"play"}\n') == ([{"command": "play"}], [])
+
+
+def test_garbage_line_is_reported_and_stream_resyncs():
+    decoder = FrameDecoder()
+    commands, errors = decoder.feed(b'not json\n{"command": "play"}\n')
+    assert commands == [{"command": "play"}]
+    assert errors == ["Invalid JSON received from stdin"]
+
+
+def test_bad_frame_payload_is_skipped():
+    decoder = FrameDecoder()
+    bad = FRAME_HEADER.pack(FRAME_MAGIC, ENCODING_JSON, 3) + b"{x}"
+    commands, errors = decoder.feed(bad + frame({"command": "stop"}))
+    assert commands == [{"command": "stop"}]
+    assert len(errors) == 1 and errors[0].startswith("Invalid frame payload")
+
+
+def test_unknown_encoding_and_non_object_payload():
+    decoder = FrameDecoder()
+    commands, errors = decoder.feed(frame(b"{}", encoding=ord("x")) + frame([1, {"command": "ok"}]))
+    assert commands == [{"command": "ok"}]
+    assert errors == [f"Unsupported frame encoding: {ord('x')}", "Invalid command payload: int"]
+
+
+def test_oversized_frame_drops_buffer():
+    decoder = FrameDecoder()
+    commands, errors = decoder.feed(FRAME_HEADER.pack(FRAME_MAGIC, ENCODING_JSON, MAX_FRAME_SIZE + 1) + b"xx")
+    assert commands == [] and errors == [f"Frame too large: {MAX_FRAME_SIZE + 1} bytes"]
+    assert decoder.feed(b'{"command": "play"}\n') == ([{"command": "play"}], [])
+
+
+# =========================
+# stdoutWriter (스레드를 띄우지 않고 run()을 직접 호출해 큐를 비운다)
+# =========================
+def written(writer):
+    writer.running = False
+    writer.run()
+    return [json.loads(line) for line in writer.stream.getvalue().splitlines()]
+
+
+def test_writer_keeps_order_and_output_field():
+    writer = stdoutWriter(io.StringIO())
+    writer.put("media_changed", {"idx": 0})
+    writer.put("end_reached", {"idx": 0}, output=2)
+    assert written(writer) == [
+        {"type": "media_changed", "data": {"idx": 0}},
+        {"type": "end_reached", "data": {"idx": 0}, "output": 2},
+    ]
+
+
+def test_full_queue_drops_only_droppable_types():
+    writer = stdoutWriter(io.StringIO(), max_queue=2)
+    writer.put("info", "a")
+    writer.put("info", "b")
+    writer.put("info", "c")
+    writer.put("end_reached", {"idx": 1})
+    assert writer.dropped == {"info": 1}
+    assert [m["data"] for m in written(writer)] == ["a", "b", {"idx": 1}]
+
+
+def test_full_queue_replaces_latest_types_at_tail():
+    writer = stdoutWriter(io.StringIO(), max_queue=2)
+    writer.put("track_index", {"value": 1})
+    writer.put("media_changed", {"idx": 0})
+    writer.put("track_index", {"value": 2})
+    messages = written(writer)
+    assert [m["type"] for m in messages] == ["media_changed", "track_index"]
+    assert messages[1]["data"] == {"value": 2}
+
+
+def test_latest_types_are_not_replaced_below_limit():
+    writer = stdoutWriter(io.StringIO())
+    writer.put("track_index", {"value": 1})
+    writer.put("track_index", {"value": 2})
+    assert [m["data"]["value"] for m in written(writer)] == [1, 2]
+
+
+def test_player_data_collapses_per_slot_behind_queued_events():
+    writer = stdoutWriter(io.StringIO())
+    writer.put("player_data", {"id": 0, "time": 1, "state": "playing"})
+    writer.put("player_data", {"id": 1, "time": 5})
+    writer.put("media_changed", {"idx": 0})
+    writer.put("player_data", {"id": 0, "time": 2})
+    assert writer.depth() == 3 and writer.collapsed == 1
+    messages = written(writer)
+    assert [m["type"] for m in messages] == ["player_data", "media_changed", "player_data"]
+    assert messages[0]["data"] == {"id": 1, "time": 5}
+    assert messages[2]["data"] == {"id": 0, "time": 2, "state": "playing"}
+
+
+def test_dead_writer_stops_accepting():
+    class Broken(io.StringIO):
+        def write(self, text):
+            raise BrokenPipeError("closed")
+
+    writer = stdoutWriter(Broken())
+    writer.put("media_changed", {"idx": 0})
+    writer.run()
+    assert writer.failed == "closed" and not writer.running
+    writer.put("end_reached", {"idx": 0})
+    assert writer.depth() == 0
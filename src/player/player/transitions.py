@@ -0,0 +1,289 @@
+import time
+from PySide6.QtWidgets import QWidget
+from PySide6.QtCore import QObject, QTimer, Qt
+from PySide6.QtGui import QColor, QPainter, QPixmap
+from vlc_backend import vlc
+from metrics import Histogram
+
+# =========================
+# 화면 전환 (cut / crossfade / fade)
+# =========================
+#
+# - cut       : 바로 전환 (기존 동작)
+# - crossfade : 이전 화면과 다음 화면을 겹쳐서 전환
+# - fade      : 이전 화면 → 배경색 → 다음 화면 (중간 지점에서 슬롯 전환)
+# 이미지는 전환 시작 시 화면 크기 프레임(배경 + 가운데 정렬 이미지)을 한 번씩 만들고
+# 오버레이 위젯이 프레임마다 불투명도만 바꿔 그린다.
+# 비디오는 VLC가 위젯의 네이티브 창에 직접 그리므로 Qt 오버레이로 섞을 수 없다.
+# 대신 libVLC adjust 필터의 밝기와 볼륨을 바꿔 검정으로 페이드한다 (GUI 스레드 프레임 복사 없음).
+# crossfade는 양쪽이 모두 이미지일 때만 하고, 나머지는 fade로 처리한다.
+# 프레임 간격을 측정해 budget_ms를 budget_misses번 연속 넘기면 남은 전환을 cut으로 끝낸다.
+
+MODES = ("cut", "crossfade", "fade")
+
+
+class TransitionOverlay(QWidget):
+    """이미지 전환용 오버레이: 배경색 위에 준비된 프레임을 불투명도별로 그린다"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        # 매 프레임 전체를 직접 채우므로 아래 위젯은 다시 그리지 않는다
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+        self.background = QColor("#000000")
+        self.layers = []
+        self.setVisible(False)
+
+    def set_background(self, color):
+        self.background = QColor(color)
+
+    def frame(self, pixmap):
+        """위젯 크기 프레임 생성 (배경 + 가운데 정렬 pixmap)"""
+        frame = QPixmap(self.size())
+        frame.fill(self.background)
+        if pixmap is not None and not pixmap.isNull():
+            painter = QPainter(frame)
+            painter.drawPixmap((self.width() - pixmap.width()) // 2, (self.height() - pixmap.height()) // 2, pixmap)
+            painter.end()
+        return frame
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), self.background)
+        for frame, opacity in self.layers:
+            if opacity <= 0:
+                continue
+            painter.setOpacity(min(1.0, opacity))
+            painter.drawPixmap(0, 0, frame)
+        painter.end()
+
+
+class TransitionSide:
+    """전환 한쪽 슬롯의 화면 내용 (image: 위젯 pixmap, video: VLC 플레이어, None: 배경/로고)"""
+
+    def __init__(self, idx, kind=None, widget=None, player=None):
+        self.idx = idx
+        self.kind = kind
+        self.widget = widget
+        self.player = player
+        self.frame = None
+        self.volume = None
+
+
+class Transition:
+    def __init__(self, mode, source, target, swap, done):
+        self.mode = mode
+        self.source = source
+        self.target = target
+        self.swap = swap
+        self.done = done
+        self.swapped = False
+        self.started = time.monotonic()
+        self.last_tick = self.started
+        self.frames = 0
+        self.frame_total = 0.0
+        self.frame_max = 0.0
+        self.misses = 0
+        self.max_misses = 0
+
+
+class TransitionEngine(QObject):
+    def __init__(self, emit, overlay, mode="cut", duration_ms=500, frame_ms=16, budget_ms=34, budget_misses=3, parent=None):
+        super().__init__(parent)
+        self.emit = emit
+        self.overlay = overlay
+        self.mode = "cut"
+        self.duration_ms = 0
+        self.configure(mode, duration_ms)
+        self.budget_ms = budget_ms
+        self.budget_misses = budget_misses
+        self.current = None
+        self.frame_ms = Histogram()
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.setInterval(max(1, frame_ms))
+        self.timer.timeout.connect(self.tick)
+        self.transitions = 0
+        self.cuts = 0
+        self.fallbacks = 0
+        self.interrupted = 0
+        self.last = None
+
+    def configure(self, mode=None, duration_ms=None):
+        """기본 전환 방식/길이 변경. 알 수 없는 방식이면 ValueError"""
+        if mode is not None:
+            if mode not in MODES:
+                raise ValueError(f"Unknown transition mode: {mode} (expected one of {', '.join(MODES)})")
+            self.mode = mode
+        if duration_ms is not None:
+            self.duration_ms = max(0, int(duration_ms))
+        return {"mode": self.mode, "duration_ms": self.duration_ms}
+
+    def busy_slots(self):
+        """전환 중인 슬롯 (미리 로드 대상에서 제외)"""
+        if self.current is None:
+            return set()
+        return {self.current.source.idx, self.current.target.idx} - {None}
+
+    def release(self, idx):
+        """슬롯을 다른 용도로 쓰기 전 호출: 전환 중인 슬롯이면 끝 상태로 바로 완료"""
+        if idx in self.busy_slots():
+            self.interrupt()
+
+    def interrupt(self):
+        """진행 중인 전환을 끝 상태로 바로 완료"""
+        if self.current is not None:
+            self.interrupted += 1
+            self.finish(interrupted=True)
+
+    def start(self, source, target, swap, done, mode=None):
+        """source → target 전환. swap()은 슬롯 위젯 전환, done()은 이전 슬롯 정리"""
+        self.interrupt()
+        mode = self.mode if mode is None else mode
+        if mode == "crossfade" and (source.kind != "image" or target.kind != "image"):
+            mode = "fade"
+        if mode == "cut" or self.duration_ms <= 0 or (source.kind is None and target.kind is None):
+            self.cuts += 1
+            swap()
+            done()
+            return
+        self.transitions += 1
+        current = self.current = Transition(mode, source, target, swap, done)
+        for side in (source, target):
+            if side.kind == "video":
+                side.volume = side.player.audio_get_volume()
+                side.player.video_set_adjust_int(vlc.VideoAdjustOption.Enable, 1)
+        if target.kind == "video":
+            # 필터 적용이 비동기라 보이기 전에 미리 어둡게 해 둔다
+            self.apply_video(target, 0.0)
+        # 프레임은 창 크기로 만든다 (숨김 상태의 오버레이는 리사이즈를 따라가지 않음)
+        self.overlay.setGeometry(self.overlay.parentWidget().rect())
+        if source.kind == "image":
+            source.frame = self.overlay.frame(source.widget.pixmap())
+        if mode == "crossfade":
+            self.do_swap(current)
+        self.apply(current, 0.0)
+        self.timer.start()
+
+    def do_swap(self, current):
+        current.swapped = True
+        current.swap()
+        if current.target.kind == "image":
+            current.target.frame = self.overlay.frame(current.target.widget.pixmap())
+        if self.overlay.isVisible():
+            self.overlay.raise_()
+
+    def tick(self):
+        current = self.current
+        if current is None:
+            self.timer.stop()
+            return
+        now = time.monotonic()
+        frame_ms = (now - current.last_tick) * 1000
+        current.last_tick = now
+        current.frames += 1
+        current.frame_total += frame_ms
+        current.frame_max = max(current.frame_max, frame_ms)
+        self.frame_ms.add(frame_ms)
+        if frame_ms > self.budget_ms:
+            current.misses += 1
+            current.max_misses = max(current.max_misses, current.misses)
+            if current.misses >= self.budget_misses:
+                self.fallbacks += 1
+                self.finish(fallback=True)
+                return
+        else:
+            current.misses = 0
+        # 늦은 프레임은 길이를 늘리지 않고 진행률을 건너뛴다
+        progress = min(1.0, (now - current.started) * 1000 / self.duration_ms)
+        if current.mode == "fade" and progress >= 0.5 and not current.swapped:
+            self.do_swap(current)
+        self.apply(current, progress)
+        if progress >= 1.0:
+            self.finish()
+
+    def apply(self, current, progress):
+        """진행률(0~1)에 맞춰 오버레이 레이어와 비디오 밝기/볼륨 설정"""
+        source, target = current.source, current.target
+        if current.mode == "crossfade":
+            source_level, target_level = 1.0, progress
+        else:
+            source_level, target_level = max(0.0, 1 - 2 * progress), max(0.0, 2 * progress - 1)
+        layers = []
+        if source.frame is not None and not (current.mode == "fade" and current.swapped):
+            layers.append((source.frame, source_level))
+        if target.frame is not None:
+            layers.append((target.frame, target_level))
+        if source.kind == "video":
+            self.apply_video(source, source_level)
+        if target.kind == "video" and current.swapped:
+            self.apply_video(target, target_level)
+        self.overlay.layers = layers
+        if layers:
+            if not self.overlay.isVisible():
+                self.overlay.setVisible(True)
+                self.overlay.raise_()
+            self.overlay.update()
+        elif self.overlay.isVisible():
+            # 비디오로 넘어가는 fade 후반: 오버레이를 치워 네이티브 비디오가 보이게 한다
+            self.overlay.setVisible(False)
+
+    def apply_video(self, side, level):
+        try:
+            side.player.video_set_adjust_float(vlc.VideoAdjustOption.Brightness, level)
+            if side.volume is not None:
+                side.player.audio_set_volume(int(side.volume * level))
+        except Exception:
+            pass
+
+    def restore_video(self, side):
+        """밝기/볼륨 원래대로, adjust 필터 해제"""
+        try:
+            side.player.video_set_adjust_float(vlc.VideoAdjustOption.Brightness, 1.0)
+            side.player.video_set_adjust_int(vlc.VideoAdjustOption.Enable, 0)
+            if side.volume is not None:
+                side.player.audio_set_volume(side.volume)
+        except Exception:
+            pass
+
+    def finish(self, fallback=False, interrupted=False):
+        """진행 중인 전환을 끝 상태로 완료 (fallback/interrupted이면 남은 구간은 cut)"""
+        current = self.current
+        if current is None:
+            return
+        self.current = None
+        self.timer.stop()
+        if not current.swapped:
+            current.swapped = True
+            current.swap()
+        self.overlay.setVisible(False)
+        self.overlay.layers = []
+        current.done()
+        for side in (current.source, current.target):
+            if side.kind == "video":
+                self.restore_video(side)
+        self.last = {
+            "mode": current.mode,
+            "from": current.source.idx,
+            "to": current.target.idx,
+            "duration_ms": round((time.monotonic() - current.started) * 1000, 1),
+            "frames": current.frames,
+            "avg_frame_ms": round(current.frame_total / current.frames, 3) if current.frames else 0,
+            "max_frame_ms": round(current.frame_max, 3),
+            "budget_misses": current.max_misses,
+            "fallback": fallback,
+            "interrupted": interrupted,
+        }
+        self.emit("transition", self.last)
+
+    def stats(self):
+        return {
+            "mode": self.mode,
+            "duration_ms": self.duration_ms,
+            "running": self.current is not None,
+            "transitions": self.transitions,
+            "cuts": self.cuts,
+            "fallbacks": self.fallbacks,
+            "interrupted": self.interrupted,
+            "last": self.last,
+        }
@@ -0,0 +1,16 @@
+import os
+
+# =========================
+# libVLC 백엔드 선택
+# =========================
+#
+# VP_VLC_BACKEND=fake 이면 모의 백엔드(fake_vlc)를 사용한다 (헤드리스 벤치마크/테스트).
+# 그 외에는 python-vlc만 사용한다. libvlc를 불러올 수 없으면 모의 백엔드로 대신하지 않고
+# 예외로 종료해서 Node의 재시작/오류 보고가 처리하게 한다 (재생 안 되는 플레이어가 살아 있는 것처럼 보이지 않게).
+
+BACKEND = os.environ.get("VP_VLC_BACKEND", "vlc")
+
+if BACKEND == "fake":
+    import fake_vlc as vlc
+else:
+    import vlc
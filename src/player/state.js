@@ -0,0 +1,137 @@
+const fs = require('fs')
+const logger = require('../logger')
+
+// 플레이어 공유 상태 블록 읽기 (src/player/player/shared_state.py 레이아웃 VERSION 1)
+// stdout JSON 파싱 없이 파일에서 현재 상태를 바로 읽는다
+// seqlock: seq → 블록 → seq 순서로 읽고 두 값이 같은 짝수일 때만 사용 (쓰는 중이면 다시 읽기)
+const MAGIC = 'VPST'
+const VERSION = 1
+const HEADER_SIZE = 32
+const GLOBAL_SIZE = 56
+const SLOT_SIZE = 104
+const SEQ_OFFSET = 8
+const MAX_RETRIES = 8
+const STATES = [
+  'NothingSpecial',
+  'Opening',
+  'Buffering',
+  'Playing',
+  'Paused',
+  'Stopped',
+  'Ended',
+  'Error',
+  'displaying_image',
+  'stopped_image'
+]
+
+let fd = null
+let block = null
+const seqBuffer = Buffer.alloc(8)
+
+function closeState() {
+  if (fd !== null) {
+    try {
+      fs.closeSync(fd)
+    } catch (error) {
+      logger.warn(`Failed to close shared state block: ${error.message}`)
+    }
+  }
+  fd = null
+  block = null
+}
+
+// startup 메시지의 shared_state 정보로 블록 열기
+function openState(info) {
+  closeState()
+  if (!info || !info.path) {
+    return false
+  }
+  if (info.version !== VERSION) {
+    logger.warn(`Unsupported shared state version: ${info.version}`)
+    return false
+  }
+  try {
+    fd = fs.openSync(info.path, 'r')
+    block = Buffer.alloc(info.size)
+    logger.info(`Shared state block opened: ${info.path}`)
+    return true
+  } catch (error) {
+    logger.error(`Failed to open shared state block: ${error.message}`)
+    closeState()
+    return false
+  }
+}
+
+function readSeq() {
+  fs.readSync(fd, seqBuffer, 0, 8, SEQ_OFFSET)
+  return seqBuffer.readBigUInt64LE(0)
+}
+
+function decode(buffer) {
+  if (buffer.toString('latin1', 0, 4) !== MAGIC) {
+    return null
+  }
+  const slots = buffer.readUInt16LE(6)
+  let offset = HEADER_SIZE
+  const state = {
+    seq: Number(buffer.readBigUInt64LE(SEQ_OFFSET)),
+    updatedMs: Number(buffer.readBigUInt64LE(16)),
+    pid: buffer.readUInt32LE(24),
+    activePlayerId: buffer.readInt16LE(offset),
+    playlistMode: buffer.readUInt8(offset + 2) === 1,
+    fullscreen: buffer.readUInt8(offset + 3) === 1,
+    playlistTrackIndex: buffer.readInt32LE(offset + 4),
+    trackCount: buffer.readUInt32LE(offset + 8),
+    playlistVersion: buffer.readInt32LE(offset + 12),
+    counters: {
+      commands: Number(buffer.readBigUInt64LE(offset + 16)),
+      advanced: Number(buffer.readBigUInt64LE(offset + 24)),
+      transitions: Number(buffer.readBigUInt64LE(offset + 32)),
+      messages: Number(buffer.readBigUInt64LE(offset + 40)),
+      vlcEvents: Number(buffer.readBigUInt64LE(offset + 48))
+    },
+    player: []
+  }
+  offset += GLOBAL_SIZE
+  for (let idx = 0; idx < slots; idx++, offset += SLOT_SIZE) {
+    const uuid = buffer.subarray(offset + 40, offset + 104)
+    const end = uuid.indexOf(0)
+    state.player.push({
+      id: idx,
+      time: Number(buffer.readBigInt64LE(offset)),
+      duration: Number(buffer.readBigInt64LE(offset + 8)),
+      position: buffer.readDoubleLE(offset + 16),
+      rate: buffer.readFloatLE(offset + 24),
+      volume: buffer.readInt16LE(offset + 28),
+      state: STATES[buffer.readUInt8(offset + 30)] || 'NothingSpecial',
+      is_playing: buffer.readUInt8(offset + 31) === 1,
+      is_image: buffer.readUInt8(offset + 32) === 1,
+      uuid: uuid.toString('utf8', 0, end < 0 ? uuid.length : end)
+    })
+  }
+  return state
+}
+
+// 현재 상태 (블록이 없거나 계속 쓰는 중이면 null)
+function readState() {
+  if (fd === null) {
+    return null
+  }
+  try {
+    for (let i = 0; i < MAX_RETRIES; i++) {
+      const before = readSeq()
+      if (before % 2n === 1n) {
+        continue
+      }
+      fs.readSync(fd, block, 0, block.length, 0)
+      if (readSeq() === before) {
+        return decode(block)
+      }
+    }
+  } catch (error) {
+    logger.error(`Failed to read shared state block: ${error.message}`)
+  }
+  return null
+}
+
+module.exports = { openState, closeState, readState }
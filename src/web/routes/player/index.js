@@ -10,7 +10,8 @@ const {
   setAudioDevice,
   setRepeat,
   setNext,
-  setPrevious
+  setPrevious,
+  sendOutputCommand
 } = require('../../../api/player')
 const logger = require('../../../logger')
 
@@ -117,6 +118,18 @@ router.get('/prev', async (req, res) => {
   }
 })
 
+// video wall: body { command, ...인자 }를 해당 출력 창으로 전달
+router.post('/output/:output', (req, res) => {
+  try {
+    const { command, ...data } = req.body || {}
+    const result = sendOutputCommand(req.params.output, command, data)
+    res.status(200).json({ message: result })
+  } catch (error) {
+    logger.error('Error occurred while sending output command:', error)
+    res.status(400).json({ error: error.message })
+  }
+})
+
 router.get('/audio_devices', (req, res) => {
   try {
     const result = getAudioDevices()
@@ -4,7 +4,11 @@ const { getSetupfromDB } = require('../../../api/status/index.js')
 const { pStatus } = require('../../../_status.js')
 const logger = require('../../../logger/index.js')
 const { dbStatus } = require('../../../db/index.js')
-const { setImageTime } = require('../../../api/player/index.js')
+const { readState } = require('../../../player/state.js')
+const {
+  setImageTime,
+  setTransition
+} = require('../../../api/player/index.js')
 
 router.use('/logo', require('./logo/index.js'))
 
@@ -17,6 +21,15 @@ router.get('/', async (req, res) => {
   }
 })
 
+// 플레이어 공유 상태 블록의 현재 값 (stdout 메시지 없이 원하는 주기로 폴링)
+router.get('/state', (req, res) => {
+  const state = readState()
+  if (!state) {
+    return res.status(503).json({ error: 'Player state is not available' })
+  }
+  res.json(state)
+})
+
 router.post('/update', async (req, res) => {
   const { key, value } = req.body
   if (!key || value === undefined) {
@@ -55,4 +68,20 @@ router.get('/image_time/:time', async (req, res) => {
   }
 })
 
+router.get('/transition/:mode{/:duration}', async (req, res) => {
+  try {
+    res.json({
+      success: true,
+      message: await setTransition(
+        req.params.mode,
+        req.params.duration === undefined ? undefined : Number(req.params.duration)
+      ),
+      pStatus
+    })
+  } catch (error) {
+    logger.error(`Error setting transition "${req.params.mode}":`, error)
+    res.status(400).json({ error: error.message })
+  }
+})
+
 module.exports = router